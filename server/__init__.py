@@ -0,0 +1,2 @@
+# server
+# TodayTrends 백엔드. 프로젝트 루트에서 `server.src...`로 import 하거나, server 폴더에서 `python3 -m src <명령>`으로 실행합니다.
@@ -0,0 +1,2 @@
+# server/benchmarks
+# 수집/분석 경로 성능 측정 스크립트 모음. server 폴더에서 `python3 -m benchmarks.<모듈>`로 실행합니다.
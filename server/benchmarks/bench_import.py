@@ -0,0 +1,80 @@
+# server/benchmarks/bench_import.py
+"""
+모듈 import 시간 벤치마크.
+
+모듈마다 새 파이썬 프로세스에서 `python -X importtime -c "import <모듈>"`을 반복 실행해
+누적 import 시간(중앙값)과, import만으로 불러와진 무거운 의존성 목록을 JSON Lines로 출력합니다.
+
+실행 (server 폴더에서):
+    python3 -m benchmarks.bench_import --repeat 7
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = (
+    'src',
+    'src.keyword_analyzer',
+    'src.analyze_keywords',
+    'src.db_handler',
+    'src.collectors.twitter_collector',
+    'src.collectors.runner',
+)
+HEAVY_MODULES = ('tweepy', 'couchdb', 'dotenv', 'requests', 'urllib3', 'http.server')
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _import_once(module):
+    code = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SERVER_DIR, capture_output=True, text=True, check=True
+    )
+    cumulative_us = None
+    for line in completed.stderr.splitlines():
+        # 형식: "import time: self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative_us = int(parts[1])
+    return cumulative_us, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def bench_module(module, repeat):
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        cumulative_us, heavy = _import_once(module)
+        samples.append(cumulative_us)
+    return {
+        'benchmark': 'import',
+        'module': module,
+        'median_ms': round(statistics.median(samples) / 1000, 2),
+        'min_ms': round(min(samples) / 1000, 2),
+        'heavy_modules_loaded': heavy,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모듈 import 시간 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    args = parser.parse_args(argv)
+
+    results = []
+    for module in args.modules:
+        result = bench_module(module, args.repeat)
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+        results.append(result)
+    return results
+
+
+if __name__ == '__main__':
+    main()
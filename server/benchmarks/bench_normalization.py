@@ -0,0 +1,170 @@
+# server/benchmarks/bench_normalization.py
+"""
+트윗 정규화 경로 벤치마크: 기존 dict 복사 방식 vs TweetRecord(__slots__) 방식.
+
+합성 search/recent 페이지(twitter_stub_server.SyntheticTweetSource)를 tweepy 객체로 만든 뒤
+네트워크/DB 없이 '응답 병합 + 정규화' 구간만 측정합니다.
+- tweets/sec: 처리량
+- alloc_bytes_per_tweet: tracemalloc 기준 처리 중 최대 할당량(peak) / 트윗 수
+- retained_bytes_per_tweet: 정규화 결과를 들고 있을 때 남은 메모리 / 트윗 수
+
+실행 (server 폴더에서):
+    python3 -m benchmarks.bench_normalization --pages 50 --page-size 100
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import tweepy
+
+from src.collectors.twitter_collector import TwitterCollector
+from src.collectors.twitter_stub_server import SyntheticTweetSource
+
+
+class _FakeClient:
+    """미리 만든 tweepy.Response 페이지를 순서대로 돌려주는 클라이언트."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.index = 0
+
+    def search_recent_tweets(self, **kwargs):
+        response = self.responses[self.index % len(self.responses)]
+        self.index += 1
+        return response
+
+
+def build_responses(pages, page_size, seed=42):
+    source = SyntheticTweetSource(seed=seed, pages=pages)
+    responses = []
+    for page_index in range(pages):
+        body, _ = source.page(page_index, page_size)
+        includes = {
+            'users': [tweepy.User(u) for u in body['includes'].get('users', [])],
+            'media': [tweepy.Media(m) for m in body['includes'].get('media', [])],
+        }
+        responses.append(tweepy.Response(
+            [tweepy.Tweet(t) for t in body['data']], includes, [], body['meta']
+        ))
+    return responses
+
+
+def make_collector(responses):
+    # 네트워크/DB 연결 없이 정규화 경로만 측정하기 위해 생성자를 거치지 않음
+    collector = TwitterCollector.__new__(TwitterCollector)
+    collector.client = _FakeClient(responses)
+    collector.entity_store = None
+    return collector
+
+
+def legacy_normalize_page(collector, response):
+    """기존(변경 전) 구현: 트윗/작성자/미디어 data를 복사해 병합한 뒤 새 dict로 정규화."""
+    includes = response.includes or {}
+    users = {user.id: user for user in includes.get("users", [])}
+    media = {m.media_key: m for m in includes.get("media", [])}
+    documents = []
+    for tweet_obj in response.data or []:
+        tweet_dict = tweet_obj.data.copy()
+        tweet_dict['author'] = users[tweet_obj.author_id].data.copy() if tweet_obj.author_id in users else {}
+        tweet_dict['attachments_media'] = []
+        if tweet_obj.attachments and 'media_keys' in tweet_obj.attachments:
+            for media_key in tweet_obj.attachments['media_keys']:
+                if media_key in media:
+                    tweet_dict['attachments_media'].append(media[media_key].data.copy())
+
+        author = tweet_dict.get('author', {})
+        entities = tweet_dict.get('entities', {})
+        hashtags = [tag['tag'] for tag in entities.get('hashtags', [])]
+        metrics = tweet_dict.get('public_metrics', {})
+        text_content = tweet_dict.get('text', '')
+        documents.append({
+            "_id": f"twitter:{tweet_dict['id']}",
+            "platform": "X",
+            "url": f"https://twitter.com/{author.get('username')}/status/{tweet_dict['id']}",
+            "text_content": text_content,
+            "author_id": author.get('id'),
+            "author_name": author.get('name'),
+            "author_username": author.get('username'),
+            "author_profile_image_url": author.get('profile_image_url'),
+            "created_at": tweet_dict.get('created_at'),
+            "collected_at": datetime.now(timezone.utc).isoformat(),
+            "media": [
+                {"type": m.get('type'), "url": m.get('url') or m.get('preview_image_url'),
+                 "thumbnail_url": m.get('preview_image_url')}
+                for m in tweet_dict['attachments_media']
+            ],
+            "hashtags": hashtags,
+            "mentions": [m['username'] for m in entities.get('mentions', [])],
+            "engagement_metrics": {
+                "likes_count": metrics.get('like_count', 0),
+                "comments_count": metrics.get('reply_count', 0),
+                "shares_count": metrics.get('retweet_count', 0),
+                "views_count": metrics.get('impression_count', 0),
+                "quote_count": metrics.get('quote_count', 0)
+            },
+            "location": None,
+            "language": tweet_dict.get('lang'),
+            "is_sensitive_content": tweet_dict.get('possibly_sensitive', False),
+            "content_categories": collector._categorize_content(text_content, hashtags),
+            "raw_data": tweet_dict,
+        })
+    return documents
+
+
+def record_normalize_page(collector, response):
+    """현재 구현: TweetRecord로 참조만 연결하고 저장 시점에 한 번 직렬화."""
+    records, _ = collector._fetch_search_page('bench', max_results=len(response.data))
+    return [collector._normalize_record(record) for record in records]
+
+
+def run_variant(name, normalize_page, responses, repeat):
+    collector = make_collector(responses)
+    tweet_count = sum(len(r.data) for r in responses) * repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            normalize_page(collector, response)
+    elapsed = time.perf_counter() - start
+
+    collector.client.index = 0
+    tracemalloc.start()
+    retained = [normalize_page(collector, response) for response in responses]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    traced_tweets = sum(len(page) for page in retained)
+
+    return {
+        'benchmark': 'normalization',
+        'variant': name,
+        'tweets': tweet_count,
+        'seconds': round(elapsed, 4),
+        'tweets_per_sec': round(tweet_count / elapsed, 1) if elapsed else None,
+        'alloc_bytes_per_tweet': round(peak / traced_tweets, 1),
+        'retained_bytes_per_tweet': round(current / traced_tweets, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="트윗 정규화 경로 벤치마크")
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    responses = build_responses(args.pages, args.page_size)
+    results = [
+        run_variant('legacy_dict_copy', legacy_normalize_page, responses, args.repeat),
+        run_variant('tweet_record', record_normalize_page, responses, args.repeat),
+    ]
+    for result in results:
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+    return results
+
+
+if __name__ == '__main__':
+    main()
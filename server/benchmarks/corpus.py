@@ -0,0 +1,113 @@
+# server/benchmarks/corpus.py
+"""
+벤치마크용 합성 트윗 코퍼스 생성기.
+
+TwitterCollector._normalize_tweet_data_v2가 만드는 문서와 같은 형태(필드 구성)의 트윗을
+시드 기반으로 결정적으로 생성합니다. 같은 (seed, index)에는 항상 같은 문서가 나옵니다.
+- 한국어/영어 혼합 본문, 해시태그, 멘션
+- 멱법칙(heavy-tail) 형태의 참여도 지표
+- created_at/collected_at은 기준 시각으로부터 최근 1주일 사이에 분포
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+WORDS_KO = [
+    "오늘", "진짜", "완전", "심리테스트", "결과", "대박", "밈", "웃긴", "짤", "챌린지", "게임", "퀴즈",
+    "성격", "유행", "화제", "인기", "트렌드", "드라마", "노래", "커피", "주말", "출근", "퇴근", "고양이",
+    "강아지", "맛집", "여행", "영화", "응원", "생일", "ㅋㅋㅋ", "너무", "그리고", "하지만", "사실",
+    "엠비티아이", "놀이", "미니게임", "플레이", "유머", "개웃김", "핫한", "아이돌", "컴백", "콘서트",
+    "점심", "저녁", "야식", "날씨", "비", "눈", "월요일", "금요일", "시험", "공부", "회사", "친구",
+]
+WORDS_EN = [
+    "MBTI", "meme", "viral", "challenge", "game", "quiz", "trend", "lol", "music", "drama",
+    "INFP", "ENTJ", "kpop", "fan", "live", "RT", "wow", "omg", "vibe", "mood",
+]
+HASHTAGS = [
+    "밈", "meme", "MBTI", "심리테스트", "챌린지", "게임", "트렌드", "유머", "짤", "일상",
+    "kpop", "컴백", "먹스타그램", "여행", "고양이", "강아지", "viral", "퀴즈",
+]
+CATEGORY_RULES = (
+    ("psychology", ("심리테스트", "mbti", "성격테스트", "심리", "성격", "테스트", "엠비티아이")),
+    ("game", ("게임", "퀴즈", "놀이", "챌린지", "미니게임", "플레이")),
+    ("meme", ("밈", "meme", "웃긴", "유머", "짤", "개웃김", "ㅋㅋ")),
+    ("trend", ("트렌드", "유행", "인기", "핫한", "화제", "viral")),
+)
+
+
+def _categories(text, hashtags):
+    # TwitterCollector._categorize_content와 같은 규칙
+    all_text = text.lower() + " " + " ".join(tag.lower() for tag in hashtags)
+    categories = [name for name, keywords in CATEGORY_RULES if any(k in all_text for k in keywords)]
+    return categories or ["general"]
+
+
+def make_tweet(index, seed=0, now=None, user_pool_size=5000, with_raw_data=True):
+    """index번째 합성 트윗 문서를 생성합니다."""
+    rng = random.Random(seed * 1_000_003 + index)
+    now = now or datetime.now(timezone.utc)
+
+    words = rng.choices(WORDS_KO, k=rng.randint(5, 18))
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(WORDS_EN))
+    hashtags = rng.sample(HASHTAGS, k=rng.choices((0, 1, 2, 3), weights=(4, 3, 2, 1))[0])
+    mentions = [f"user_{rng.randrange(user_pool_size)}" for _ in range(rng.choices((0, 1, 2), weights=(6, 3, 1))[0])]
+    text = " ".join(words + [f"#{t}" for t in hashtags] + [f"@{m}" for m in mentions])
+    if rng.random() < 0.2:
+        text += f" https://t.co/{rng.getrandbits(40):x}"
+
+    tweet_id = str(1_700_000_000_000_000_000 + index)
+    author_index = int(rng.paretovariate(1.1)) % user_pool_size
+    created_at = now - timedelta(seconds=rng.randrange(7 * 24 * 3600))
+    collected_at = min(created_at + timedelta(seconds=rng.randrange(3600)), now)
+
+    engagement = {
+        "likes_count": int(rng.paretovariate(1.2)) - 1,
+        "comments_count": int(rng.paretovariate(1.8)) - 1,
+        "shares_count": int(rng.paretovariate(1.5)) - 1,
+        "views_count": int(rng.paretovariate(0.8) * 50),
+        "quote_count": int(rng.paretovariate(2.5)) - 1,
+    }
+    media = []
+    if rng.random() < 0.3:
+        media_key = f"3_{tweet_id}"
+        media.append({
+            "type": rng.choice(("photo", "photo", "video", "animated_gif")),
+            "url": f"https://pbs.twimg.com/media/{media_key}.jpg",
+            "thumbnail_url": f"https://pbs.twimg.com/media/{media_key}_thumb.jpg",
+        })
+
+    created_at_str = created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    username = f"user_{author_index}"
+    doc = {
+        "_id": f"twitter:{tweet_id}",
+        "platform": "X",
+        "url": f"https://twitter.com/{username}/status/{tweet_id}",
+        "text_content": text,
+        "author_id": str(10_000_000 + author_index),
+        "author_name": f"사용자 {author_index}",
+        "author_username": username,
+        "author_profile_image_url": f"https://pbs.twimg.com/profile_images/{author_index}/normal.jpg",
+        "created_at": created_at_str,
+        "collected_at": collected_at.isoformat(),
+        "media": media,
+        "hashtags": hashtags,
+        "mentions": mentions,
+        "engagement_metrics": engagement,
+        "location": None,
+        "language": "ko",
+        "is_sensitive_content": False,
+        "content_categories": _categories(text, hashtags),
+    }
+    if with_raw_data:
+        doc["raw_data"] = {
+            "id": tweet_id, "text": text, "created_at": created_at_str, "author_id": doc["author_id"], "lang": "ko",
+        }
+    return doc
+
+
+def generate_tweets(count, seed=0, now=None, **kwargs):
+    """count개의 합성 트윗 문서를 순서대로 yield 합니다 (메모리에 한꺼번에 올리지 않음)."""
+    now = now or datetime.now(timezone.utc)
+    for index in range(count):
+        yield make_tweet(index, seed=seed, now=now, **kwargs)
@@ -0,0 +1,174 @@
+# server/benchmarks/run_benchmarks.py
+"""
+수집/분석 파이프라인 전체 벤치마크.
+
+합성 코퍼스(benchmarks.corpus)로 각 단계를 코퍼스 크기별로 측정하고,
+결과를 JSON Lines로 출력합니다 (--output을 주면 파일에 이어 씁니다).
+- tokenization: KeywordAnalyzer._extract_keywords_from_text
+- keyword_analysis: KeywordAnalyzer.extract_keywords_from_tweets (전체 분석)
+- categorization: TwitterCollector._categorize_content
+- normalization: API 응답 -> CouchDB 문서 (TweetRecord 경로)
+- bulk_write: 인메모리 CouchDB 대역(benchmarks.store_stub)에 _bulk_docs 배치 쓰기
+
+실행 (server 폴더에서):
+    python3 -m benchmarks.run_benchmarks --sizes 10000,100000
+    python3 -m benchmarks.run_benchmarks --sizes 1000000 --only keyword_analysis --output bench.jsonl
+
+1M 크기는 코퍼스를 메모리에 모두 올리므로 수 GB의 메모리가 필요합니다.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from src.keyword_analyzer import KeywordAnalyzer
+from . import bench_normalization
+from .corpus import generate_tweets
+from .store_stub import MemoryCouchStore
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(name, size, func, trace_memory=False):
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    extra = func() or {}
+    elapsed = time.perf_counter() - start
+    result = {
+        'benchmark': name,
+        'size': size,
+        'seconds': round(elapsed, 4),
+        'items_per_sec': round(size / elapsed, 1) if elapsed else None,
+    }
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_alloc_bytes'] = peak
+    result.update(extra)
+    return result
+
+
+def bench_tokenization(corpus, analyzer):
+    def run():
+        tokens = 0
+        for doc in corpus:
+            tokens += len(analyzer._extract_keywords_from_text(doc['text_content']))
+        return {'tokens': tokens}
+    return run
+
+
+def bench_keyword_analysis(corpus, analyzer):
+    def run():
+        result = analyzer.extract_keywords_from_tweets(corpus)
+        return {'recent_tweets': result['recent_tweets'], 'unique_keywords': len(result['top_keywords'])}
+    return run
+
+
+def bench_categorization(corpus, collector):
+    def run():
+        for doc in corpus:
+            collector._categorize_content(doc['text_content'], doc['hashtags'])
+    return run
+
+
+def bench_normalization_path(size, page_size=100):
+    responses = bench_normalization.build_responses(max(1, size // page_size), page_size)
+    collector = bench_normalization.make_collector(responses)
+
+    def run():
+        for response in responses:
+            bench_normalization.record_normalize_page(collector, response)
+    return run
+
+
+def bench_bulk_write(corpus, batch_size=500, latency_ms=0.0):
+    def run():
+        store = MemoryCouchStore(latency_ms=latency_ms)
+        conflicts = 0
+        for start in range(0, len(corpus), batch_size):
+            results = store.save_docs_bulk(corpus[start:start + batch_size])
+            conflicts += sum(1 for success, _, _ in results if not success)
+        return {'requests': store.request_count, 'payload_bytes': store.bytes_received, 'conflicts': conflicts}
+    return run
+
+
+BENCHMARKS = ('tokenization', 'keyword_analysis', 'categorization', 'normalization', 'bulk_write')
+
+
+def run_suite(sizes=DEFAULT_SIZES, only=None, seed=0, trace_memory=False, batch_size=500, latency_ms=0.0):
+    selected = [name for name in BENCHMARKS if not only or name in only]
+    analyzer = KeywordAnalyzer(db_handler=None)
+    collector = bench_normalization.make_collector([])
+    for size in sizes:
+        corpus = list(generate_tweets(size, seed=seed))
+        factories = {
+            'tokenization': lambda: bench_tokenization(corpus, analyzer),
+            'keyword_analysis': lambda: bench_keyword_analysis(corpus, analyzer),
+            'categorization': lambda: bench_categorization(corpus, collector),
+            'normalization': lambda: bench_normalization_path(size),
+            'bulk_write': lambda: bench_bulk_write(corpus, batch_size, latency_ms),
+        }
+        for name in selected:
+            yield _measure(name, size, factories[name](), trace_memory=trace_memory)
+        del corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수집/분석 파이프라인 벤치마크")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="쉼표로 구분한 코퍼스 크기 (예: 10000,100000,1000000)")
+    parser.add_argument('--only', default='', help=f"실행할 벤치마크 (쉼표 구분, 가능: {', '.join(BENCHMARKS)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="bulk_write 요청당 가짜 지연")
+    parser.add_argument('--trace-memory', action='store_true', help="tracemalloc으로 최대 할당량 측정 (느려짐)")
+    parser.add_argument('--output', help="결과를 이어 쓸 JSON Lines 파일")
+    args = parser.parse_args(argv)
+
+    # 분석기 로그가 측정을 방해하지 않도록 함
+    logging.basicConfig(level=logging.WARNING)
+
+    run_info = {
+        'run_at': datetime.now(timezone.utc).isoformat(),
+        'git_revision': _git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    only = {s.strip() for s in args.only.split(',') if s.strip()}
+
+    out = open(args.output, 'a', encoding='utf-8') if args.output else None
+    results = []
+    try:
+        for result in run_suite(sizes, only, args.seed, args.trace_memory, args.batch_size, args.latency_ms):
+            result.update(run_info)
+            line = json.dumps(result, ensure_ascii=False)
+            sys.stdout.write(line + '\n')
+            sys.stdout.flush()
+            if out:
+                out.write(line + '\n')
+            results.append(result)
+    finally:
+        if out:
+            out.close()
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# server/benchmarks/store_stub.py
+"""
+벤치마크용 인메모리 CouchDB 대역(stand-in).
+
+CouchDBHandler의 일부 인터페이스(save_doc, save_docs_bulk, get_doc, get_all_documents, is_connected)를
+제공하며, 요청마다 JSON 직렬화/역직렬화를 거쳐 실제 HTTP 전송 비용을 흉내냅니다.
+요청당 지연(latency_ms)을 줄 수 있고, _rev 규칙(없거나 다르면 충돌)을 따릅니다.
+"""
+
+import json
+import threading
+import time
+import uuid
+
+import couchdb
+
+
+class MemoryCouchStore:
+    def __init__(self, latency_ms=0.0):
+        self.latency_ms = latency_ms
+        self.docs = {}
+        self.request_count = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def _request(self, payload):
+        self.request_count += 1
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        self.bytes_received += len(body)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return json.loads(body)
+
+    def is_connected(self):
+        return True
+
+    def _store(self, doc):
+        doc_id = doc.get('_id') or uuid.uuid4().hex
+        current = self.docs.get(doc_id)
+        if current is not None and current.get('_rev') != doc.get('_rev'):
+            return False, doc_id, couchdb.http.ResourceConflict('Document update conflict.')
+        generation = int(current['_rev'].split('-')[0]) + 1 if current else 1
+        doc['_id'] = doc_id
+        doc['_rev'] = f"{generation}-{uuid.uuid4().hex}"
+        self.docs[doc_id] = doc
+        return True, doc_id, doc['_rev']
+
+    def save_doc(self, doc_data, doc_id_param=None):
+        if doc_id_param and '_id' not in doc_data:
+            doc_data['_id'] = doc_id_param
+        doc = self._request(doc_data)
+        with self._lock:
+            success, doc_id, rev_or_exc = self._store(doc)
+        if not success:
+            raise rev_or_exc
+        return doc_id, rev_or_exc
+
+    def save_docs_bulk(self, docs):
+        payload = self._request({'docs': docs})
+        with self._lock:
+            return [self._store(doc) for doc in payload['docs']]
+
+    def get_doc(self, doc_id):
+        doc = self.docs.get(doc_id)
+        return self._request(doc) if doc is not None else None
+
+    def get_all_documents(self, include_docs=True, limit=None):
+        ids = sorted(self.docs)[:limit] if limit else sorted(self.docs)
+        if not include_docs:
+            return ids
+        return self._request([self.docs[i] for i in ids])
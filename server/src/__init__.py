@@ -0,0 +1,2 @@
+# server/src
+# 수집/분석 패키지. import만으로는 .env 로드, sys.path 변경, 무거운 의존성 import가 일어나지 않습니다.
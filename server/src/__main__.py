@@ -0,0 +1,57 @@
+# src/__main__.py
+"""
+백엔드 명령 진입점 (server 폴더에서 실행).
+
+    python3 -m src collect        # Twitter 트렌딩 트윗 한 번 수집
+    python3 -m src run --once     # 등록된 수집기 러너
+    python3 -m src analyze        # 키워드 분석 (--profile 등은 그대로 전달)
+    python3 -m src analyze-sharded  # 샤드 단위 분산 키워드 분석 (coordinator / worker)
+    python3 -m src daemon         # 수집/분석 상주 스케줄러
+    python3 -m src read-api       # 대시보드용 읽기 API (캐시/ETag/gzip)
+    python3 -m src retention      # 오래된 문서 아카이브/삭제/압축
+    python3 -m src columnar       # Parquet 내보내기(export) / 오프라인 분석(analyze)
+    python3 -m src stub-server    # 로컬 Twitter API 대역 서버
+
+명령에 해당하는 모듈만 import 하므로 `python3 -m src --help`는 무거운 의존성을 불러오지 않습니다.
+"""
+
+import importlib
+import sys
+
+# 명령 이름 -> (모듈, 설명). 모듈은 main(argv)를 제공해야 함
+COMMANDS = {
+    'collect': ('.collectors.twitter_collector', "Twitter 트렌딩 트윗을 한 번 수집해 저장"),
+    'run': ('.collectors.runner', "등록된 수집기를 한 프로세스에서 실행"),
+    'daemon': ('.daemon', "수집/분석을 주기적으로 실행하는 상주 데몬"),
+    'analyze': ('.analyze_keywords', "수집된 트윗의 키워드 분석 및 저장"),
+    'analyze-sharded': ('.sharded_analysis', "트윗 ID 샤드를 여러 워커가 나눠 분석 (coordinator/worker)"),
+    'read-api': ('.read_api', "대시보드용 읽기 전용 트렌드 API"),
+    'retention': ('.retention', "보존 기간이 지난 문서를 아카이브하고 삭제"),
+    'columnar': ('.columnar', "트윗 Parquet 내보내기 / 오프라인 키워드 분석"),
+    'stub-server': ('.collectors.twitter_stub_server', "로컬 Twitter API 대역 서버"),
+}
+
+
+def _usage():
+    lines = ["사용법: python3 -m src <명령> [인자...]", "", "명령:"]
+    lines.extend(f"  {name:<16} {description}" for name, (_, description) in COMMANDS.items())
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(_usage())
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"알 수 없는 명령입니다: {command}\n\n{_usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(COMMANDS[command][0], __package__)
+    sys.argv[0] = f"python3 -m {__package__} {command}"  # argparse 사용법 출력용
+    return module.main(args)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+# src/analysis_format.py
+"""
+keyword_analysis 문서의 압축 저장 형식 (format: compact-v1).
+
+분석 결과의 keyword_trends에는 시간대/카테고리별 전체 Counter와 한 번이라도 나온 모든 키워드의 참여도가 들어 있어
+그대로 저장하면 문서가 매우 커지고, 대시보드는 _all_docs/_changes로 이 문서 전체를 내려받습니다. 저장할 때는
+- 시간대/카테고리별 키워드: 상위 top_n개만 {'keywords': [...], 'counts': [...]} 병렬 배열로
+- 참여도: min_count회 이상 나온 키워드 중 평균 참여도 상위 engagement_top_n개를
+  {'keywords', 'total', 'count', 'avg'} 병렬 배열로
+- 잘린 나머지를 포함한 전체 keyword_trends는 gzip JSON 첨부 파일(keyword_trends.json.gz)로 붙입니다.
+  include_docs 응답에는 첨부 파일 내용이 들어가지 않으므로 본문만 전송됩니다.
+본문 JSON이 max_bytes를 넘으면 top_n을 절반씩 줄여 다시 만들고, 최소로 줄여도 넘으면 경고를 남깁니다.
+"""
+
+import base64
+import gzip
+import heapq
+import json
+import logging
+from collections import Counter
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 'compact-v1'
+DETAIL_ATTACHMENT = 'keyword_trends.json.gz'
+DEFAULT_MAX_BYTES = 256 * 1024
+
+ANALYSIS_DOC_BYTES = REGISTRY.histogram(
+    'todaytrends_analysis_doc_bytes', "저장한 keyword_analysis 문서 본문 크기(바이트)",
+    buckets=(16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216))
+
+
+def _top_arrays(counts, limit):
+    items = Counter(counts).most_common(limit)
+    return {'keywords': [keyword for keyword, _ in items], 'counts': [count for _, count in items]}
+
+
+def _engagement_arrays(engagement, limit, min_count):
+    ranked = heapq.nlargest(
+        limit, ((keyword, stats) for keyword, stats in engagement.items() if stats['count'] >= min_count),
+        key=lambda item: (item[1]['total'] / item[1]['count'], item[1]['count']))
+    return {
+        'keywords': [keyword for keyword, _ in ranked],
+        'total': [stats['total'] for _, stats in ranked],
+        'count': [stats['count'] for _, stats in ranked],
+        'avg': [round(stats['total'] / stats['count'], 2) for _, stats in ranked],
+    }
+
+
+def compact_trends(trends, top_n=20, engagement_top_n=100, min_count=2):
+    """keyword_trends를 섹션별 상위 N개 병렬 배열로 줄입니다."""
+    return {
+        'categories': {category: _top_arrays(counts, top_n) for category, counts in trends['categories'].items()},
+        'hourly': {str(hour): _top_arrays(counts, top_n) for hour, counts in sorted(trends['hourly'].items())},
+        'engagement': _engagement_arrays(trends['engagement'], engagement_top_n, min_count),
+    }
+
+
+def encode_detail(trends):
+    raw = json.dumps(trends, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return gzip.compress(raw, 6)
+
+
+def decode_detail(data):
+    """첨부 파일 내용을 keyword_trends dict로 되돌립니다 (시간대 키는 JSON 특성상 문자열)."""
+    return json.loads(gzip.decompress(data))
+
+
+def _body_size(doc):
+    return len(json.dumps(doc, ensure_ascii=False, default=str, separators=(',', ':')).encode('utf-8'))
+
+
+def build_analysis_doc(result, doc_id, max_bytes=DEFAULT_MAX_BYTES, top_n=20, engagement_top_n=100, detail=True):
+    """
+    분석 결과로 저장할 compact-v1 문서를 만듭니다.
+    :param detail: True면 전체 keyword_trends를 gzip 첨부 파일로 붙임
+    """
+    trends = result['keyword_trends']
+    doc = {'_id': doc_id, 'type': 'keyword_analysis', 'format': FORMAT,
+           **{key: value for key, value in result.items() if key != 'keyword_trends'}}
+    while True:
+        doc['keyword_trends'] = compact_trends(trends, top_n, engagement_top_n)
+        size = _body_size(doc)
+        if size <= max_bytes or top_n <= 1:
+            break
+        top_n, engagement_top_n = top_n // 2, max(engagement_top_n // 2, 1)
+    ANALYSIS_DOC_BYTES.observe(size)
+    if size > max_bytes:
+        logger.warning(f"분석 문서 '{doc_id}' 본문이 {size}바이트로 예산({max_bytes}바이트)을 넘습니다.")
+
+    if detail:
+        doc['_attachments'] = {DETAIL_ATTACHMENT: {
+            'content_type': 'application/gzip',
+            'data': base64.b64encode(encode_detail(trends)).decode('ascii'),
+        }}
+    return doc
+
+
+def load_detail(db_handler, doc_id):
+    """저장된 분석 문서의 전체 keyword_trends. 첨부 파일이 없으면 None."""
+    data = db_handler.get_attachment(doc_id, DETAIL_ATTACHMENT)
+    return decode_detail(data) if data is not None else None
@@ -1,29 +1,74 @@
 # src/analyze_keywords.py
 
+import argparse
 import os
 import logging
-from dotenv import load_dotenv
-from db_handler import CouchDBHandler
-from keyword_analyzer import KeywordAnalyzer
+from contextlib import nullcontext
+from .config import load_env, env_flag
+from .db_handler import CouchDBHandler
+from .keyword_analyzer import KeywordAnalyzer
+from .metrics import start_from_env
+from .cooccurrence import CooccurrenceGraph
+from .engagement_scoring import EngagementScorer
+from .near_duplicates import NearDuplicateIndex
+from .profiling import PhaseProfiler
+from .token_store import MappedTokenStore
+from .trend_scorer import TrendScorer
 
-# .env 파일 로드
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path=dotenv_path)
-else:
-    load_dotenv()
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-def main():
+def main(argv=None):
     """
     수집된 트윗 데이터에서 키워드를 분석하고 결과를 저장합니다.
+    --profile: 로딩/기간 필터링/토큰화/집계/트렌드/저장 단계별 시간과 메모리(tracemalloc)를 표로 출력
+    --profile-output: cProfile 결과를 pstats 파일로 저장 (python -m pstats <파일>로 확인)
+    --token-cache: 토큰화 결과를 저장/재사용할 디렉토리 (TOKEN_CACHE_DIR). 다음 실행부터는 새 트윗만 토큰화
+    --dedupe: 유사 중복 트윗(복사/약간 수정한 스팸)은 클러스터마다 하나만 집계 (NEAR_DUP_ANALYSIS)
+    --emerging: 급상승 키워드(emerging_keywords) 계산 (ANALYSIS_EMERGING)
+    --related: 연관 키워드(related_keywords) 계산 (ANALYSIS_RELATED)
+    --engagement-ranking: 참여도 가중 키워드 순위(engagement_ranking) 계산 (ANALYSIS_ENGAGEMENT_RANKING)
     """
+    parser = argparse.ArgumentParser(description="수집된 트윗 키워드 분석")
+    parser.add_argument('--days-back', type=int, default=7, help="분석할 최근 일수 (기본 7)")
+    parser.add_argument('--profile', action='store_true', help="단계별 CPU/메모리 프로파일 요약 출력")
+    parser.add_argument('--profile-output', help="cProfile 결과(pstats)를 저장할 파일 경로 (지정하면 --profile도 켜짐)")
+    parser.add_argument('--token-cache', help="토큰화 결과를 저장/재사용할 디렉토리 (기본: TOKEN_CACHE_DIR)")
+    parser.add_argument('--dedupe', action='store_true', help="유사 중복 트윗은 클러스터마다 하나만 집계")
+    parser.add_argument('--emerging', action='store_true', help="급상승 키워드 계산 (창 전체의 시간 구간을 다시 채움)")
+    parser.add_argument('--related', action='store_true', help="연관 키워드 계산 (창 전체의 키워드 쌍을 셈)")
+    parser.add_argument('--engagement-ranking', action='store_true', help="참여도 가중 키워드 순위 계산")
+    args = parser.parse_args(argv)
+
+    # .env 로드와 로깅 설정은 인자 처리 후에 수행 (--help는 즉시 반환)
+    load_env()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    # METRICS_PORT / METRICS_FILE 설정 시 지표 노출
+    start_from_env()
+
+    profiler = PhaseProfiler(cprofile=bool(args.profile_output)) if args.profile or args.profile_output else None
+    if profiler:
+        profiler.start()
+    try:
+        _run_analysis(args.days_back, profiler, args.token_cache or os.getenv('TOKEN_CACHE_DIR'),
+                      dedupe=args.dedupe or env_flag('NEAR_DUP_ANALYSIS'),
+                      emerging=args.emerging or env_flag('ANALYSIS_EMERGING'),
+                      related=args.related or env_flag('ANALYSIS_RELATED'),
+                      engagement_ranking=args.engagement_ranking or env_flag('ANALYSIS_ENGAGEMENT_RANKING'))
+    finally:
+        if profiler:
+            profiler.stop()
+            print("\n=== 키워드 분석 프로파일 ===")
+            print(profiler.report())
+            if args.profile_output:
+                profiler.dump_stats(args.profile_output)
+                print(f"cProfile 결과 저장: {args.profile_output}")
+
+def _run_analysis(days_back, profiler=None, token_cache_dir=None, dedupe=False, emerging=False, related=False,
+                  engagement_ranking=False):
     try:
         # 환경변수에서 CouchDB 설정 읽기
         COUCHDB_URL = os.getenv('COUCHDB_URL', 'http://localhost:5984')
@@ -48,17 +93,25 @@ def main():
             return
         
         # 키워드 분석기 초기화
-        analyzer = KeywordAnalyzer(db_handler)
+        token_store = MappedTokenStore(token_cache_dir) if token_cache_dir else None
+        # 한 번 실행이므로 급상승 기준선/연관 키워드 쌍은 창 안의 지난 시간 구간들로 매번 새로 채움 (요청한 경우만)
+        analyzer = KeywordAnalyzer(db_handler, profiler=profiler, token_store=token_store,
+                                   trend_scorer=TrendScorer() if emerging else None,
+                                   near_duplicates=NearDuplicateIndex() if dedupe else None,
+                                   cooccurrence=CooccurrenceGraph(window_hours=days_back * 24) if related else None,
+                                   engagement_scorer=EngagementScorer() if engagement_ranking else None)
         
-        # 모든 트윗 데이터 가져오기
-        logger.info("트윗 데이터 가져오는 중...")
-        all_docs = db_handler.get_all_documents()
-        
-        # 트윗 문서만 필터링 (twitter: 접두사를 가진 문서)
-        tweets = [
-            doc for doc in all_docs 
-            if doc.get('_id', '').startswith('twitter:')
-        ]
+        with profiler.phase('load') if profiler else nullcontext():
+            # 모든 트윗 데이터 가져오기
+            logger.info("트윗 데이터 가져오는 중...")
+            all_docs = db_handler.get_all_documents()
+
+            # 트윗 문서만 필터링 (twitter: 접두사를 가진 문서)
+            tweets = [
+                doc for doc in all_docs
+                if doc.get('_id', '').startswith('twitter:')
+            ]
+            del all_docs
         
         logger.info(f"분석할 트윗 수: {len(tweets)}개")
         
@@ -68,7 +121,7 @@ def main():
         
         # 키워드 분석 실행
         logger.info("키워드 분석 시작...")
-        analysis_result = analyzer.extract_keywords_from_tweets(tweets, days_back=7)
+        analysis_result = analyzer.extract_keywords_from_tweets(tweets, days_back=days_back)
         
         # 결과 출력
         logger.info("\n=== 키워드 분석 결과 ===")
@@ -84,6 +137,19 @@ def main():
         for i, (hashtag, count) in enumerate(analysis_result['top_hashtags'][:10], 1):
             logger.info(f"{i:2d}. #{hashtag}: {count}회")
         
+        logger.info("\n--- 급상승 키워드 (직전 1시간, 기준선 대비) ---")
+        for i, item in enumerate(analysis_result.get('emerging_keywords', [])[:10], 1):
+            logger.info(f"{i:2d}. {item['keyword']}: {item['count']}회 (평소 {item['baseline']:.1f}회, 점수 {item['score']:.1f})")
+
+        logger.info("\n--- 참여도 가중 키워드 (평균 참여도 × 등장 횟수^0.5) ---")
+        for i, item in enumerate(analysis_result.get('engagement_ranking', [])[:10], 1):
+            logger.info(f"{i:2d}. {item['keyword']}: {item['count']}회, 평균 {item['avg']:.1f} (중앙값 {item['percentiles']['50']})")
+
+        logger.info("\n--- 연관 키워드 (상위 키워드별, PMI) ---")
+        for keyword, related in list(analysis_result.get('related_keywords', {}).items())[:10]:
+            if related:
+                logger.info(f"{keyword}: {', '.join(item['keyword'] for item in related)}")
+        
         logger.info("\n--- 카테고리별 상위 키워드 ---")
         trends = analysis_result['keyword_trends']
         for category, keywords in trends['categories'].items():
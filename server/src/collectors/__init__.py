@@ -0,0 +1,2 @@
+# server/src/collectors
+# 플랫폼별 수집기. 수집기 등록(COLLECTOR_REGISTRY)은 collectors.runner가 각 수집기 모듈을 import 할 때 이루어집니다.
@@ -0,0 +1,85 @@
+# src/collectors/base.py
+"""
+SNS 플랫폼별 수집기의 공통 인터페이스와 등록소(registry).
+
+각 플랫폼 수집기는 BaseCollector를 상속해 다음만 구현합니다.
+- fetch_pages(): 원본 항목을 페이지(리스트) 단위로 yield
+- normalize(item): 원본 항목 하나를 공통 데이터 모델 문서(dict)로 변환
+문서 ID 규칙은 '{id_prefix}:{플랫폼 고유 ID}' 입니다 (예: 'twitter:123').
+
+HTTP 세션, CouchDB 핸들러, 일괄 쓰기(sink)는 수집기가 직접 만들지 않고
+collectors.runner.CollectorRunner가 공유 자원을 주입합니다.
+"""
+
+import abc
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 플랫폼 이름 -> 수집기 팩토리 (runner가 환경 변수 COLLECTORS에 따라 생성)
+COLLECTOR_REGISTRY = {}
+
+
+def register_collector(name):
+    """
+    수집기 팩토리를 등록하는 데코레이터.
+    팩토리는 factory(db_handler=..., http_session=...) 형태로 호출되어 BaseCollector 인스턴스를 반환해야 합니다.
+    """
+    def decorator(factory):
+        if name in COLLECTOR_REGISTRY:
+            raise ValueError(f"이미 등록된 수집기 이름입니다: {name}")
+        COLLECTOR_REGISTRY[name] = factory
+        return factory
+    return decorator
+
+
+def create_collector(name, **shared_resources):
+    """등록된 이름으로 수집기를 생성합니다."""
+    try:
+        factory = COLLECTOR_REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"등록되지 않은 수집기입니다: {name} (사용 가능: {sorted(COLLECTOR_REGISTRY)})")
+    return factory(**shared_resources)
+
+
+class BaseCollector(abc.ABC):
+    """플랫폼 수집기 기본 클래스."""
+
+    # 공통 데이터 모델의 'platform' 값 (예: 'X', 'Instagram')
+    platform = None
+    # 문서 ID 접두사 (예: 'twitter')
+    id_prefix = None
+
+    @property
+    def name(self):
+        return self.id_prefix or type(self).__name__
+
+    def doc_id(self, native_id):
+        """플랫폼 고유 ID를 CouchDB 문서 ID로 변환합니다."""
+        return f"{self.id_prefix}:{native_id}"
+
+    @abc.abstractmethod
+    def fetch_pages(self):
+        """원본 항목 리스트를 페이지 단위로 yield 합니다. 오류 시 로깅 후 종료합니다."""
+
+    @abc.abstractmethod
+    def normalize(self, item):
+        """
+        원본 항목 하나를 공통 데이터 모델 문서로 변환합니다.
+        :return: 문서 dict 또는 변환할 수 없으면 None
+        """
+
+    def collect(self, sink):
+        """
+        모든 페이지를 가져와 정규화한 뒤 sink에 기록합니다.
+        :param sink: write(docs)를 제공하는 객체 (예: runner.BulkWriteSink)
+        :return: 기록한 문서 수
+        """
+        total = 0
+        for page in self.fetch_pages():
+            docs = [doc for doc in map(self.normalize, page) if doc]
+            if docs:
+                sink.write(docs)
+                total += len(docs)
+        logger.info(f"[{self.name}] 수집 완료: 문서 {total}개")
+        return total
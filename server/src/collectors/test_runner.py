@@ -0,0 +1,72 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from server.src.collectors.base import BaseCollector
+from server.src.collectors.runner import BulkWriteSink, CollectorRunner
+
+
+class FakeCollector(BaseCollector):
+    platform = "Fake"
+    id_prefix = "fake"
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.threads = set()
+
+    def fetch_pages(self):
+        self.threads.add(threading.current_thread().name)
+        yield from self.pages
+
+    def normalize(self, item):
+        if item is None:
+            return None
+        return {'_id': self.doc_id(item), 'platform': self.platform}
+
+
+class TestCollectorRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.db_handler = MagicMock()
+        self.db_handler.save_docs_bulk.side_effect = lambda docs: [(True, d['_id'], '1-a') for d in docs]
+
+    def test_doc_id_scheme(self):
+        self.assertEqual(FakeCollector([]).doc_id('42'), 'fake:42')
+
+    def test_run_once_shares_sink_and_batches_writes(self):
+        sink = BulkWriteSink(self.db_handler, batch_size=4)
+        runner = CollectorRunner(self.db_handler, max_workers=2, sink=sink)
+        first = runner.register(FakeCollector([[1, 2, None], [3]]))
+        second = FakeCollector([[10, 11, 12]])
+        second.id_prefix = 'other'
+        runner.register(second)
+
+        results = runner.run_once()
+        runner.close()
+
+        self.assertEqual(results, {'fake': 3, 'other': 3})
+        self.assertEqual(sink.stats['written'], 6)
+        self.assertLessEqual(self.db_handler.save_docs_bulk.call_count, 2)
+        self.assertTrue(all(name.startswith('collector') for name in first.threads))
+
+    def test_run_forever_survives_failed_tick(self):
+        sink = BulkWriteSink(self.db_handler, batch_size=4)
+        runner = CollectorRunner(self.db_handler, max_workers=1, sink=sink)
+        runner.register(FakeCollector([[1]]), interval_seconds=0)
+        stop = threading.Event()
+        ticks = []
+
+        def flush():
+            ticks.append(1)
+            if len(ticks) == 1:
+                raise OSError(28, 'No space left on device')
+            stop.set()
+        sink.flush = flush
+
+        runner.run_forever(stop, tick_seconds=0)
+        runner.executor.shutdown(wait=True)
+        self.assertEqual(len(ticks), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -215,6 +215,31 @@ class TestTwitterCollector(unittest.TestCase):
         self.assertFalse(normalized_data['is_sensitive_content'])
         self.assertEqual(normalized_data['raw_data'], tweet_dict) # 원본 데이터 저장 확인
 
+    def test_normalize_tweet_data_v2_with_entity_refs(self):
+        """엔티티 중복 제거 모드에서는 작성자/미디어가 참조로만 남는지 테스트"""
+        collector = TwitterCollector(
+            bearer_token=self.mock_bearer_token,
+            couchdb_url=self.mock_couchdb_url,
+            couchdb_db_name=self.mock_couchdb_db_name,
+            dedupe_entities=True
+        )
+        tweet_dict = {
+            'id': 'tweet1', 'text': 'hello', 'author_id': 'user1',
+            'author': {'id': 'user1', 'username': 'testuser', 'name': 'Test User'},
+            'attachments_media': [{'media_key': 'media1', 'type': 'photo'}],
+        }
+
+        normalized_data = collector._normalize_tweet_data_v2(tweet_dict)
+
+        self.assertEqual(normalized_data['author_ref'], 'twitter_user:user1')
+        self.assertEqual(normalized_data['media_refs'], ['twitter_media:media1'])
+        self.assertEqual(normalized_data['author_id'], 'user1')
+        self.assertNotIn('author_name', normalized_data)
+        self.assertNotIn('media', normalized_data)
+        self.assertNotIn('author', normalized_data['raw_data'])
+        saved_ids = [c[0][0]['_id'] for c in self.mock_db_handler_instance.save_doc.call_args_list]
+        self.assertEqual(saved_ids, ['twitter_user:user1', 'twitter_media:media1'])
+
     def test_save_tweets_to_db(self):
         """DB 저장 테스트"""
         normalized_tweets = [{'_id': 'twitter:tweet1', 'text_content': 'Test 1'}]
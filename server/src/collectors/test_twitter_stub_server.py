@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import tweepy
+
+from server.src.collectors.twitter_collector import TwitterCollector
+from server.src.collectors.twitter_stub_server import (
+    SyntheticTweetSource, CassetteTweetSource, start_stub_server,
+)
+from server.src.db_handler import CouchDBHandler
+
+
+class TestTwitterStubServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_stub_server(SyntheticTweetSource(seed=7, pages=3, user_pool_size=20))
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cassette_path = os.path.join(self.tmpdir.name, 'search.jsonl')
+
+        self.mock_db_handler_instance = MagicMock(spec=CouchDBHandler)
+        self.mock_db_handler_instance.is_connected.return_value = True
+        self.mock_db_handler_instance.save_doc.return_value = ("mock_doc_id", "mock_doc_rev")
+        self.patcher_db_handler = patch(
+            'server.src.collectors.twitter_collector.CouchDBHandler',
+            return_value=self.mock_db_handler_instance
+        )
+        self.patcher_db_handler.start()
+
+    def tearDown(self):
+        self.patcher_db_handler.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def _collector(self, **kwargs):
+        return TwitterCollector(
+            bearer_token='stub-token', couchdb_url='http://fakecouch:5984/',
+            couchdb_db_name='stub_db', **kwargs
+        )
+
+    def test_synthetic_pages_are_deterministic(self):
+        source = SyntheticTweetSource(seed=1, pages=2)
+        body_a, next_a = source.page(0, 10)
+        body_b, _ = SyntheticTweetSource(seed=1, pages=2, base_time=source.base_time).page(0, 10)
+        self.assertEqual(body_a, body_b)
+        self.assertEqual(next_a, 1)
+        self.assertEqual(body_a['meta']['next_token'], 'p1')
+        self.assertNotIn('next_token', source.page(1, 10)[0]['meta'])
+
+    def test_collect_follows_pagination_against_stub(self):
+        collector = self._collector(api_base_url=self.server.base_url)
+        tweets = collector.collect_trending_tweets(count=20, max_pages=5)
+
+        self.assertEqual(len(tweets), 60)  # 3페이지 x 20개, next_token 없으면 중단
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(self.mock_db_handler_instance.save_doc.call_count, 60)
+        self.assertTrue(all(t['author_username'] for t in tweets))
+
+    def test_record_then_replay_without_server(self):
+        recorder = self._collector(
+            transport_mode='record', cassette_path=self.cassette_path, api_base_url=self.server.base_url
+        )
+        recorded = [t for page in recorder.iter_search_pages('lang:ko', max_results=10, max_pages=3) for t in page]
+        requests_made = self.server.request_count
+
+        replayer = self._collector(transport_mode='replay', cassette_path=self.cassette_path)
+        replayed = [t for page in replayer.iter_search_pages('lang:ko', max_results=10, max_pages=3) for t in page]
+
+        self.assertEqual(self.server.request_count, requests_made)
+        self.assertEqual([t['id'] for t in recorded], [t['id'] for t in replayed])
+        self.assertEqual(CassetteTweetSource(self.cassette_path).pages, 3)
+
+    def test_rate_limit_returns_429(self):
+        self.server.rate_limiter.limit = 1
+        client = tweepy.Client(bearer_token='stub-token', wait_on_rate_limit=False)
+        collector = self._collector(api_base_url=self.server.base_url)
+        client.session = collector.client.session
+
+        client.search_recent_tweets(query='lang:ko', max_results=10)
+        with self.assertRaises(tweepy.TooManyRequests):
+            client.search_recent_tweets(query='lang:ko', max_results=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# src/collectors/tweet_record.py
+
+from datetime import datetime, timezone
+
+_EMPTY = {}
+
+
+class TweetRecord:
+    """
+    정규화된 트윗 하나를 표현하는 경량 레코드.
+
+    API 응답의 tweet/user/media data(dict)를 복사하지 않고 참조만 보관하며,
+    저장 직전에 to_document()로 한 번만 CouchDB 문서 형태로 직렬화합니다.
+    __slots__를 사용해 트윗당 인스턴스 dict를 만들지 않습니다.
+    """
+
+    __slots__ = ('tweet', 'author', 'media', 'raw')
+
+    def __init__(self, tweet, author=None, media=(), raw=None):
+        """
+        :param tweet: API v2 tweet 객체의 data (dict, 복사하지 않음)
+        :param author: includes.users에서 찾은 작성자 data (dict) 또는 None
+        :param media: includes.media에서 찾은 미디어 data 리스트
+        :param raw: raw_data로 저장할 원본 dict. None이면 to_document() 시점에 병합해 만듦
+        """
+        self.tweet = tweet
+        self.author = author if author is not None else _EMPTY
+        self.media = media
+        self.raw = raw
+
+    @classmethod
+    def from_enriched(cls, tweet_dict):
+        """search_recent_tweets가 반환하는 병합된 트윗 dict로부터 레코드를 만듭니다."""
+        return cls(
+            tweet_dict,
+            author=tweet_dict.get('author') or _EMPTY,
+            media=tweet_dict.get('attachments_media') or (),
+            raw=tweet_dict,
+        )
+
+    @property
+    def tweet_id(self):
+        return self.tweet.get('id')
+
+    @property
+    def text(self):
+        return self.tweet.get('text', '')
+
+    @property
+    def hashtags(self):
+        entities = self.tweet.get('entities') or _EMPTY
+        return [tag['tag'] for tag in entities.get('hashtags') or ()]
+
+    @property
+    def mentions(self):
+        entities = self.tweet.get('entities') or _EMPTY
+        return [mention['username'] for mention in entities.get('mentions') or ()]
+
+    def as_enriched_dict(self):
+        """기존 search_recent_tweets 반환 형태(트윗 + 'author' + 'attachments_media')로 변환합니다."""
+        if self.raw is not None:
+            return self.raw
+        enriched = dict(self.tweet)
+        enriched['author'] = self.author
+        enriched['attachments_media'] = list(self.media)
+        return enriched
+
+    def to_document(self, content_categories, hashtags=None, entity_refs=None, doc_id=None):
+        """
+        CouchDB에 저장할 문서(dict)를 만듭니다.
+        'docs/data_collection_design.md'의 공통 데이터 모델을 따릅니다.
+        :param content_categories: 콘텐츠 카테고리 리스트
+        :param hashtags: 이미 계산한 해시태그 리스트 (None이면 다시 추출)
+        :param entity_refs: (author_ref, media_refs) 튜플. 주어지면 작성자/미디어 정보 대신 참조만 저장
+        :param doc_id: CouchDB 문서 ID (None이면 'twitter:{id}')
+        """
+        tweet = self.tweet
+        author = self.author
+        tweet_id = tweet.get('id')
+        author_username = author.get('username')
+        public_metrics = tweet.get('public_metrics') or _EMPTY
+
+        document = {
+            "_id": doc_id or f"twitter:{tweet_id}", # CouchDB 문서 ID
+            "platform": "X",
+            "url": f"https://twitter.com/{author_username}/status/{tweet_id}" if author_username and tweet_id else None,
+            "text_content": tweet.get('text', ''),
+            "author_id": author.get('id'),
+            "author_name": author.get('name'),
+            "author_username": author_username,
+            "author_profile_image_url": author.get('profile_image_url'),
+            "created_at": tweet.get('created_at'), # API v2는 이미 UTC ISO8601임
+            "collected_at": datetime.now(timezone.utc).isoformat(),
+            "media": [
+                {
+                    "type": m.get('type'),
+                    "url": m.get('url') or m.get('preview_image_url'),
+                    "thumbnail_url": m.get('preview_image_url')
+                }
+                for m in self.media
+            ],
+            "hashtags": hashtags if hashtags is not None else self.hashtags,
+            "mentions": self.mentions,
+            "engagement_metrics": {
+                "likes_count": public_metrics.get('like_count', 0),
+                "comments_count": public_metrics.get('reply_count', 0),
+                "shares_count": public_metrics.get('retweet_count', 0),
+                "views_count": public_metrics.get('impression_count', 0),
+                "quote_count": public_metrics.get('quote_count', 0)
+            },
+            "location": None,
+            "language": tweet.get('lang'),
+            "is_sensitive_content": tweet.get('possibly_sensitive', False),
+            "content_categories": content_categories,
+        }
+
+        if entity_refs is None:
+            document["raw_data"] = self.as_enriched_dict()
+        else:
+            author_ref, media_refs = entity_refs
+            document["author_ref"] = author_ref
+            document["media_refs"] = media_refs
+            for field in ('author_name', 'author_username', 'author_profile_image_url', 'media'):
+                del document[field]
+            # raw_data에는 작성자/미디어 사본 없이 트윗 원본만 저장
+            if self.raw is not None:
+                document["raw_data"] = {
+                    k: v for k, v in self.raw.items() if k not in ('author', 'attachments_media')
+                }
+            else:
+                document["raw_data"] = tweet
+        return document
@@ -0,0 +1,350 @@
+# src/collectors/twitter_stub_server.py
+"""
+Twitter API v2 `GET /2/tweets/search/recent` 엔드포인트의 로컬 대역(stand-in) 서버.
+
+실제 API 없이 수집기 처리량을 측정하거나 부하 테스트를 하기 위해 사용합니다.
+- 합성(synthetic) 페이로드 생성 또는 녹화된 카세트(twitter_transport.RecordReplaySession) 재생
+- includes(users, media), meta.next_token 페이지네이션
+- x-rate-limit-* 헤더 및 한도 초과 시 429 응답
+- 고정 지연 + 지터로 네트워크 지연 흉내
+
+실행 예 (server 폴더에서):
+    python3 -m src.collectors.twitter_stub_server --port 8089 --latency-ms 80 --pages 20
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RECENT_PATH = '/2/tweets/search/recent'
+
+SAMPLE_WORDS_KO = [
+    "오늘", "진짜", "심리테스트", "결과", "대박", "밈", "웃긴", "짤", "챌린지", "게임",
+    "퀴즈", "성격", "유행", "화제", "인기", "트렌드", "드라마", "노래", "커피", "주말",
+    "출근", "퇴근", "고양이", "강아지", "맛집", "여행", "영화", "응원", "생일", "ㅋㅋㅋ",
+]
+SAMPLE_WORDS_EN = [
+    "MBTI", "meme", "viral", "challenge", "game", "quiz", "trend", "lol", "music", "drama",
+]
+SAMPLE_HASHTAGS = ["밈", "meme", "MBTI", "심리테스트", "챌린지", "게임", "트렌드", "유머", "짤", "일상"]
+MEDIA_TYPES = ["photo", "photo", "photo", "video", "animated_gif"]
+
+
+class SyntheticTweetSource:
+    """
+    시드 기반으로 결정적인(deterministic) 검색 결과 페이지를 생성합니다.
+    같은 시드와 페이지 번호에는 항상 같은 페이로드가 만들어집니다.
+    """
+
+    def __init__(self, seed=42, pages=10, user_pool_size=500, media_ratio=0.3, base_time=None):
+        self.seed = seed
+        self.pages = pages
+        self.user_pool_size = user_pool_size
+        self.media_ratio = media_ratio
+        self.base_time = base_time or datetime.now(timezone.utc).replace(microsecond=0)
+
+    def _user(self, index):
+        user_id = str(10_000_000 + index)
+        return {
+            'id': user_id,
+            'name': f"사용자 {index}",
+            'username': f"user_{index}",
+            'profile_image_url': f"https://pbs.twimg.com/profile_images/{user_id}/normal.jpg",
+            'verified': index % 50 == 0,
+        }
+
+    def _text(self, rng):
+        words = rng.choices(SAMPLE_WORDS_KO, k=rng.randint(4, 12))
+        if rng.random() < 0.4:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(SAMPLE_WORDS_EN))
+        hashtags = rng.sample(SAMPLE_HASHTAGS, k=rng.randint(0, 3))
+        mentions = [f"user_{rng.randrange(self.user_pool_size)}" for _ in range(rng.randint(0, 2))]
+
+        text = " ".join(words)
+        entities = {}
+        hashtag_entities = []
+        for tag in hashtags:
+            start = len(text) + 1
+            text += f" #{tag}"
+            hashtag_entities.append({'start': start, 'end': start + len(tag) + 1, 'tag': tag})
+        mention_entities = []
+        for username in mentions:
+            start = len(text) + 1
+            text += f" @{username}"
+            mention_entities.append({
+                'start': start, 'end': start + len(username) + 1,
+                'username': username, 'id': str(10_000_000 + int(username.split('_')[1])),
+            })
+        if hashtag_entities:
+            entities['hashtags'] = hashtag_entities
+        if mention_entities:
+            entities['mentions'] = mention_entities
+        return text, entities
+
+    def page(self, page_index, max_results):
+        """
+        page_index번째 페이지의 응답 본문(dict)을 반환합니다.
+        :return: (본문 dict, 다음 페이지 번호 또는 None)
+        """
+        rng = random.Random(self.seed * 1_000_003 + page_index)
+        tweets, users, media = [], {}, {}
+
+        for i in range(max_results):
+            seq = page_index * max_results + i
+            tweet_id = str(1_800_000_000_000_000_000 - seq)
+            user = self._user(rng.randrange(self.user_pool_size))
+            users[user['id']] = user
+            text, entities = self._text(rng)
+            created_at = self.base_time - timedelta(seconds=seq * 7 + rng.randint(0, 6))
+
+            tweet = {
+                'id': tweet_id,
+                'text': text,
+                'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'author_id': user['id'],
+                'lang': 'ko',
+                'possibly_sensitive': False,
+                'source': 'Twitter for iPhone',
+                'edit_history_tweet_ids': [tweet_id],
+                'public_metrics': {
+                    'retweet_count': int(rng.paretovariate(1.5)) - 1,
+                    'reply_count': int(rng.paretovariate(1.8)) - 1,
+                    'like_count': int(rng.paretovariate(1.2)) - 1,
+                    'quote_count': int(rng.paretovariate(2.5)) - 1,
+                    'impression_count': int(rng.paretovariate(0.8) * 50),
+                },
+            }
+            if entities:
+                tweet['entities'] = entities
+            if rng.random() < self.media_ratio:
+                media_key = f"3_{tweet_id}"
+                media_type = rng.choice(MEDIA_TYPES)
+                media[media_key] = {
+                    'media_key': media_key,
+                    'type': media_type,
+                    'url': f"https://pbs.twimg.com/media/{media_key}.jpg" if media_type == 'photo' else None,
+                    'preview_image_url': f"https://pbs.twimg.com/media/{media_key}_thumb.jpg",
+                }
+                tweet['attachments'] = {'media_keys': [media_key]}
+            tweets.append(tweet)
+
+        has_next = page_index + 1 < self.pages
+        body = {
+            'data': tweets,
+            'includes': {'users': list(users.values())},
+            'meta': {
+                'newest_id': tweets[0]['id'],
+                'oldest_id': tweets[-1]['id'],
+                'result_count': len(tweets),
+            },
+        }
+        if media:
+            body['includes']['media'] = list(media.values())
+        if has_next:
+            body['meta']['next_token'] = f"p{page_index + 1:x}"
+        return body, (page_index + 1 if has_next else None)
+
+
+class CassetteTweetSource:
+    """
+    RecordReplaySession이 녹화한 카세트에서 search/recent 응답 본문만 꺼내
+    순서대로 페이지로 제공합니다. next_token은 대역 서버 기준으로 다시 씁니다.
+    """
+
+    def __init__(self, cassette_path):
+        self.bodies = []
+        with open(cassette_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if SEARCH_RECENT_PATH in entry['key'] and entry['status'] == 200:
+                    self.bodies.append(json.loads(entry['body']))
+        if not self.bodies:
+            raise ValueError(f"카세트에 search/recent 응답이 없습니다: {cassette_path}")
+        self.pages = len(self.bodies)
+
+    def page(self, page_index, max_results):
+        body = json.loads(json.dumps(self.bodies[page_index]))
+        meta = body.setdefault('meta', {})
+        meta.pop('next_token', None)
+        has_next = page_index + 1 < self.pages
+        if has_next:
+            meta['next_token'] = f"p{page_index + 1:x}"
+        return body, (page_index + 1 if has_next else None)
+
+
+class RateLimiter:
+    """15분 창(window) 단위의 요청 한도를 흉내냅니다 (search/recent 기본 450회)."""
+
+    def __init__(self, limit=450, window_seconds=900):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._used = 0
+
+    def acquire(self):
+        """:return: (허용 여부, 응답 헤더 dict)"""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window_seconds:
+                self._window_start = now
+                self._used = 0
+            allowed = self._used < self.limit
+            if allowed:
+                self._used += 1
+            reset = int(self._window_start + self.window_seconds)
+            headers = {
+                'x-rate-limit-limit': str(self.limit),
+                'x-rate-limit-remaining': str(max(self.limit - self._used, 0)),
+                'x-rate-limit-reset': str(reset),
+            }
+            return allowed, headers
+
+
+class StubTwitterServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, source, latency_ms=0, jitter_ms=0, rate_limiter=None):
+        super().__init__(address, StubTwitterRequestHandler)
+        self.source = source
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StubTwitterRequestHandler(BaseHTTPRequestHandler):
+    server_version = "StubTwitter/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('content-type', 'application/json; charset=utf-8')
+        self.send_header('content-length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        with server._count_lock:
+            server.request_count += 1
+
+        parts = urlsplit(self.path)
+        if parts.path != SEARCH_RECENT_PATH:
+            self._send_json(404, {'title': 'Not Found Error', 'detail': f"Unknown route {parts.path}"})
+            return
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._send_json(401, {'title': 'Unauthorized', 'status': 401, 'detail': 'Unauthorized'})
+            return
+
+        delay = server.latency_ms + (random.uniform(0, server.jitter_ms) if server.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        allowed, rate_headers = server.rate_limiter.acquire()
+        if not allowed:
+            self._send_json(429, {'title': 'Too Many Requests', 'status': 429, 'detail': 'Too Many Requests'}, rate_headers)
+            return
+
+        query = parse_qs(parts.query)
+        try:
+            max_results = int(query.get('max_results', ['10'])[0])
+        except ValueError:
+            max_results = 10
+        if not 10 <= max_results <= 100:
+            self._send_json(400, {'title': 'Invalid Request', 'detail': 'max_results must be between 10 and 100'})
+            return
+
+        token = (query.get('next_token') or query.get('pagination_token') or [None])[0]
+        page_index = 0
+        if token:
+            try:
+                page_index = int(token.lstrip('p'), 16)
+            except ValueError:
+                self._send_json(400, {'title': 'Invalid Request', 'detail': f"Invalid next_token {token}"})
+                return
+        if page_index >= server.source.pages:
+            self._send_json(200, {'meta': {'result_count': 0}}, rate_headers)
+            return
+
+        body, _ = server.source.page(page_index, max_results)
+        self._send_json(200, body, rate_headers)
+
+
+def start_stub_server(source=None, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, rate_limit=450):
+    """
+    대역 서버를 백그라운드 스레드에서 시작합니다. port=0이면 빈 포트를 사용합니다.
+    :return: StubTwitterServer (종료 시 server.shutdown(); server.server_close())
+    """
+    server = StubTwitterServer(
+        (host, port),
+        source or SyntheticTweetSource(),
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        rate_limiter=RateLimiter(limit=rate_limit),
+    )
+    thread = threading.Thread(target=server.serve_forever, name='stub-twitter-server', daemon=True)
+    thread.start()
+    logger.info(f"Twitter API 대역 서버 시작: {server.base_url}{SEARCH_RECENT_PATH}")
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Twitter API v2 search/recent 로컬 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=0, help="응답마다 추가할 고정 지연 (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="0~N ms 사이의 임의 추가 지연")
+    parser.add_argument('--rate-limit', type=int, default=450, help="15분 창당 허용 요청 수")
+    parser.add_argument('--pages', type=int, default=10, help="합성 모드에서 제공할 페이지 수")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=500, help="합성 작성자 풀 크기")
+    parser.add_argument('--cassette', help="녹화된 카세트(JSONL)를 재생 (지정 시 합성 생성 대신 사용)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    if args.cassette:
+        source = CassetteTweetSource(args.cassette)
+    else:
+        source = SyntheticTweetSource(seed=args.seed, pages=args.pages, user_pool_size=args.users)
+
+    server = start_stub_server(
+        source, host=args.host, port=args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit=args.rate_limit,
+    )
+    logger.info(f"수집기에서 TWITTER_API_BASE_URL={server.base_url} 로 지정하여 사용하세요. (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
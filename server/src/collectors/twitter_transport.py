@@ -0,0 +1,139 @@
+# src/collectors/twitter_transport.py
+
+import json
+import os
+import logging
+import threading
+from collections import defaultdict, deque
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+TWITTER_API_HOST = "https://api.twitter.com"
+
+# 카세트 파일에 저장할 응답 헤더 (rate limit 정보 위주)
+RECORDED_HEADERS = (
+    'content-type',
+    'x-rate-limit-limit',
+    'x-rate-limit-remaining',
+    'x-rate-limit-reset',
+)
+
+
+class CassetteMissError(LookupError):
+    """리플레이 모드에서 요청에 대응하는 녹화 응답이 없을 때 발생합니다."""
+
+
+def _request_key(method, url, params):
+    """
+    요청을 카세트 조회용 키로 변환합니다.
+    호스트는 무시하고 (메소드, 경로, 정렬된 쿼리 파라미터)만 사용하므로
+    실제 API와 로컬 대역 서버에서 녹화한 카세트를 구분 없이 재생할 수 있습니다.
+    """
+    parts = urlsplit(url)
+    query = list(parse_qsl(parts.query, keep_blank_values=True))
+    if params:
+        items = params.items() if isinstance(params, dict) else params
+        query.extend((str(k), str(v)) for k, v in items if v is not None)
+    return f"{method.upper()} {parts.path}?" + "&".join(f"{k}={v}" for k, v in sorted(query))
+
+
+class RecordReplaySession(requests.Session):
+    """
+    tweepy.Client의 HTTP 세션을 대체하는 녹화/재생 전송 계층.
+
+    - mode=None: 요청을 그대로 보냅니다. api_base_url이 주어지면 호스트만 바꿉니다.
+    - mode='record': 실제 요청을 보내고 응답을 카세트(JSONL)에 한 줄씩 기록합니다.
+    - mode='replay': 네트워크 없이 카세트에 기록된 응답을 순서대로 돌려줍니다.
+
+    tweepy는 호스트를 'https://api.twitter.com'으로 고정하므로,
+    로컬 대역 서버(twitter_stub_server)로 보내려면 api_base_url을 지정합니다.
+    """
+
+    MODES = (None, 'record', 'replay')
+
+    def __init__(self, mode=None, cassette_path=None, api_base_url=None):
+        super().__init__()
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 전송 모드입니다: {mode}")
+        if mode and not cassette_path:
+            raise ValueError(f"'{mode}' 모드에는 cassette_path가 필요합니다.")
+
+        self.mode = mode
+        self.cassette_path = cassette_path
+        self.api_base_url = api_base_url.rstrip('/') if api_base_url else None
+        self._lock = threading.Lock()
+        self._replay_queues = defaultdict(deque)
+
+        if mode == 'replay':
+            self._load_cassette()
+        elif mode == 'record':
+            cassette_dir = os.path.dirname(os.path.abspath(cassette_path))
+            os.makedirs(cassette_dir, exist_ok=True)
+
+    def _load_cassette(self):
+        """카세트 파일을 읽어 요청 키별 응답 큐를 구성합니다."""
+        count = 0
+        with open(self.cassette_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                self._replay_queues[entry['key']].append(entry)
+                count += 1
+        logger.info(f"카세트 '{self.cassette_path}'에서 응답 {count}개를 불러왔습니다.")
+
+    def request(self, method, url, params=None, **kwargs):
+        if self.api_base_url and url.startswith(TWITTER_API_HOST):
+            url = self.api_base_url + url[len(TWITTER_API_HOST):]
+
+        key = _request_key(method, url, params)
+
+        if self.mode == 'replay':
+            return self._replay(key, url)
+
+        response = super().request(method, url, params=params, **kwargs)
+        if self.mode == 'record':
+            self._record(key, response)
+        return response
+
+    def _replay(self, key, url):
+        with self._lock:
+            queue = self._replay_queues.get(key)
+            if not queue:
+                raise CassetteMissError(f"카세트에 녹화된 응답이 없습니다: {key}")
+            entry = queue.popleft()
+            # 같은 요청이 반복되면 마지막 응답을 계속 재생합니다 (부하 테스트용 반복 실행 지원)
+            if not queue:
+                queue.append(entry)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason', '')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+    def _record(self, key, response):
+        headers = {
+            name: response.headers[name]
+            for name in RECORDED_HEADERS if name in response.headers
+        }
+        entry = {
+            'key': key,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': headers,
+            'body': response.content.decode('utf-8'),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.cassette_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        logger.debug(f"카세트에 응답 기록: {key} ({response.status_code})")
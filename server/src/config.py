@@ -0,0 +1,59 @@
+# src/config.py
+"""
+환경 변수 설정 로더.
+
+.env 파일은 import 시점이 아니라 실행 진입점(main 함수, 수집기 팩토리)에서 load_env()로 한 번만 읽습니다.
+이미 설정된 환경 변수는 .env 값으로 덮어쓰지 않습니다 (python-dotenv 기본 동작).
+"""
+
+import os
+import threading
+
+from .lazy_import import lazy_import
+
+dotenv = lazy_import('dotenv')
+
+# 프로젝트 루트 (server 폴더의 부모)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# 수집기 로컬 스풀 기본 위치 (COLLECTOR_SPOOL_DIR로 변경)
+DEFAULT_SPOOL_DIR = os.path.join(PROJECT_ROOT, 'data', 'spool')
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """프로젝트 루트의 .env(없으면 현재 작업 디렉토리 기준 기본 위치)를 프로세스당 한 번 로드합니다."""
+    global _env_loaded
+    with _env_lock:
+        if _env_loaded:
+            return
+        dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+        if os.path.exists(dotenv_path):
+            dotenv.load_dotenv(dotenv_path=dotenv_path)
+        else:
+            dotenv.load_dotenv()
+        _env_loaded = True
+
+
+def env_flag(name, default=False):
+    """'1', 'true', 'yes'(대소문자 무시)이면 True."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def collector_spool_dir():
+    """
+    수집기가 문서를 먼저 기록할 로컬 스풀 디렉토리. 기본으로 켜져 있어 CouchDB 장애 중에도 수집 문서를 잃지 않습니다.
+    COLLECTOR_SPOOL=0이면 None (스풀 없이 DB에 바로 기록).
+    """
+    if not env_flag("COLLECTOR_SPOOL", True):
+        return None
+    return os.getenv("COLLECTOR_SPOOL_DIR") or DEFAULT_SPOOL_DIR
@@ -0,0 +1,180 @@
+# src/cooccurrence.py
+"""
+키워드 동시 출현 그래프 (연관 키워드).
+
+같은 트윗에 함께 나온 키워드 쌍을 세어 "MBTI" ↔ "심리테스트" 같은 연관 키워드를 찾습니다.
+- 키워드는 정수 ID로 바꾸고, 쌍은 (작은 ID << 32) | 큰 ID 정수 키 하나로 Counter에 세므로
+  실제로 나온 쌍만 저장합니다(희소). 토큰화는 KeywordAnalyzer._tokenize_tweets 결과를 그대로 사용합니다.
+- 트윗당 서로 다른 키워드는 앞에서부터 max_terms_per_tweet개만 쓰므로 트윗 하나가 만드는 쌍은
+  최대 n(n-1)/2개입니다 (긴 트윗/스팸 때문에 쌍 수가 제곱으로 늘지 않음).
+- TrendScorer와 같이 한 시간 구간이 끝나면 그 구간만 집계해 창 합계에 더하고, 창을 벗어난 구간은 합계에서 뺍니다.
+  실행마다 새로 들어온 구간만 계산합니다.
+- 창 합계의 쌍 수가 max_pairs를 넘으면 min_pair_count 미만인 드문 쌍을 버립니다.
+  버린 쌍이 다시 나오면 그때부터 다시 셉니다(근사치).
+
+연관도는 PMI = log(N * c(x, y) / (c(x) * c(y)))이며, N은 창 안의 트윗 수, c는 키워드/쌍이 나온 트윗 수입니다.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from itertools import combinations
+
+from .trend_scorer import SECONDS_PER_HOUR, _bucket_of
+
+_SHIFT = 32
+_LOW_MASK = (1 << _SHIFT) - 1
+
+
+class _Bucket:
+    __slots__ = ('tweets', 'keywords', 'pairs')
+
+    def __init__(self):
+        self.tweets = 0
+        self.keywords = Counter()  # 키워드 ID -> 나온 트윗 수
+        self.pairs = Counter()     # 쌍 키 -> 함께 나온 트윗 수
+
+
+class CooccurrenceGraph:
+    def __init__(self, window_hours=24 * 7, max_terms_per_tweet=10, min_pair_count=3, max_pairs=500_000):
+        """
+        :param window_hours: 합계에 포함할 최근 시간 구간 수
+        :param max_terms_per_tweet: 트윗당 쌍을 만들 최대 키워드 수
+        :param min_pair_count: 연관 키워드로 내보낼 최소 동시 출현 수 (정리 시 이보다 적은 쌍을 버림)
+        :param max_pairs: 창 합계에 보관할 쌍 수 상한
+        """
+        self.window_hours = window_hours
+        self.max_terms_per_tweet = max_terms_per_tweet
+        self.min_pair_count = min_pair_count
+        self.max_pairs = max_pairs
+        self.ids = {}       # 키워드 -> ID
+        self.words = []     # ID -> 키워드 (빈 자리는 None)
+        self._free_ids = []
+        self.buckets = {}   # 시간 구간 -> _Bucket (창 안의 구간만)
+        self.tweets = 0
+        self.keywords = Counter()
+        self.pairs = Counter()
+        self.last_closed = None
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def _id_of(self, keyword):
+        keyword_id = self.ids.get(keyword)
+        if keyword_id is None:
+            if self._free_ids:
+                keyword_id = self._free_ids.pop()
+                self.words[keyword_id] = keyword
+            else:
+                keyword_id = len(self.words)
+                self.words.append(keyword)
+            self.ids[keyword] = keyword_id
+        return keyword_id
+
+    def _count_bucket(self, tweet_keywords):
+        bucket = _Bucket()
+        limit = self.max_terms_per_tweet
+        for keywords in tweet_keywords:
+            bucket.tweets += 1
+            # 순서를 지키며 중복을 없앤 뒤 앞에서부터 limit개
+            distinct = list(dict.fromkeys(keywords))[:limit]
+            ids = sorted(self._id_of(keyword) for keyword in distinct)
+            bucket.keywords.update(ids)
+            if len(ids) > 1:
+                bucket.pairs.update((a << _SHIFT) | b for a, b in combinations(ids, 2))
+        return bucket
+
+    def update(self, hour, tweet_keywords):
+        """hour 구간을 닫고 그 구간 트윗들의 키워드 리스트를 반영합니다. 이미 닫힌 구간이면 무시합니다."""
+        if self.last_closed is not None and hour <= self.last_closed:
+            return False
+        bucket = self._count_bucket(tweet_keywords)
+        self.buckets[hour] = bucket
+        self.tweets += bucket.tweets
+        self.keywords.update(bucket.keywords)
+        self.pairs.update(bucket.pairs)
+        self.last_closed = hour
+        self._expire(hour)
+        if len(self.pairs) > self.max_pairs:
+            self.prune()
+        return True
+
+    def _expire(self, hour):
+        """창(window_hours)을 벗어난 구간을 합계에서 빼고, 더 이상 나오지 않는 키워드의 ID를 돌려받습니다."""
+        for old in [old for old in self.buckets if old <= hour - self.window_hours]:
+            bucket = self.buckets.pop(old)
+            self.tweets -= bucket.tweets
+            for key, count in bucket.pairs.items():
+                remaining = self.pairs.get(key)
+                if remaining is None:
+                    continue  # 정리(prune)로 이미 버린 쌍
+                if remaining <= count:
+                    del self.pairs[key]
+                else:
+                    self.pairs[key] = remaining - count
+            for keyword_id, count in bucket.keywords.items():
+                remaining = self.keywords[keyword_id] - count
+                if remaining > 0:
+                    self.keywords[keyword_id] = remaining
+                    continue
+                # 창 안의 어느 구간에도 없는 키워드이므로 이 ID를 가리키는 쌍도 없음
+                del self.keywords[keyword_id]
+                del self.ids[self.words[keyword_id]]
+                self.words[keyword_id] = None
+                self._free_ids.append(keyword_id)
+
+    def prune(self):
+        """창 합계에서 min_pair_count 미만인 쌍을 버리고 버린 수를 반환합니다."""
+        rare = [key for key, count in self.pairs.items() if count < self.min_pair_count]
+        for key in rare:
+            del self.pairs[key]
+        return len(rare)
+
+    def close_buckets(self, tweets, tweet_keywords, now=None):
+        """
+        마지막으로 닫은 구간 이후 now 이전에 끝난 구간들을 시간순으로 닫습니다. 닫은 구간 수를 반환합니다.
+        :param tweet_keywords: tweets와 같은 순서의 키워드 리스트 (KeywordAnalyzer._tokenize_tweets 결과)
+        """
+        now = now or datetime.now(timezone.utc)
+        current = int(now.timestamp()) // SECONDS_PER_HOUR
+        oldest = current - self.window_hours
+        buckets = defaultdict(list)
+        for tweet, keywords in zip(tweets, tweet_keywords):
+            hour = _bucket_of(tweet)
+            if hour is None or hour >= current or hour < oldest \
+                    or (self.last_closed is not None and hour <= self.last_closed):
+                continue
+            buckets[hour].append(keywords)
+        for hour in sorted(buckets):
+            self.update(hour, buckets[hour])
+        if buckets or self.last_closed is not None:
+            # 트윗이 없던 구간도 닫힌 것으로 기록하고 창을 벗어난 구간을 정리
+            self.last_closed = current - 1
+            self._expire(self.last_closed)
+        return len(buckets)
+
+    def related(self, keywords, limit=5):
+        """
+        키워드별 연관 키워드 목록을 PMI 내림차순으로 반환합니다. 창 합계를 한 번만 훑습니다.
+        :return: {키워드: [{'keyword', 'count', 'pmi'}, ...]} (창에 없는 키워드는 빈 리스트)
+        """
+        wanted = {self.ids[keyword]: keyword for keyword in keywords if keyword in self.ids}
+        candidates = {keyword: [] for keyword in keywords}
+        if not wanted or not self.tweets:
+            return candidates
+        log_total = math.log(self.tweets)
+        counts, words, min_count = self.keywords, self.words, self.min_pair_count
+        for key, count in self.pairs.items():
+            if count < min_count:
+                continue
+            a, b = key >> _SHIFT, key & _LOW_MASK
+            for x, y in ((a, b), (b, a)):
+                if x in wanted:
+                    pmi = log_total + math.log(count) - math.log(counts[x]) - math.log(counts[y])
+                    candidates[wanted[x]].append((pmi, count, words[y]))
+        return {
+            keyword: [{'keyword': word, 'count': count, 'pmi': round(pmi, 3)}
+                      for pmi, count, word in heapq.nlargest(limit, items)]
+            for keyword, items in candidates.items()
+        }
@@ -1,12 +1,62 @@
 # src/db_handler.py
-import couchdb
 import os
+import base64
+import json
 import logging
 from datetime import datetime # main 테스트용 임포트
 
+from .lazy_import import lazy_import
+from .metrics import REGISTRY, SampledLogger
+
+# couchdb는 첫 연결 시 import (import 시간 단축)
+couchdb = lazy_import('couchdb')
+
 # 로거 객체 생성
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# 문서 단위 저장 로그는 처리량에 영향을 주므로 샘플링된 DEBUG 로그로만 남김
+_sampled_logger = SampledLogger(logger, every=100)
+
+STORE_REQUEST_SECONDS = REGISTRY.histogram(
+    'todaytrends_store_request_seconds', "CouchDB 요청 지연 시간(초)", ['operation'])
+STORE_DOCS_WRITTEN = REGISTRY.counter(
+    'todaytrends_store_docs_written_total', "CouchDB에 기록된 문서 수", ['operation'])
+STORE_CONFLICTS = REGISTRY.counter(
+    'todaytrends_store_conflicts_total', "CouchDB 쓰기 충돌(ResourceConflict) 수", ['operation'])
+STORE_ERRORS = REGISTRY.counter(
+    'todaytrends_store_errors_total', "CouchDB 요청/문서 쓰기 실패 수", ['operation'])
+
+# 서버 측 인덱스. _all_docs는 ID 순서라 최신순 조회/페이지 이동에 쓸 수 없음
+DESIGN_DOCS = {
+    '_design/tweets': {
+        'language': 'javascript',
+        'views': {
+            # 작성 시각(ISO 8601 문자열) 순 트윗 인덱스. 같은 시각은 문서 ID 순으로 정렬됨
+            'by_created_at': {
+                'map': "function (doc) { if (doc._id.indexOf('twitter:') === 0 && doc.created_at) { emit(doc.created_at, null); } }",
+            },
+            # 수집 시각 순 인덱스. 보존 기간이 지난 트윗을 전체 스캔 없이 찾는 데 사용 (retention 참고)
+            'by_collected_at': {
+                'map': "function (doc) { if (doc._id.indexOf('twitter:') === 0 && doc.collected_at) { emit(doc.collected_at, null); } }",
+            },
+        },
+    },
+}
+
+
+def _encode_cursor(key, doc_id):
+    raw = json.dumps([key, doc_id], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key, doc_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor!r}") from e
+    return key, doc_id
+
 
 class CouchDBHandler:
     def __init__(self, db_url, db_name, username=None, password=None):
@@ -23,6 +73,7 @@ class CouchDBHandler:
         self.password = password # 이 파라미터들은 URL에 없을 경우 보조적으로 사용될 수 있음
         self.server = None
         self.db = None
+        self._design_docs_ready = False
         self._connect()
 
     def _connect(self):
@@ -108,21 +159,60 @@ class CouchDBHandler:
                 # if '_rev' not in doc_data and _id_to_use in self.db:
                 #    logger.warning(f"문서 '{_id_to_use}' 업데이트 시도 중 '_rev' 누락. 충돌 발생 가능성 있음.")
 
-                doc_id, doc_rev = self.db.save(doc_data)
+                with STORE_REQUEST_SECONDS.time(operation='save'):
+                    doc_id, doc_rev = self.db.save(doc_data)
             else:
                 # ID 자동 생성
-                doc_id, doc_rev = self.db.save(doc_data)
+                with STORE_REQUEST_SECONDS.time(operation='save'):
+                    doc_id, doc_rev = self.db.save(doc_data)
 
-            logger.info(f"문서 ID '{doc_id}' (Rev: {doc_rev}) 성공적으로 저장/업데이트되었습니다.")
+            STORE_DOCS_WRITTEN.inc(operation='save')
+            _sampled_logger.debug(f"문서 ID '{doc_id}' (Rev: {doc_rev}) 성공적으로 저장/업데이트되었습니다.")
             return doc_id, doc_rev
         except couchdb.http.ResourceConflict as e:
+            STORE_CONFLICTS.inc(operation='save')
             logger.warning(f"문서 ID '{_id_to_use or '자동'}' 저장/업데이트 중 충돌 발생 (ResourceConflict): {e}. '_rev'를 확인하거나 문서가 이미 다른 리비전으로 존재합니다.", exc_info=True)
             raise # 충돌은 호출자가 처리하도록 예외를 다시 발생
         except Exception as e:
+            STORE_ERRORS.inc(operation='save')
             logger.error(f"문서 저장/업데이트 중 알 수 없는 오류 (ID 시도: '{_id_to_use or '자동'}'): {e}", exc_info=True)
             # 다른 유형의 예외도 발생할 수 있으므로, 필요에 따라 더 구체적으로 처리
             raise # 또는 None 반환 대신 예외를 발생시켜 문제 전파
 
+    def save_docs_bulk(self, docs):
+        """
+        여러 문서를 _bulk_docs 요청 한 번으로 저장/업데이트합니다.
+        문서별 결과를 돌려주며, 일부 문서의 충돌(ResourceConflict)은 예외가 아니라 결과로 전달됩니다.
+
+        :param docs: 저장할 문서(dict) 리스트. 업데이트할 문서는 '_rev' 포함 필수.
+        :return: (성공 여부, 문서 ID, 리비전 또는 예외 객체) 튜플 리스트. 연결되지 않았으면 None.
+        :raises: 요청 자체가 실패한 경우 couchdb 예외
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 문서를 일괄 저장할 수 없습니다.")
+            return None
+        if not docs:
+            return []
+
+        try:
+            with STORE_REQUEST_SECONDS.time(operation='bulk_docs'):
+                results = self.db.update(docs)
+        except Exception as e:
+            STORE_ERRORS.inc(len(docs), operation='bulk_docs')
+            logger.error(f"문서 {len(docs)}개 일괄 저장 중 오류: {e}", exc_info=True)
+            raise
+
+        conflicts = sum(
+            1 for success, _, rev_or_exc in results
+            if not success and isinstance(rev_or_exc, couchdb.http.ResourceConflict)
+        )
+        failed = sum(1 for success, _, _ in results if not success)
+        STORE_DOCS_WRITTEN.inc(len(results) - failed, operation='bulk_docs')
+        STORE_CONFLICTS.inc(conflicts, operation='bulk_docs')
+        STORE_ERRORS.inc(failed - conflicts, operation='bulk_docs')
+        logger.info(f"문서 {len(docs)}개 일괄 저장 완료 (실패/충돌 {failed}개)")
+        return results
+
     def get_doc(self, doc_id):
         """
         주어진 ID로 문서를 조회합니다.
@@ -133,7 +223,8 @@ class CouchDBHandler:
             logger.error("CouchDB에 연결되지 않아 문서를 조회할 수 없습니다.")
             return None # 또는 예외 발생
         try:
-            doc = self.db.get(doc_id) # 존재하지 않으면 None 반환
+            with STORE_REQUEST_SECONDS.time(operation='get'):
+                doc = self.db.get(doc_id) # 존재하지 않으면 None 반환
             if doc:
                 logger.debug(f"문서 ID '{doc_id}' 성공적으로 조회했습니다.")
                 return dict(doc) # couchdb.Document 객체를 순수 dict로 변환
@@ -144,6 +235,24 @@ class CouchDBHandler:
             logger.error(f"문서 ID '{doc_id}' 조회 중 오류 발생: {e}", exc_info=True)
             raise # 조회 실패 시 예외 발생
 
+    def get_attachment(self, doc_id, filename):
+        """
+        문서의 첨부 파일 내용을 가져옵니다.
+        :return: 첨부 파일 바이트, 문서나 첨부 파일이 없으면 None
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 첨부 파일을 조회할 수 없습니다.")
+            return None
+        try:
+            with STORE_REQUEST_SECONDS.time(operation='get_attachment'):
+                attachment = self.db.get_attachment(doc_id, filename)
+                return attachment.read() if attachment is not None else None
+        except couchdb.http.ResourceNotFound:
+            return None
+        except Exception as e:
+            logger.error(f"문서 ID '{doc_id}'의 첨부 파일 '{filename}' 조회 중 오류 발생: {e}", exc_info=True)
+            raise
+
     def delete_doc(self, doc_id):
         """
         주어진 ID의 문서를 삭제합니다. 삭제하려면 최신 _rev 정보가 필요합니다.
@@ -181,7 +290,8 @@ class CouchDBHandler:
             return None # 또는 예외 발생
         try:
             logger.debug(f"뷰 '{view_name}' 실행 (옵션: {options})")
-            results = self.db.view(view_name, **options)
+            with STORE_REQUEST_SECONDS.time(operation='view'):
+                results = self.db.view(view_name, **options)
             return results
         except couchdb.http.ResourceNotFound as e:
             logger.error(f"뷰 '{view_name}'을(를) 찾을 수 없습니다 (ResourceNotFound): {e}", exc_info=True)
@@ -190,6 +300,98 @@ class CouchDBHandler:
             logger.error(f"뷰 '{view_name}' 실행 중 오류 발생: {e}", exc_info=True)
             raise
 
+    def ensure_design_docs(self, design_docs=DESIGN_DOCS):
+        """
+        필요한 디자인 문서(뷰 정의)가 없거나 내용이 다르면 저장합니다. 이미 같으면 아무것도 하지 않습니다.
+        :return: 새로 저장하거나 갱신한 디자인 문서 ID 리스트
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 디자인 문서를 확인할 수 없습니다.")
+            return []
+        updated = []
+        for doc_id, definition in design_docs.items():
+            existing = self.get_doc(doc_id)
+            if existing and all(existing.get(field) == value for field, value in definition.items()):
+                continue
+            doc = dict(definition, _id=doc_id)
+            if existing:
+                doc['_rev'] = existing['_rev']
+            self.save_doc(doc)
+            logger.info(f"디자인 문서 '{doc_id}'을(를) {'갱신' if existing else '생성'}했습니다.")
+            updated.append(doc_id)
+        self._design_docs_ready = True
+        return updated
+
+    def iter_recent_tweets(self, cursor=None, limit=50):
+        """
+        작성 시각(created_at) 최신순으로 트윗을 한 페이지씩 가져옵니다 (_design/tweets/by_created_at 뷰).
+        skip 대신 startkey + startkey_docid로 이어 읽으므로 몇 번째 페이지든 비용이 같습니다.
+        :param cursor: 이전 호출이 반환한 커서 (첫 페이지는 None)
+        :param limit: 페이지 크기
+        :return: (트윗 문서 리스트, 다음 페이지 커서 또는 마지막 페이지면 None) 튜플. 커서가 잘못되면 ValueError
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 트윗을 조회할 수 없습니다.")
+            return [], None
+        if not self._design_docs_ready:
+            self.ensure_design_docs()
+
+        # 한 행을 더 읽어 다음 페이지의 시작 위치(키, 문서 ID)로 사용
+        options = {'descending': True, 'include_docs': True, 'limit': limit + 1}
+        if cursor:
+            options['startkey'], options['startkey_docid'] = _decode_cursor(cursor)
+        with STORE_REQUEST_SECONDS.time(operation='view'):
+            rows = list(self.db.view('tweets/by_created_at', **options))
+
+        next_cursor = _encode_cursor(rows[limit].key, rows[limit].id) if len(rows) > limit else None
+        tweets = [dict(row.doc) for row in rows[:limit] if row.doc]
+        return tweets, next_cursor
+
+    def compact(self, design_docs=DESIGN_DOCS):
+        """
+        데이터베이스와 뷰 인덱스 압축(compaction), 사용하지 않는 뷰 인덱스 정리를 요청합니다.
+        CouchDB가 백그라운드에서 수행하므로 요청만 보내고 바로 반환합니다.
+        :return: 요청 성공 시 True
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 압축을 요청할 수 없습니다.")
+            return False
+        try:
+            with STORE_REQUEST_SECONDS.time(operation='compact'):
+                self.db.compact()
+                for doc_id in design_docs:
+                    self.db.compact(doc_id[len('_design/'):])
+                self.db.cleanup()
+            logger.info(f"데이터베이스 '{self.db_name}' 압축을 요청했습니다.")
+            return True
+        except Exception as e:
+            STORE_ERRORS.inc(operation='compact')
+            logger.error(f"데이터베이스 압축 요청 중 오류: {e}", exc_info=True)
+            return False
+
+    def changes_since(self, since=0, limit=None, include_docs=True):
+        """
+        _changes 피드로 since 시퀀스 이후 변경된 문서를 가져옵니다 (증분 로딩용).
+        :param since: 마지막으로 처리한 시퀀스 (0이면 처음부터)
+        :param limit: 한 번에 가져올 최대 변경 수
+        :return: (변경 리스트, 마지막 시퀀스) 튜플. 변경 항목은 {'id', 'seq', 'deleted'(선택), 'doc'(include_docs 시)} dict.
+                 연결되지 않았으면 ([], since)
+        """
+        if not self.is_connected():
+            logger.error("CouchDB에 연결되지 않아 변경 피드를 가져올 수 없습니다.")
+            return [], since
+
+        options = {'since': since, 'include_docs': include_docs}
+        if limit:
+            options['limit'] = limit
+        try:
+            with STORE_REQUEST_SECONDS.time(operation='changes'):
+                result = self.db.changes(**options)
+        except Exception as e:
+            logger.error(f"변경 피드 조회 중 오류 (since={since}): {e}", exc_info=True)
+            raise
+        return result.get('results', []), result.get('last_seq', since)
+
     def get_all_documents(self, include_docs=True, limit=None):
         """
         데이터베이스의 모든 문서를 가져옵니다.
@@ -207,14 +409,16 @@ class CouchDBHandler:
             if limit:
                 options['limit'] = limit
                 
-            results = self.db.view('_all_docs', **options)
-            
-            if include_docs:
-                # 문서 내용만 추출
-                documents = [row.doc for row in results if row.doc and not row.id.startswith('_design')]
-            else:
-                # 문서 ID만 추출
-                documents = [row.id for row in results if not row.id.startswith('_design')]
+            # couchdb-python의 view는 지연 실행되므로 행을 읽는 구간까지 포함해 측정
+            with STORE_REQUEST_SECONDS.time(operation='all_docs'):
+                results = self.db.view('_all_docs', **options)
+
+                if include_docs:
+                    # 문서 내용만 추출
+                    documents = [row.doc for row in results if row.doc and not row.id.startswith('_design')]
+                else:
+                    # 문서 ID만 추출
+                    documents = [row.id for row in results if not row.id.startswith('_design')]
             
             logger.info(f"총 {len(documents)}개의 문서를 가져왔습니다.")
             return documents
@@ -369,7 +573,7 @@ if __name__ == '__main__':
 # 5. [완료] 상세한 오류 처리 및 사용자 정의 예외 타입 정의 (ConnectionError 등 사용).
 # 6. [선택] 연결 풀링 고려 (고성능 환경에서).
 # 7. [완료] save_doc에서 ResourceConflict 발생 시 처리: 현재는 예외를 다시 발생시켜 호출자가 처리하도록 함. 필요시 자동 재시도 로직 추가 가능.
-# 8. [선택] bulk_docs와 같은 대량 작업 API 지원 추가 (성능 향상).
+# 8. [완료] bulk_docs와 같은 대량 작업 API 지원 추가 (성능 향상). -> save_docs_bulk
 # 9. [완료] is_connected() 메소드 견고성 강화 (실제 연결 상태 확인).
 # 10. [완료] main 테스트 코드 개선: assert문 사용, 테스트 DB 자동 생성 및 삭제 로직.
 
@@ -0,0 +1,178 @@
+# src/engagement_scoring.py
+"""
+참여도 가중 키워드 순위.
+
+트윗별 참여도 벡터(engagement_metrics의 좋아요/댓글/공유/조회/인용 수)와 트윗-키워드 발생 행렬(희소 COO:
+키워드 번호 배열, 트윗 번호 배열)을 만들어, 모든 키워드의 합계/평균/백분위수와 순위 점수를 한 번에 계산합니다.
+- 트윗 가중 참여도 = 지표 행렬 @ weights
+- 키워드별 합계/지표별 평균: 키워드 번호로 bincount
+- 백분위수: (키워드, 값)으로 정렬한 뒤 키워드 구간마다 nearest-rank(lower) 위치의 값
+- 점수 = 평균 가중 참여도 × 등장 횟수^frequency_exponent (빈도와 참여도를 함께 반영)
+
+numpy가 있으면 위 계산을 벡터 연산으로 하고, 없으면 같은 결과를 내는 순수 파이썬 구현을 사용합니다.
+키워드 리스트에 같은 키워드가 여러 번 있으면 기존 참여도 집계와 같이 그 횟수만큼 셉니다.
+"""
+
+import heapq
+import importlib.util
+import math
+from collections import defaultdict
+
+from .lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+METRICS = ('likes_count', 'comments_count', 'shares_count', 'views_count', 'quote_count')
+# 기존 참여도 정의(좋아요 + 댓글 + 공유)와 같은 기본 가중치
+DEFAULT_WEIGHTS = {'likes_count': 1, 'comments_count': 1, 'shares_count': 1, 'views_count': 0, 'quote_count': 0}
+
+
+class KeywordEngagement:
+    """EngagementScorer.score() 결과. 키워드 번호 순서의 병렬 리스트를 보관합니다."""
+
+    def __init__(self, keywords, counts, totals, metric_means, percentiles, scores):
+        self.keywords = keywords
+        self.counts = counts
+        self.totals = totals
+        self.metric_means = metric_means  # 지표 이름 -> 키워드별 평균
+        self.percentiles = percentiles    # 백분위 -> 키워드별 값
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def engagement_stats(self):
+        """keyword_trends['engagement']와 같은 {키워드: {'total', 'count', 'avg'}} 형태."""
+        return {
+            keyword: {'total': total, 'count': count, 'avg': total / count}
+            for keyword, total, count in zip(self.keywords, self.totals, self.counts)
+        }
+
+    def top(self, limit=20, min_count=2):
+        """점수 상위 키워드. 등장 횟수가 min_count 미만인 키워드는 제외합니다."""
+        counts, scores = self.counts, self.scores
+        ranked = heapq.nlargest(limit, (i for i in range(len(counts)) if counts[i] >= min_count),
+                                key=lambda i: (scores[i], counts[i]))
+        return [
+            {
+                'keyword': self.keywords[i],
+                'score': round(scores[i], 3),
+                'count': counts[i],
+                'avg': round(self.totals[i] / counts[i], 3),
+                'percentiles': {str(q): values[i] for q, values in self.percentiles.items()},
+                'metrics': {name: round(values[i], 3) for name, values in self.metric_means.items()},
+            }
+            for i in ranked
+        ]
+
+
+class EngagementScorer:
+    def __init__(self, weights=None, percentiles=(50, 90), frequency_exponent=0.5, backend='auto'):
+        """
+        :param weights: 지표 이름 -> 가중치 (없는 지표는 0). 기본은 좋아요 + 댓글 + 공유
+        :param percentiles: 키워드별로 계산할 가중 참여도 백분위 (0~100)
+        :param frequency_exponent: 점수에서 등장 횟수의 지수 (0이면 평균 참여도만, 1이면 합계)
+        :param backend: 'numpy', 'python', 'auto'(numpy가 있으면 numpy)
+        """
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(METRICS)
+        if unknown:
+            raise ValueError(f"알 수 없는 참여도 지표: {', '.join(sorted(unknown))}")
+        if backend not in ('auto', 'numpy', 'python'):
+            raise ValueError("backend는 'auto', 'numpy', 'python' 중 하나여야 합니다.")
+        if backend == 'numpy' and not HAS_NUMPY:
+            raise RuntimeError("numpy가 설치되어 있지 않습니다 (pip install numpy).")
+        self.weights = [weights.get(name, 0) for name in METRICS]
+        # 가중치가 모두 정수면 합계도 정수로 (기존 참여도 합계와 같은 값)
+        self.integral = all(float(weight).is_integer() for weight in self.weights)
+        self.percentiles = tuple(percentiles)
+        self.frequency_exponent = frequency_exponent
+        self.backend = ('numpy' if HAS_NUMPY else 'python') if backend == 'auto' else backend
+
+    def score(self, tweets, tweet_keywords):
+        """
+        :param tweet_keywords: tweets와 같은 순서의 키워드 리스트 (KeywordAnalyzer._tokenize_tweets 결과)
+        :return: KeywordEngagement
+        """
+        ids = {}
+        keyword_index, tweet_index = [], []
+        for position, keywords in enumerate(tweet_keywords):
+            for keyword in keywords:
+                keyword_index.append(ids.setdefault(keyword, len(ids)))
+                tweet_index.append(position)
+        metrics = [_metric_row(tweet) for tweet in tweets]
+        keywords = list(ids)
+        if self.backend == 'numpy':
+            return self._score_numpy(keywords, keyword_index, tweet_index, metrics)
+        return self._score_python(keywords, keyword_index, tweet_index, metrics)
+
+    def _finish(self, keywords, counts, totals, metric_totals, percentiles):
+        if self.integral:
+            totals = [int(round(total)) for total in totals]
+        exponent = self.frequency_exponent
+        scores = [total / count * count ** exponent for total, count in zip(totals, counts)]
+        metric_means = {
+            name: [total / count for total, count in zip(column, counts)]
+            for name, column in zip(METRICS, metric_totals)
+        }
+        return KeywordEngagement(keywords, counts, totals, metric_means, percentiles, scores)
+
+    def _score_numpy(self, keywords, keyword_index, tweet_index, metrics):
+        size = len(keywords)
+        rows = np.asarray(keyword_index, dtype=np.int64)
+        columns = np.asarray(tweet_index, dtype=np.int64)
+        matrix = np.asarray(metrics, dtype=np.float64).reshape(-1, len(METRICS))
+        values = (matrix @ np.asarray(self.weights, dtype=np.float64))[columns]
+
+        counts = np.bincount(rows, minlength=size)
+        totals = np.bincount(rows, weights=values, minlength=size)
+        entries = matrix[columns]
+        metric_totals = [np.bincount(rows, weights=entries[:, j], minlength=size).tolist()
+                         for j in range(len(METRICS))]
+
+        percentiles = {}
+        if size and self.percentiles:
+            ordered = values[np.lexsort((values, rows))]
+            starts = np.cumsum(counts) - counts
+            for q in self.percentiles:
+                offsets = np.floor(q / 100 * (counts - 1)).astype(np.int64)
+                percentiles[q] = _plain(ordered[starts + offsets].tolist(), self.integral)
+        else:
+            percentiles = {q: [] for q in self.percentiles}
+        return self._finish(keywords, counts.tolist(), totals.tolist(), metric_totals, percentiles)
+
+    def _score_python(self, keywords, keyword_index, tweet_index, metrics):
+        size = len(keywords)
+        weights = self.weights
+        per_tweet = [float(sum(weight * value for weight, value in zip(weights, row))) for row in metrics]
+
+        counts = [0] * size
+        totals = [0.0] * size
+        metric_totals = [[0.0] * size for _ in METRICS]
+        grouped = defaultdict(list)
+        for row, column in zip(keyword_index, tweet_index):
+            value = per_tweet[column]
+            counts[row] += 1
+            totals[row] += value
+            for j, metric in enumerate(metrics[column]):
+                metric_totals[j][row] += metric
+            grouped[row].append(value)
+
+        percentiles = {q: [0.0] * size for q in self.percentiles}
+        for row, values in grouped.items():
+            values.sort()
+            for q, column in percentiles.items():
+                column[row] = values[math.floor(q / 100 * (len(values) - 1))]
+        percentiles = {q: _plain(column, self.integral) for q, column in percentiles.items()}
+        return self._finish(keywords, counts, totals, metric_totals, percentiles)
+
+
+def _metric_row(tweet):
+    engagement = tweet.get('engagement_metrics') or {}
+    return [engagement.get(name) or 0 for name in METRICS]
+
+
+def _plain(values, integral):
+    return [int(value) for value in values] if integral else values
@@ -0,0 +1,186 @@
+# src/entity_store.py
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    OrderedDict 기반의 간단한 LRU 캐시 (스레드 안전).
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+def content_hash(data):
+    """dict 내용을 키 정렬된 JSON으로 직렬화해 SHA-1 해시를 계산합니다."""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class EntityStore:
+    """
+    트윗 작성자(user)와 미디어(media)를 별도 문서로 중복 없이 저장합니다.
+
+    - 문서 ID: 'twitter_user:{user_id}', 'twitter_media:{media_key}'
+    - 내용이 바뀐 경우에만 저장합니다 (content_hash 비교).
+    - 최근에 본 엔티티의 (해시, _rev)를 프로세스 내 LRU 캐시에 보관하여
+      페이지/실행이 반복되어도 같은 작성자에 대해 DB 조회·쓰기를 하지 않습니다.
+    - 캐시에 없으면 DB의 기존 문서 content_hash와 비교하므로 프로세스가 재시작되어도
+      변경되지 않은 엔티티는 다시 쓰지 않습니다.
+    - spool(WriteAheadSpool)이 주어지면 DB를 조회/저장하지 않고 트윗과 같은 스풀에 기록합니다.
+      _rev를 모르므로 이미 있는 문서는 반영 시 충돌하고, SpoolDrainer가 content_hash가 다를 때만 최신 _rev로 다시 씁니다.
+    """
+
+    USER_PREFIX = 'twitter_user'
+    MEDIA_PREFIX = 'twitter_media'
+
+    def __init__(self, db_handler, cache_size=10000, spool=None):
+        self.db_handler = db_handler
+        self.spool = spool
+        self.cache = LRUCache(cache_size)
+        self.stats = {'cache_hits': 0, 'cache_misses': 0, 'writes': 0, 'unchanged': 0, 'errors': 0}
+
+    @classmethod
+    def user_doc_id(cls, user_id):
+        return f"{cls.USER_PREFIX}:{user_id}"
+
+    @classmethod
+    def media_doc_id(cls, media_key):
+        return f"{cls.MEDIA_PREFIX}:{media_key}"
+
+    def put_user(self, user_data):
+        """
+        작성자 정보를 저장(필요 시)하고 참조할 문서 ID를 반환합니다.
+        :param user_data: API v2 user 객체의 data (dict)
+        :return: 'twitter_user:{id}', ID가 없거나 저장하지 못했으면 None
+        """
+        user_id = user_data.get('id') if user_data else None
+        if not user_id:
+            return None
+        return self._put(self.user_doc_id(user_id), self.USER_PREFIX, user_data)
+
+    def put_media(self, media_data):
+        """
+        미디어 정보를 저장(필요 시)하고 참조할 문서 ID를 반환합니다.
+        :param media_data: API v2 media 객체의 data (dict)
+        :return: 'twitter_media:{media_key}', media_key가 없거나 저장하지 못했으면 None
+        """
+        media_key = media_data.get('media_key') if media_data else None
+        if not media_key:
+            return None
+        return self._put(self.media_doc_id(media_key), self.MEDIA_PREFIX, media_data)
+
+    def refs(self, author, media):
+        """
+        작성자와 미디어를 저장(필요 시)하고 트윗 문서에 넣을 참조를 반환합니다.
+        :return: (author_ref, media_refs) 튜플, 하나라도 저장하지 못했으면 None (트윗에 원본을 그대로 남기도록)
+        """
+        author_ref = self.put_user(author)
+        if author and author.get('id') and author_ref is None:
+            return None
+        media_refs = []
+        for item in media:
+            ref = self.put_media(item)
+            if ref is None and item.get('media_key'):
+                return None
+            if ref:
+                media_refs.append(ref)
+        return author_ref, media_refs
+
+    def _put(self, doc_id, doc_type, data):
+        digest = content_hash(data)
+        cached = self.cache.get(doc_id)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            if cached[0] == digest:
+                self.stats['unchanged'] += 1
+                return doc_id
+            rev = cached[1]
+        elif self.spool is not None:
+            self.stats['cache_misses'] += 1
+            rev = None
+        else:
+            self.stats['cache_misses'] += 1
+            rev = None
+            try:
+                existing = self.db_handler.get_doc(doc_id)
+            except Exception as e:
+                logger.error(f"엔티티 문서 '{doc_id}' 조회 중 오류: {e}")
+                existing = None
+            if existing:
+                rev = existing.get('_rev')
+                if existing.get('content_hash') == digest:
+                    self.cache.put(doc_id, (digest, rev))
+                    self.stats['unchanged'] += 1
+                    return doc_id
+
+        doc = {'_id': doc_id, 'type': doc_type, 'content_hash': digest, 'data': data}
+        if self.spool is not None:
+            return self._append(doc)
+        if rev:
+            doc['_rev'] = rev
+        try:
+            result = self.db_handler.save_doc(doc)
+        except Exception as e:
+            # 충돌 등으로 실패하면 캐시를 비워 다음 번에 DB에서 최신 _rev를 다시 읽도록 함
+            logger.warning(f"엔티티 문서 '{doc_id}' 저장 실패: {e}")
+            self.cache.pop(doc_id)
+            self.stats['errors'] += 1
+            return None
+
+        if not result:
+            # DB 연결 없음: 저장되지 않은 문서를 참조하지 않도록 None
+            self.stats['errors'] += 1
+            return None
+        self.cache.put(doc_id, (digest, result[1]))
+        self.stats['writes'] += 1
+        logger.debug(f"엔티티 문서 '{doc_id}' 저장 (Rev: {result[1]})")
+        return doc_id
+
+    def _append(self, doc):
+        try:
+            self.spool.append_many([doc])
+        except Exception as e:
+            logger.warning(f"엔티티 문서 '{doc['_id']}' 스풀 기록 실패: {e}")
+            self.stats['errors'] += 1
+            return None
+        self.cache.put(doc['_id'], (doc['content_hash'], None))
+        self.stats['writes'] += 1
+        return doc['_id']
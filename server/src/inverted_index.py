@@ -0,0 +1,197 @@
+# src/inverted_index.py
+"""
+키워드/해시태그 -> 트윗 역색인.
+
+"이 키워드로 뜬 트윗 보여주기"를 전체 트윗 스캔 없이 처리하기 위한 메모리 색인입니다.
+- 용어: 분석기 토큰화 결과(키워드)와 '#'을 붙인 소문자 해시태그
+- 포스팅: (수집 시각, 문서 번호, 참여도). BLOCK_SIZE개씩 시각순으로 정렬해 zlib으로 압축한 블록에 보관하고,
+  블록마다 최소/최대 시각과 최대 참여도를 따로 들고 있어 조회 시 창 밖이거나 상위 k에 들 수 없는 블록은 풀지 않습니다.
+- 삭제/갱신: 문서 번호를 삭제 표시만 하고 조회 시 거른 뒤, 삭제 비율이 높아지면 전체를 다시 압축합니다.
+"""
+
+import heapq
+import time
+import zlib
+from array import array
+from datetime import datetime
+
+BLOCK_SIZE = 128
+# 삭제 표시된 포스팅이 전체의 이 비율을 넘으면 compact()
+COMPACT_RATIO = 0.25
+
+
+class _Block:
+    __slots__ = ('min_time', 'max_time', 'max_engagement', 'count', 'data')
+
+    def __init__(self, postings):
+        postings.sort()
+        times = array('q', [posting[0] for posting in postings])
+        base = times[0]
+        deltas = array('I', [t - base for t in times])
+        docnos = array('I', [posting[1] for posting in postings])
+        engagement = array('I', [posting[2] for posting in postings])
+        self.min_time = base
+        self.max_time = times[-1]
+        self.max_engagement = max(engagement)
+        self.count = len(postings)
+        self.data = zlib.compress(deltas.tobytes() + docnos.tobytes() + engagement.tobytes(), 1)
+
+    def postings(self):
+        raw = zlib.decompress(self.data)
+        size = self.count * array('I').itemsize
+        deltas, docnos, engagement = array('I'), array('I'), array('I')
+        deltas.frombytes(raw[:size])
+        docnos.frombytes(raw[size:2 * size])
+        engagement.frombytes(raw[2 * size:])
+        base = self.min_time
+        return [(base + delta, docno, score) for delta, docno, score in zip(deltas, docnos, engagement)]
+
+
+class PostingList:
+    """압축된 시각순 블록들 + 아직 블록이 되지 않은 최근 포스팅(tail)."""
+
+    __slots__ = ('blocks', 'tail')
+
+    def __init__(self):
+        self.blocks = []
+        self.tail = []
+
+    def append(self, posting):
+        self.tail.append(posting)
+        if len(self.tail) >= BLOCK_SIZE:
+            self.blocks.append(_Block(self.tail))
+            self.tail = []
+
+    def __len__(self):
+        return sum(block.count for block in self.blocks) + len(self.tail)
+
+    def iter_postings(self):
+        for block in self.blocks:
+            yield from block.postings()
+        yield from self.tail
+
+
+def _engagement(doc):
+    metrics = doc.get('engagement_metrics') or {}
+    return (metrics.get('likes_count', 0) or 0) + (metrics.get('comments_count', 0) or 0) \
+        + (metrics.get('shares_count', 0) or 0)
+
+
+def _timestamp(doc):
+    try:
+        return int(datetime.fromisoformat((doc.get('collected_at') or '').replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        # 날짜를 해석할 수 없는 문서는 분석기와 마찬가지로 최근 문서로 취급
+        return int(time.time())
+
+
+class InvertedIndex:
+    def __init__(self):
+        self.postings = {}
+        self._docnos = {}       # 문서 ID -> 문서 번호
+        self._doc_ids = {}      # 문서 번호 -> 문서 ID
+        self._term_counts = {}  # 문서 번호 -> 포스팅 수 (삭제 비율 계산용)
+        self._dead = set()
+        self._dead_postings = 0
+        self._live_postings = 0
+        self._next_docno = 0
+
+    def __len__(self):
+        return len(self._docnos)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._docnos
+
+    @staticmethod
+    def terms_for(doc, keywords):
+        terms = set(keywords)
+        terms.update(f"#{tag.lower()}" for tag in doc.get('hashtags', []))
+        return terms
+
+    def add(self, doc, keywords):
+        """문서를 색인합니다. 이미 색인된 문서 ID면 이전 항목을 지우고 다시 넣습니다 (리비전 갱신)."""
+        doc_id = doc['_id']
+        if doc_id in self._docnos:
+            self.remove(doc_id)
+        docno = self._next_docno
+        self._next_docno += 1
+        terms = self.terms_for(doc, keywords)
+        posting = (_timestamp(doc), docno, _engagement(doc))
+        for term in terms:
+            posting_list = self.postings.get(term)
+            if posting_list is None:
+                posting_list = self.postings[term] = PostingList()
+            posting_list.append(posting)
+        self._docnos[doc_id] = docno
+        self._doc_ids[docno] = doc_id
+        self._term_counts[docno] = len(terms)
+        self._live_postings += len(terms)
+
+    def remove(self, doc_id):
+        docno = self._docnos.pop(doc_id, None)
+        if docno is None:
+            return False
+        del self._doc_ids[docno]
+        removed = self._term_counts.pop(docno)
+        self._dead.add(docno)
+        self._dead_postings += removed
+        self._live_postings -= removed
+        if self._dead_postings > COMPACT_RATIO * max(self._live_postings, 1) and self._dead_postings > BLOCK_SIZE:
+            self.compact()
+        return True
+
+    def compact(self):
+        """삭제 표시된 포스팅을 실제로 제거하고 블록을 다시 만듭니다."""
+        dead = self._dead
+        for term in list(self.postings):
+            live = [posting for posting in self.postings[term].iter_postings() if posting[1] not in dead]
+            if not live:
+                del self.postings[term]
+                continue
+            rebuilt = PostingList()
+            live.sort()
+            for posting in live:
+                rebuilt.append(posting)
+            self.postings[term] = rebuilt
+        self._dead = set()
+        self._dead_postings = 0
+
+    def lookup(self, term, since=None, until=None, limit=20, order='engagement'):
+        """
+        term이 들어간 문서 ID를 limit개까지 돌려줍니다.
+        :param since, until: 수집 시각 범위 (epoch 초, since < t <= until). None이면 제한 없음
+        :param order: 'engagement'(참여도 높은 순, 같으면 최신순) 또는 'time'(최신순)
+        """
+        posting_list = self.postings.get(term)
+        if posting_list is None or limit <= 0:
+            return []
+        lower = float('-inf') if since is None else since
+        upper = float('inf') if until is None else until
+        by_engagement = order == 'engagement'
+
+        def rank(posting):
+            return (posting[2], posting[0]) if by_engagement else (posting[0],)
+
+        heap = []
+        dead = self._dead
+
+        def consider(postings):
+            for posting in postings:
+                if lower < posting[0] <= upper and posting[1] not in dead:
+                    item = (rank(posting), posting[1])
+                    if len(heap) < limit:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+
+        consider(posting_list.tail)
+        blocks = [block for block in posting_list.blocks if block.max_time > lower and block.min_time <= upper]
+        # 블록의 상한(최대 참여도 또는 최대 시각)이 큰 순서로 보다가, 더 나올 수 없으면 중단
+        bound = (lambda block: block.max_engagement) if by_engagement else (lambda block: block.max_time)
+        blocks.sort(key=bound, reverse=True)
+        for block in blocks:
+            if len(heap) == limit and bound(block) < heap[0][0][0]:
+                break
+            consider(block.postings())
+
+        return [self._doc_ids[docno] for _, docno in sorted(heap, reverse=True)]
@@ -1,15 +1,60 @@
 # src/keyword_analyzer.py
 
 import re
+import threading
+import time
 from collections import Counter
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 import logging
 
+from .analysis_format import DEFAULT_MAX_BYTES, build_analysis_doc
+from .metrics import REGISTRY
+
 logger = logging.getLogger(__name__)
 
+ANALYZER_PHASE_SECONDS = REGISTRY.histogram(
+    'todaytrends_analyzer_phase_seconds', "키워드 분석 단계별 소요 시간(초)", ['phase'])
+ANALYZER_TWEETS = REGISTRY.counter(
+    'todaytrends_analyzer_tweets_total', "키워드 분석에 입력/사용된 트윗 수", ['stage'])
+ANALYSIS_CACHE = REGISTRY.counter(
+    'todaytrends_analysis_cache_total', "분석 결과 조회 캐시 적중/실패 수", ['result'])
+
+ANALYSIS_PREFIX = 'keyword_analysis:'
+
 class KeywordAnalyzer:
-    def __init__(self, db_handler):
+    def __init__(self, db_handler, profiler=None, token_cache=None, token_store=None, trend_scorer=None,
+                 near_duplicates=None, analysis_cache_ttl=60, analysis_changes_interval=5, cooccurrence=None,
+                 engagement_scorer=None):
+        """
+        :param db_handler: 분석 결과를 저장할 CouchDBHandler
+        :param profiler: 단계별 CPU/메모리를 기록할 profiling.PhaseProfiler (선택)
+        :param token_cache: (문서 _id, _rev) -> 키워드 리스트 dict. 주어지면 실행 간 토큰화 결과를 재사용 (daemon 참고)
+        :param token_store: token_store.MappedTokenStore. 주어지면 프로세스가 바뀌어도 토큰화 결과를 디스크에서 재사용
+        :param trend_scorer: trend_scorer.TrendScorer. 주어지면 결과에 급상승 키워드(emerging_keywords)를 추가
+        :param near_duplicates: near_duplicates.NearDuplicateIndex. 주어지면 유사 중복 클러스터마다 트윗 하나만 집계
+        :param analysis_cache_ttl: get_recent_analysis / get_latest_analysis 결과를 메모리에 두는 시간(초). 0이면 캐시 안 함
+        :param analysis_changes_interval: 다른 프로세스가 저장한 분석 문서를 _changes 피드로 확인하는 최소 간격(초).
+                                          None이면 확인하지 않음 (호출자가 invalidate_analysis_cache()로 알려주는 경우)
+        :param cooccurrence: cooccurrence.CooccurrenceGraph. 주어지면 상위 키워드별 연관 키워드(related_keywords)를 추가
+        :param engagement_scorer: engagement_scoring.EngagementScorer. 주어지면 참여도 집계를 벡터 연산으로 하고
+                                  빈도 × 참여도 순위(engagement_ranking)를 추가
+        """
         self.db_handler = db_handler
+        self.profiler = profiler
+        self.token_cache = token_cache
+        self.token_store = token_store
+        self.trend_scorer = trend_scorer
+        self.near_duplicates = near_duplicates
+        self.cooccurrence = cooccurrence
+        self.engagement_scorer = engagement_scorer
+        self.analysis_cache_ttl = analysis_cache_ttl
+        self.analysis_changes_interval = analysis_changes_interval
+        self._analysis_cache = {}  # 키 -> (만료 시각, 결과)
+        self._analysis_cache_lock = threading.Lock()
+        self._analysis_generation = 0  # invalidate_analysis_cache()마다 증가 (조회 중 무효화된 결과는 캐시하지 않음)
+        self._analysis_seq = None
+        self._next_changes_check = 0.0
         # 제외할 불용어들
         self.stopwords = {
             '이', '그', '저', '것', '수', '있', '하', '되', '같', '등', '더', '또', '및',
@@ -26,14 +71,73 @@ class KeywordAnalyzer:
     def extract_keywords_from_tweets(self, tweets, days_back=7):
         """
         트윗 데이터에서 키워드를 추출하고 빈도를 분석합니다.
+        기간 필터링 -> 토큰화(트윗당 한 번) -> 집계 단계로 나누어 실행하며, 단계별 시간을 지표로 남깁니다.
         """
         logger.info(f"키워드 분석 시작: {len(tweets)}개 트윗 대상")
-        
-        # 최근 n일 이내 트윗 필터링
-        from datetime import timezone
+
+        with self._phase('filter'):
+            recent_tweets = self._filter_recent_tweets(tweets, days_back)
+        logger.info(f"최근 {days_back}일 이내 트윗: {len(recent_tweets)}개")
+
+        suppressed = 0
+        if self.near_duplicates is not None:
+            with self._phase('dedupe'):
+                unique_tweets = self._dedupe_clusters(recent_tweets)
+            suppressed = len(recent_tweets) - len(unique_tweets)
+            recent_tweets = unique_tweets
+            logger.info(f"유사 중복 트윗 {suppressed}개 제외")
+
+        with self._phase('tokenize'):
+            tweet_keywords = self._tokenize_tweets(recent_tweets)
+
+        with self._phase('aggregate'):
+            analysis_result = self._aggregate(tweets, recent_tweets, tweet_keywords, days_back)
+            if self.near_duplicates is not None:
+                analysis_result['suppressed_duplicates'] = suppressed
+
+        with self._phase('trends'):
+            analysis_result['keyword_trends'] = self._analyze_keyword_trends(
+                recent_tweets, tweet_keywords, with_engagement=self.engagement_scorer is None)
+
+        if self.engagement_scorer is not None:
+            with self._phase('engagement'):
+                scores = self.engagement_scorer.score(recent_tweets, tweet_keywords)
+                analysis_result['keyword_trends']['engagement'] = scores.engagement_stats()
+                analysis_result['engagement_ranking'] = scores.top(20)
+
+        if self.trend_scorer is not None:
+            with self._phase('emerging'):
+                # 지난 실행 이후 끝난 시간 구간만 반영하고, 기준선 대비 급상승한 키워드를 순위로 남김
+                self.trend_scorer.close_buckets(recent_tweets, tweet_keywords)
+                analysis_result['emerging_keywords'] = self.trend_scorer.top(20)
+
+        if self.cooccurrence is not None:
+            with self._phase('cooccurrence'):
+                # 급상승 키워드와 같이 끝난 시간 구간만 새로 세고, 상위 키워드의 연관 키워드를 남김
+                self.cooccurrence.close_buckets(recent_tweets, tweet_keywords)
+                top = [keyword for keyword, _ in analysis_result['top_keywords'][:20]]
+                analysis_result['related_keywords'] = self.cooccurrence.related(top)
+
+        ANALYZER_TWEETS.inc(len(tweets), stage='input')
+        ANALYZER_TWEETS.inc(len(recent_tweets), stage='recent')
+        logger.info(f"키워드 분석 완료: 상위 키워드 {len(analysis_result['top_keywords'])}개 추출")
+        return analysis_result
+
+    @contextmanager
+    def _phase(self, name):
+        """단계 소요 시간을 지표로 기록하고, 프로파일러가 있으면 CPU/메모리도 함께 기록합니다."""
+        with ANALYZER_PHASE_SECONDS.time(phase=name):
+            if self.profiler is None:
+                yield
+            else:
+                with self.profiler.phase(name):
+                    yield
+
+    def _filter_recent_tweets(self, tweets, days_back):
+        """collected_at 기준 최근 days_back일 이내 트윗만 남깁니다. 날짜를 해석할 수 없으면 최근 트윗으로 간주합니다."""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
         recent_tweets = []
-        
+
         for tweet in tweets:
             collected_at = tweet.get('collected_at', '')
             if collected_at:
@@ -47,34 +151,79 @@ class KeywordAnalyzer:
                 except:
                     # 날짜 파싱 실패 시 최근 트윗으로 간주
                     recent_tweets.append(tweet)
-        
-        logger.info(f"최근 {days_back}일 이내 트윗: {len(recent_tweets)}개")
-        
-        # 키워드 추출
-        all_keywords = []
+        return recent_tweets
+
+    def _dedupe_clusters(self, tweets):
+        """
+        유사 중복 클러스터마다 처음 나온 트윗 하나만 남깁니다.
+        수집 시 기록된 dup_cluster가 있으면 그대로 쓰고, 없으면 색인에서 클러스터를 찾습니다 (문서당 한 번만 계산).
+        """
+        index = self.near_duplicates
+        seen = set()
+        unique_tweets = []
+        for tweet in tweets:
+            cluster = tweet.get('dup_cluster')
+            if cluster is None and tweet.get('_id'):
+                cluster = index.assign(tweet['_id'], tweet.get('text_content', ''))
+            if cluster is not None:
+                if cluster in seen:
+                    continue
+                seen.add(cluster)
+            unique_tweets.append(tweet)
+        return unique_tweets
+
+    def _tokenize_tweets(self, tweets):
+        """트윗별 키워드 리스트를 만듭니다. 이후 모든 집계는 이 결과를 재사용합니다."""
+        if self.token_store is not None:
+            return self._tokenize_with_store(tweets)
+
+        cache = self.token_cache
+        if cache is None:
+            return [self._extract_keywords_from_text(tweet.get('text_content', '')) for tweet in tweets]
+
+        tweet_keywords = []
+        for tweet in tweets:
+            key = (tweet.get('_id'), tweet.get('_rev'))
+            keywords = cache.get(key) if key[0] else None
+            if keywords is None:
+                keywords = self._extract_keywords_from_text(tweet.get('text_content', ''))
+                if key[0]:
+                    cache[key] = keywords
+            tweet_keywords.append(keywords)
+        return tweet_keywords
+
+    def _tokenize_with_store(self, tweets):
+        """
+        저장소에 없는 트윗만 후보 토큰으로 토큰화해 저장하고, 저장된 토큰 ID에서 현재 불용어를 빼 키워드 리스트를 만듭니다.
+        토큰 문자열은 사전의 같은 객체를 공유하므로 트윗 수만큼 문자열을 새로 만들지 않습니다.
+        """
+        store = self.token_store
+        id_lists = store.token_ids_for(tweets, self._candidate_tokens)
+        vocab = store.vocab
+        stop_ids = store.ids_of(self.stopwords)
+        if not stop_ids:
+            return [[vocab[token_id] for token_id in ids] for ids in id_lists]
+        return [[vocab[token_id] for token_id in ids if token_id not in stop_ids] for ids in id_lists]
+
+    def _aggregate(self, tweets, recent_tweets, tweet_keywords, days_back):
+        """토큰화 결과로 키워드/해시태그/멘션 빈도를 집계합니다 (keyword_trends는 호출자가 추가)."""
+        keyword_counter = Counter()
         hashtag_counter = Counter()
         mention_counter = Counter()
-        
-        for tweet in recent_tweets:
-            # 텍스트에서 키워드 추출
-            text_keywords = self._extract_keywords_from_text(tweet.get('text_content', ''))
-            all_keywords.extend(text_keywords)
-            
+
+        for tweet, keywords in zip(recent_tweets, tweet_keywords):
+            keyword_counter.update(keywords)
+
             # 해시태그 분석
-            hashtags = tweet.get('hashtags', [])
-            for hashtag in hashtags:
+            for hashtag in tweet.get('hashtags', []):
                 hashtag_counter[hashtag] += 1
-                
+
             # 멘션 분석
-            mentions = tweet.get('mentions', [])
-            for mention in mentions:
+            for mention in tweet.get('mentions', []):
                 mention_counter[mention] += 1
-        
-        # 키워드 빈도 분석
-        keyword_counter = Counter(all_keywords)
-        
+
         # 결과 정리
-        analysis_result = {
+        return {
             'total_tweets': len(tweets),
             'recent_tweets': len(recent_tweets),
             'analysis_date': datetime.now().isoformat(),
@@ -82,16 +231,18 @@ class KeywordAnalyzer:
             'top_keywords': keyword_counter.most_common(50),
             'top_hashtags': hashtag_counter.most_common(20),
             'top_mentions': mention_counter.most_common(10),
-            'keyword_trends': self._analyze_keyword_trends(recent_tweets)
         }
-        
-        logger.info(f"키워드 분석 완료: 상위 키워드 {len(analysis_result['top_keywords'])}개 추출")
-        return analysis_result
-    
+
     def _extract_keywords_from_text(self, text):
         """
         텍스트에서 의미있는 키워드를 추출합니다.
         """
+        return [word for word in self._candidate_tokens(text) if word not in self.stopwords]
+
+    def _candidate_tokens(self, text):
+        """
+        불용어를 제외하기 전의 후보 토큰을 추출합니다 (토큰 저장소에는 이 결과를 저장).
+        """
         if not text:
             return []
             
@@ -104,31 +255,34 @@ class KeywordAnalyzer:
         for word in words:
             word = word.strip().lower()
             if (len(word) >= 2 and 
-                word not in self.stopwords and 
                 not word.isdigit() and
                 not re.match(r'^[a-zA-Z]{1,2}$', word)):  # 1-2글자 영어 제외
                 keywords.append(word)
         
         return keywords
     
-    def _analyze_keyword_trends(self, tweets):
+    def _analyze_keyword_trends(self, tweets, tweet_keywords=None, with_engagement=True):
         """
         키워드의 트렌드를 분석합니다 (시간대별, 카테고리별).
+        :param tweet_keywords: _tokenize_tweets 결과 (None이면 여기서 토큰화)
+        :param with_engagement: False면 참여도 집계를 건너뜀 (engagement_scorer가 따로 계산하는 경우)
         """
+        if tweet_keywords is None:
+            tweet_keywords = self._tokenize_tweets(tweets)
+
         trends = {
             'categories': {},
             'hourly': {},
             'engagement': {}
         }
         
-        for tweet in tweets:
+        for tweet, keywords in zip(tweets, tweet_keywords):
             # 카테고리별 키워드 분석
             categories = tweet.get('content_categories', ['general'])
             for category in categories:
                 if category not in trends['categories']:
                     trends['categories'][category] = Counter()
                 
-                keywords = self._extract_keywords_from_text(tweet.get('text_content', ''))
                 for keyword in keywords:
                     trends['categories'][category][keyword] += 1
             
@@ -140,13 +294,14 @@ class KeywordAnalyzer:
                     if hour not in trends['hourly']:
                         trends['hourly'][hour] = Counter()
                     
-                    keywords = self._extract_keywords_from_text(tweet.get('text_content', ''))
                     for keyword in keywords:
                         trends['hourly'][hour][keyword] += 1
                 except:
                     pass
             
             # 참여도 기반 키워드 분석
+            if not with_engagement:
+                continue
             engagement = tweet.get('engagement_metrics', {})
             total_engagement = (
                 engagement.get('likes_count', 0) + 
@@ -154,7 +309,6 @@ class KeywordAnalyzer:
                 engagement.get('shares_count', 0)
             )
             
-            keywords = self._extract_keywords_from_text(tweet.get('text_content', ''))
             for keyword in keywords:
                 if keyword not in trends['engagement']:
                     trends['engagement'][keyword] = {'total': 0, 'count': 0}
@@ -171,22 +325,21 @@ class KeywordAnalyzer:
         
         return trends
     
-    def save_analysis_to_db(self, analysis_result):
+    def save_analysis_to_db(self, analysis_result, max_bytes=DEFAULT_MAX_BYTES):
         """
         분석 결과를 CouchDB에 저장합니다.
+        keyword_trends는 섹션별 상위 N개만 본문에 두고 전체는 압축 첨부 파일로 저장합니다 (analysis_format 참고).
+        :param max_bytes: 문서 본문 크기 예산(바이트)
         """
         doc_id = f"keyword_analysis:{analysis_result['analysis_date']}"
-        
-        analysis_doc = {
-            '_id': doc_id,
-            'type': 'keyword_analysis',
-            **analysis_result
-        }
+        analysis_doc = build_analysis_doc(analysis_result, doc_id, max_bytes=max_bytes)
         
         try:
-            success = self.db_handler.save_doc(analysis_doc, doc_id)
+            with self._phase('save'):
+                success = self.db_handler.save_doc(analysis_doc, doc_id)
             if success:
                 logger.info(f"키워드 분석 결과 저장 성공: {doc_id}")
+                self.invalidate_analysis_cache()
                 return True
             else:
                 logger.warning(f"키워드 분석 결과 저장 실패: {doc_id}")
@@ -197,34 +350,101 @@ class KeywordAnalyzer:
     
     def get_recent_analysis(self, days_back=1):
         """
-        최근 키워드 분석 결과를 가져옵니다.
+        최근 days_back일 이내 키워드 분석 결과를 최신순으로 가져옵니다.
+        문서 ID(keyword_analysis:{analysis_date})의 키 범위로 조회하며, 결과는 analysis_cache_ttl 동안 메모리에 둡니다.
         """
         try:
-            # 모든 문서 가져오기
-            all_docs = self.db_handler.get_all_documents()
-            
-            # 키워드 분석 문서 필터링
-            analysis_docs = [
-                doc for doc in all_docs 
-                if doc.get('type') == 'keyword_analysis'
-            ]
-            
-            # 최근 문서 필터링
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            recent_analysis = []
-            
-            for doc in analysis_docs:
-                try:
-                    analysis_date = datetime.fromisoformat(doc.get('analysis_date', ''))
-                    if analysis_date > cutoff_date:
-                        recent_analysis.append(doc)
-                except:
-                    continue
-            
-            # 날짜순 정렬
-            recent_analysis.sort(key=lambda x: x.get('analysis_date', ''), reverse=True)
-            
-            return recent_analysis
+            return list(self._cached(('recent', days_back), lambda: self._load_recent_analysis(days_back)))
         except Exception as e:
             logger.error(f"최근 키워드 분석 결과 조회 중 오류: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_latest_analysis(self):
+        """가장 최근 키워드 분석 결과 (없으면 None). get_recent_analysis와 같은 캐시를 사용합니다."""
+        try:
+            return self._cached(('latest',), self._load_latest_analysis)
+        except Exception as e:
+            logger.error(f"최신 키워드 분석 결과 조회 중 오류: {e}")
+            return None
+
+    def invalidate_analysis_cache(self):
+        with self._analysis_cache_lock:
+            self._analysis_cache.clear()
+            self._analysis_generation += 1
+
+    def _cached(self, key, load):
+        """캐시된 결과 또는 load() 결과. load()의 예외는 캐시하지 않고 그대로 올립니다."""
+        self._sync_analysis_cache()
+        now = time.monotonic()
+        with self._analysis_cache_lock:
+            entry = self._analysis_cache.get(key)
+            if entry is not None and entry[0] > now:
+                ANALYSIS_CACHE.inc(result='hit')
+                return entry[1]
+            generation = self._analysis_generation
+        ANALYSIS_CACHE.inc(result='miss')
+        value = load()
+        if self.analysis_cache_ttl:
+            with self._analysis_cache_lock:
+                # 조회하는 동안 무효화되었으면 이미 오래된 결과일 수 있으므로 저장하지 않음
+                if generation == self._analysis_generation:
+                    self._analysis_cache[key] = (now + self.analysis_cache_ttl, value)
+        return value
+
+    def _sync_analysis_cache(self):
+        """
+        마지막 확인 이후 _changes 피드에 keyword_analysis: 문서가 있으면 캐시를 비웁니다.
+        analysis_changes_interval마다 한 번만 확인하므로 그 사이의 조회는 DB 요청 없이 메모리에서 처리됩니다.
+        """
+        if self.analysis_changes_interval is None or not self.analysis_cache_ttl:
+            return
+        now = time.monotonic()
+        if now < self._next_changes_check:
+            return
+        self._next_changes_check = now + self.analysis_changes_interval
+        try:
+            if self._analysis_seq is None:
+                # 처음에는 현재 시퀀스만 기억 (캐시가 비어 있어 이전 변경은 볼 필요 없음)
+                _, self._analysis_seq = self.db_handler.changes_since('now', include_docs=False)
+                return
+            while True:
+                changes, last_seq = self.db_handler.changes_since(self._analysis_seq, limit=1000, include_docs=False)
+                self._analysis_seq = last_seq
+                if any(change.get('id', '').startswith(ANALYSIS_PREFIX) for change in changes):
+                    self.invalidate_analysis_cache()
+                if len(changes) < 1000:
+                    break
+        except Exception as e:
+            # 확인에 실패해도 캐시는 TTL이 지나면 만료됨
+            logger.warning(f"분석 문서 변경 확인 중 오류: {e}")
+
+    def _load_recent_analysis(self, days_back):
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        rows = self.db_handler.view('_all_docs', startkey=f"{ANALYSIS_PREFIX}{cutoff_date.isoformat()}",
+                                    endkey=f"{ANALYSIS_PREFIX}\ufff0", include_docs=True)
+        if rows is None:
+            raise ConnectionError("CouchDB에 연결되어 있지 않습니다.")
+        recent_analysis = []
+        for row in rows:
+            doc = row.doc
+            if not doc or doc.get('type') != 'keyword_analysis':
+                continue
+            try:
+                if datetime.fromisoformat(doc.get('analysis_date', '')) > cutoff_date:
+                    recent_analysis.append(dict(doc))
+            except ValueError:
+                continue
+
+        # 날짜순 정렬
+        recent_analysis.sort(key=lambda x: x.get('analysis_date', ''), reverse=True)
+        return recent_analysis
+
+    def _load_latest_analysis(self):
+        rows = self.db_handler.view('_all_docs', startkey=f"{ANALYSIS_PREFIX}\ufff0", endkey=ANALYSIS_PREFIX,
+                                    descending=True, limit=1, include_docs=True)
+        if rows is None:
+            raise ConnectionError("CouchDB에 연결되어 있지 않습니다.")
+        for row in rows:
+            if row.doc:
+                return dict(row.doc)
+        return None
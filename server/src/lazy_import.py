@@ -0,0 +1,55 @@
+# src/lazy_import.py
+"""
+무거운 서드파티 모듈(tweepy, couchdb, requests, dotenv 등)의 지연 import.
+
+    tweepy = lazy_import('tweepy')
+
+처럼 모듈 최상단에 선언해 두면 실제 속성에 처음 접근할 때 import 됩니다.
+속성 설정/삭제도 실제 모듈로 전달되므로
+patch('server.src.collectors.twitter_collector.tweepy.Client')처럼 기존 테스트의 patch 경로가 그대로 동작합니다.
+"""
+
+import importlib
+import threading
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    __slots__ = ('_lazy_name', '_lazy_module')
+
+    def __init__(self, name):
+        object.__setattr__(self, '_lazy_name', name)
+        object.__setattr__(self, '_lazy_module', None)
+
+    def _load(self):
+        module = object.__getattribute__(self, '_lazy_module')
+        if module is None:
+            with _import_lock:
+                module = object.__getattribute__(self, '_lazy_module')
+                if module is None:
+                    module = importlib.import_module(object.__getattribute__(self, '_lazy_name'))
+                    object.__setattr__(self, '_lazy_module', module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        name = object.__getattribute__(self, '_lazy_name')
+        loaded = object.__getattribute__(self, '_lazy_module') is not None
+        return f"<lazy module '{name}' ({'loaded' if loaded else 'not loaded'})>"
+
+
+def lazy_import(name):
+    """name 모듈을 처음 사용할 때 import 하는 프록시를 반환합니다."""
+    return LazyModule(name)
@@ -0,0 +1,263 @@
+# src/metrics.py
+"""
+프로세스 내 지표(metrics) 레지스트리.
+
+수집기/DB 핸들러/키워드 분석기의 카운터와 지연 시간 히스토그램을 모아
+Prometheus 텍스트 형식(0.0.4)으로 내보냅니다.
+- HTTP: start_metrics_server(port) -> GET /metrics
+- 파일: REGISTRY.dump(path) (node_exporter textfile collector 등에서 읽기)
+
+사용 예:
+    from .metrics import REGISTRY   # 패키지 밖에서는 from src.metrics import REGISTRY
+    API_CALLS = REGISTRY.counter('todaytrends_api_calls_total', "API 호출 수", ['endpoint', 'status'])
+    API_CALLS.inc(endpoint='search_recent', status='ok')
+    with REGISTRY.histogram('todaytrends_phase_seconds', "단계별 시간", ['phase']).time(phase='save'):
+        ...
+"""
+
+import atexit
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 기본 버킷 (1ms ~ 60s)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"지표 '{self.name}'의 레이블은 {self.labelnames} 이어야 합니다: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """단조 증가 카운터."""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (누적 버킷 카운트 + 합계 + 개수)."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # key -> [bucket_counts(list), sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록의 경과 시간(초)을 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def total(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[1] if series else 0.0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        lines = []
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        # 같은 모듈이 서로 다른 경로로 두 번 import 되어도 같은 지표 객체를 공유하도록 이름으로 재사용
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"지표 '{name}'이(가) 다른 종류/레이블로 이미 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Prometheus 텍스트 형식 문자열을 반환합니다."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """지표를 파일에 원자적으로 기록합니다 (임시 파일에 쓴 뒤 교체)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def start_metrics_server(port=9108, host='0.0.0.0', registry=REGISTRY):
+    """/metrics를 제공하는 HTTP 서버를 데몬 스레드로 시작하고 서버 객체를 반환합니다."""
+    # http.server는 지표 서버를 실제로 띄울 때만 import (import 시간 단축)
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("metrics: " + format % args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info(f"지표 서버 시작: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def start_from_env(registry=REGISTRY):
+    """
+    환경 변수에 따라 지표 노출을 설정합니다.
+    - METRICS_PORT: 설정 시 /metrics HTTP 서버 시작
+    - METRICS_FILE: 설정 시 METRICS_DUMP_INTERVAL초(기본 15)마다, 그리고 종료 시 지표를 파일로 기록
+    """
+    server = None
+    port = os.getenv('METRICS_PORT')
+    if port:
+        server = start_metrics_server(int(port), registry=registry)
+    path = os.getenv('METRICS_FILE')
+    if path:
+        interval = float(os.getenv('METRICS_DUMP_INTERVAL', '15'))
+
+        def dump_periodically():
+            while True:
+                time.sleep(interval)
+                try:
+                    registry.dump(path)
+                except OSError as e:
+                    logger.warning(f"지표 파일 기록 실패 ({path}): {e}")
+
+        threading.Thread(target=dump_periodically, name='metrics-dump', daemon=True).start()
+        atexit.register(registry.dump, path)
+    return server
+
+
+class SampledLogger:
+    """
+    고빈도 경로(문서 하나당 한 줄 등)의 로그를 every번에 한 번만 DEBUG로 남깁니다.
+    DEBUG가 꺼져 있으면 메시지 포맷팅 비용도 들지 않습니다.
+    """
+
+    def __init__(self, logger, every=100):
+        self.logger = logger
+        self.every = max(1, every)
+        self._count = 0
+
+    def debug(self, msg, *args):
+        self._count += 1
+        if (self._count - 1) % self.every == 0:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"{msg} (샘플링: {self.every}건 중 1건, 누적 {self._count}건)", *args)
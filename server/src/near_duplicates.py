@@ -0,0 +1,158 @@
+# src/near_duplicates.py
+"""
+MinHash LSH 기반 유사 중복 트윗 탐지.
+
+복사해 조금씩 고친 스팸 트윗이 상위 키워드를 부풀리지 않도록, 본문이 거의 같은 트윗을 하나의 클러스터로 묶습니다.
+- 본문을 정규화(소문자, URL/멘션 제거, 기호/공백 정리)한 뒤 글자 n-gram(shingle) 집합으로 만들고
+  num_perm개의 MinHash 서명을 계산합니다. 두 서명이 일치하는 비율은 shingle 집합의 자카드 유사도 추정치입니다.
+- 서명을 bands개 구간으로 나눠 구간별 버킷에 넣고, 같은 버킷에 들어간 트윗만 후보로 서명을 비교합니다.
+  버킷에는 최대 bucket_size개의 문서만 두므로 같은 스팸이 수천 번 들어와도 비교 횟수는 일정합니다.
+- 유사도가 threshold 이상인 후보가 있으면 그 클러스터에 넣고, 없으면 자기 문서 ID를 클러스터 ID로 하는 새 클러스터를 만듭니다.
+
+수집 시(runner.BulkWriteSink)에는 문서에 'dup_cluster' 필드를 기록하고,
+분석 시(KeywordAnalyzer near_duplicates 옵션)에는 클러스터마다 트윗 하나만 집계합니다.
+"""
+
+import random
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+
+_URL_RE = re.compile(r'https?://\S+')
+_MENTION_RE = re.compile(r'@\w+')
+_NON_WORD_RE = re.compile(r'[^\w가-힣]+')
+# 메르센 소수 2^61-1. (a*x + b) mod P 로 shingle 해시를 섞어 MinHash 순열을 흉내냄
+_PRIME = (1 << 61) - 1
+_MASK32 = 0xFFFFFFFF
+
+
+def normalize_text(text):
+    text = _URL_RE.sub(' ', (text or '').lower())
+    text = _MENTION_RE.sub(' ', text)
+    return _NON_WORD_RE.sub(' ', text).strip()
+
+
+def shingles(text, size=3):
+    """정규화한 본문의 글자 n-gram 해시 집합 (공백은 하나로 취급). 본문이 비면 빈 집합."""
+    text = ' '.join(normalize_text(text).split())
+    if not text:
+        return set()
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateIndex:
+    def __init__(self, num_perm=64, bands=16, threshold=0.7, shingle_size=3, bucket_size=8, max_docs=None, seed=1):
+        """
+        :param num_perm: MinHash 서명 길이 (bands로 나누어떨어져야 함)
+        :param bands: LSH 구간 수. 구간당 행 수 r = num_perm / bands 일 때 후보가 될 유사도 기준은 약 (1/bands)^(1/r)
+        :param threshold: 같은 클러스터로 볼 추정 자카드 유사도
+        :param bucket_size: 버킷 하나에 보관할 최대 문서 수 (같은 클러스터가 많아도 조회 비용이 일정하게 유지됨)
+        :param max_docs: 보관할 최대 문서 수. 넘으면 가장 오래 전에 넣은 문서부터 버림 (수집 시 메모리 상한)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bucket_size = bucket_size
+        self.max_docs = max_docs
+        self.buckets = [{} for _ in range(bands)]
+        self.docs = OrderedDict()  # 문서 ID -> (서명, 클러스터 ID, 구간별 버킷 키)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+
+    def signature(self, text):
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        return array('I', [min((a * h + b) % _PRIME for h in hashes) & _MASK32 for a, b in self.permutations])
+
+    @staticmethod
+    def similarity(left, right):
+        """두 서명의 일치 비율 (자카드 유사도 추정치)."""
+        return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [hash(tuple(signature[i * rows:(i + 1) * rows])) for i in range(self.bands)]
+
+    def cluster_of(self, doc_id):
+        entry = self.docs.get(doc_id)
+        return entry[1] if entry else None
+
+    def assign(self, doc_id, text):
+        """
+        문서를 색인하고 클러스터 ID를 반환합니다. 이미 색인된 문서면 기존 클러스터 ID를 그대로 반환합니다.
+        본문이 비어 비교할 수 없으면 자기 문서 ID를 반환합니다(색인하지 않음).
+        """
+        with self._lock:
+            entry = self.docs.get(doc_id)
+            if entry is not None:
+                return entry[1]
+        signature = self.signature(text)
+        if signature is None:
+            return doc_id
+        keys = self._band_keys(signature)
+
+        with self._lock:
+            best, best_similarity = None, self.threshold
+            seen = set()
+            for band, key in enumerate(keys):
+                for candidate in self.buckets[band].get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    similarity = self.similarity(signature, self.docs[candidate][0])
+                    if similarity >= best_similarity:
+                        best, best_similarity = candidate, similarity
+            cluster = self.docs[best][1] if best is not None else doc_id
+
+            self.docs[doc_id] = (signature, cluster, keys)
+            for band, key in enumerate(keys):
+                bucket = self.buckets[band].setdefault(key, [])
+                if len(bucket) < self.bucket_size:
+                    bucket.append(doc_id)
+            if self.max_docs is not None and len(self.docs) > self.max_docs:
+                self._remove_locked(next(iter(self.docs)))
+        return cluster
+
+    def remove(self, doc_id):
+        with self._lock:
+            return self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id):
+        entry = self.docs.pop(doc_id, None)
+        if entry is None:
+            return False
+        for band, key in enumerate(entry[2]):
+            bucket = self.buckets[band].get(key)
+            if bucket and doc_id in bucket:
+                bucket.remove(doc_id)
+                if not bucket:
+                    del self.buckets[band][key]
+        return True
+
+    def annotate(self, docs, text_field='text_content'):
+        """문서마다 'dup_cluster'(클러스터 ID)를 기록하고, 다른 문서의 중복으로 판정된 수를 반환합니다."""
+        duplicates = 0
+        for doc in docs:
+            doc_id = doc.get('_id')
+            if not doc_id:
+                continue
+            cluster = self.assign(doc_id, doc.get(text_field, ''))
+            doc['dup_cluster'] = cluster
+            if cluster != doc_id:
+                duplicates += 1
+        return duplicates
@@ -0,0 +1,94 @@
+# src/profiling.py
+"""
+단계별 CPU/메모리 프로파일러.
+
+with profiler.phase('tokenize'): ... 형태로 구간을 감싸면 구간마다
+- wall_seconds: 경과 시간 (time.perf_counter)
+- cpu_seconds: 프로세스 CPU 시간 (time.process_time)
+- peak_bytes: 구간 중 tracemalloc 최대 할당량 (구간 시작 시 peak를 초기화)
+- retained_bytes: 구간 종료 후에도 남아 있는 할당량 증가분
+을 기록합니다. cprofile=True이면 전체 구간을 cProfile로 함께 측정해 pstats 파일로 남길 수 있습니다.
+"""
+
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class PhaseProfiler:
+    def __init__(self, trace_memory=True, cprofile=False):
+        self.trace_memory = trace_memory
+        self.phases = []  # 실행 순서대로 단계별 결과 dict
+        self._profile = cProfile.Profile() if cprofile else None
+        self._started_tracemalloc = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._profile:
+            self._profile.enable()
+        return self
+
+    def stop(self):
+        if self._profile:
+            self._profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @contextmanager
+    def phase(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            result = {
+                'phase': name,
+                'wall_seconds': time.perf_counter() - wall_start,
+                'cpu_seconds': time.process_time() - cpu_start,
+            }
+            if tracing:
+                memory_after, peak = tracemalloc.get_traced_memory()
+                result['peak_bytes'] = max(0, peak - memory_before)
+                result['retained_bytes'] = memory_after - memory_before
+            self.phases.append(result)
+
+    def dump_stats(self, path):
+        """cProfile 결과를 pstats 파일로 저장합니다 (python -m pstats <path> 로 확인)."""
+        if not self._profile:
+            raise RuntimeError("cprofile=True로 생성한 프로파일러에서만 사용할 수 있습니다.")
+        self._profile.dump_stats(path)
+
+    def report(self):
+        """단계별 결과를 표 형태의 문자열로 반환합니다."""
+        header = f"{'phase':<12} {'wall(s)':>10} {'cpu(s)':>10} {'peak(MB)':>10} {'retained(MB)':>13}"
+        lines = [header, '-' * len(header)]
+        for result in self.phases:
+            peak = result.get('peak_bytes')
+            retained = result.get('retained_bytes')
+            lines.append(
+                f"{result['phase']:<12} {result['wall_seconds']:>10.3f} {result['cpu_seconds']:>10.3f} "
+                f"{_mb(peak):>10} {_mb(retained):>13}"
+            )
+        total_wall = sum(r['wall_seconds'] for r in self.phases)
+        total_cpu = sum(r['cpu_seconds'] for r in self.phases)
+        lines.append('-' * len(header))
+        lines.append(f"{'total':<12} {total_wall:>10.3f} {total_cpu:>10.3f}")
+        return '\n'.join(lines)
+
+
+def _mb(value):
+    return '-' if value is None else f"{value / (1024 * 1024):.2f}"
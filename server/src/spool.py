@@ -0,0 +1,371 @@
+# src/spool.py
+"""
+수집기용 로컬 write-ahead 스풀.
+
+수집기는 정규화한 문서를 먼저 로컬 디스크의 추가 전용(append-only) 세그먼트 파일에 기록하고,
+SpoolDrainer가 별도로 세그먼트를 읽어 CouchDB에 _bulk_docs로 반영합니다.
+CouchDB가 느리거나 내려가 있어도 수집은 계속되고, 반영되지 않은 문서는 디스크에 남습니다.
+
+세그먼트 레코드 형식: [길이 4바이트][CRC32 4바이트][zlib 압축된 JSON]
+  - 길이/CRC가 맞지 않는 레코드(비정상 종료 중 쓰다 만 꼬리, 디스크 손상)를 만나면 거기서 읽기를 멈춥니다.
+  - '{세그먼트}.ack' 파일에 DB 반영이 확인된 오프셋을 기록하고, 끝까지 반영되면 세그먼트를 삭제합니다.
+    끝까지 읽지 못한 세그먼트는 삭제하지 않고 '{세그먼트}.corrupt'로 옮겨 둡니다.
+  - CouchDB가 영구적으로 거부한 문서(크기 초과, 검증 함수 거부 등)는 '{세그먼트}.rejected'에
+    같은 레코드 형식으로 옮겨 두고 다음 문서로 넘어갑니다.
+"""
+
+import glob
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+from .lazy_import import lazy_import
+from .write_scheduler import status_of
+
+couchdb = lazy_import('couchdb')
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct('>II')  # (압축 데이터 길이, CRC32)
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.log'
+ACK_SUFFIX = '.ack'
+CORRUPT_SUFFIX = '.corrupt'
+REJECTED_SUFFIX = '.rejected'
+# 요청 단위로 받으면 다시 보내도 성공하지 않는 상태 코드 (잘못된 문서, 권한 없음, 본문이 너무 큼)
+PERMANENT_STATUSES = (400, 403, 413, 415)
+
+
+class WriteAheadSpool:
+    def __init__(self, directory, segment_max_bytes=16 * 1024 * 1024, fsync_every=256,
+                 fsync_interval=1.0, compress_level=1):
+        """
+        :param directory: 세그먼트 파일을 둘 디렉토리 (없으면 생성)
+        :param segment_max_bytes: 세그먼트 파일 최대 크기. 넘으면 새 세그먼트로 교체(roll)
+        :param fsync_every: 이 개수의 레코드마다 fsync
+        :param fsync_interval: 마지막 fsync 후 이 시간(초)이 지나면 다음 append에서 fsync
+        :param compress_level: zlib 압축 레벨 (1: 빠름 ~ 9: 작음)
+        """
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compress_level = compress_level
+
+        self._lock = threading.RLock()
+        self._active_file = None
+        self._active_path = None
+        self._active_size = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        existing = self._segment_paths()
+        # .ack/.corrupt/.rejected 파일의 번호도 피해서, 격리해 둔 파일을 새 세그먼트가 덮어쓰지 않게 함
+        used = [self._segment_seq(p) for p in glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}*"))]
+        self._next_seq = max(used) + 1 if used else 1
+        if existing:
+            logger.info(f"스풀 '{directory}'에 반영 대기 중인 세그먼트 {len(existing)}개가 있습니다.")
+
+    # --- 세그먼트 관리 ---
+
+    def _segment_paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")))
+
+    @staticmethod
+    def _segment_seq(path):
+        name = os.path.basename(path)
+        return int(name[len(SEGMENT_PREFIX):].split('.', 1)[0])
+
+    def _open_new_segment(self):
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}")
+        self._next_seq += 1
+        self._active_file = open(path, 'ab')
+        self._active_path = path
+        self._active_size = 0
+        logger.debug(f"새 스풀 세그먼트 생성: {path}")
+
+    def roll(self):
+        """현재 세그먼트를 닫아(sync 포함) drainer가 읽을 수 있게 합니다. 비어 있으면 삭제합니다."""
+        with self._lock:
+            if self._active_file is None:
+                return
+            self._sync_locked()
+            self._active_file.close()
+            if self._active_size == 0:
+                os.remove(self._active_path)
+            self._active_file = None
+            self._active_path = None
+            self._active_size = 0
+
+    def sealed_segments(self):
+        """쓰기가 끝난(현재 기록 중이 아닌) 세그먼트 경로 목록 (오래된 순)."""
+        with self._lock:
+            return [p for p in self._segment_paths() if p != self._active_path]
+
+    # --- 쓰기 ---
+
+    def append(self, doc):
+        """문서 하나를 스풀에 기록합니다."""
+        self.append_many([doc])
+
+    def _encode(self, doc):
+        payload = zlib.compress(
+            json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+            self.compress_level
+        )
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def append_many(self, docs):
+        """문서 여러 개를 스풀에 기록합니다. fsync는 fsync_every/fsync_interval 기준으로 묶어서 수행합니다."""
+        encoded = [self._encode(doc) for doc in docs]
+
+        with self._lock:
+            for record in encoded:
+                if self._active_file is None:
+                    self._open_new_segment()
+                self._active_file.write(record)
+                self._active_size += len(record)
+                self._unsynced += 1
+                if self._active_size >= self.segment_max_bytes:
+                    self.roll()
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+
+    def sync(self):
+        """기록된 레코드를 디스크에 fsync 합니다."""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._active_file is not None and self._unsynced:
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.roll()
+
+    # --- 읽기 / 반영 확인 ---
+
+    def read_segment(self, path, start_offset=0):
+        """
+        세그먼트의 레코드를 순서대로 읽습니다.
+        :return: (레코드 끝 오프셋, 문서 dict)를 yield. 손상된 레코드를 만나면 중단합니다.
+                 제너레이터의 반환값(StopIteration.value)은 파일 끝까지 손상 없이 읽었으면 True
+        """
+        with open(path, 'rb') as f:
+            f.seek(start_offset)
+            offset = start_offset
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    if header:
+                        logger.warning(f"스풀 세그먼트 '{path}' 오프셋 {offset}에서 잘린 레코드 헤더를 만났습니다.")
+                        return False
+                    return True
+                length, crc = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    logger.warning(f"스풀 세그먼트 '{path}' 오프셋 {offset}에서 손상된 레코드를 만나 읽기를 중단합니다.")
+                    return False
+                offset += RECORD_HEADER.size + length
+                yield offset, json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def acked_offset(self, path):
+        """세그먼트에서 DB 반영이 확인된 오프셋 (없으면 0)."""
+        try:
+            with open(path + ACK_SUFFIX, 'r') as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def ack(self, path, offset):
+        """세그먼트의 offset까지 DB 반영이 확인되었음을 기록합니다 (임시 파일 교체로 원자적 갱신)."""
+        tmp_path = path + ACK_SUFFIX + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path + ACK_SUFFIX)
+
+    def remove_segment(self, path):
+        """끝까지 반영된 세그먼트와 ack 파일을 삭제합니다."""
+        for p in (path, path + ACK_SUFFIX):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        logger.debug(f"반영 완료된 스풀 세그먼트 삭제: {path}")
+
+    def quarantine_segment(self, path, offset):
+        """끝까지 읽지 못한 세그먼트를 '.corrupt'로 옮겨 보존합니다 (offset 이후는 반영되지 않음)."""
+        os.replace(path, path + CORRUPT_SUFFIX)
+        try:
+            os.remove(path + ACK_SUFFIX)
+        except FileNotFoundError:
+            pass
+        logger.error(f"스풀 세그먼트 '{path}'의 오프셋 {offset} 이후를 읽을 수 없어 "
+                     f"'{path}{CORRUPT_SUFFIX}'로 옮겼습니다 (이후 레코드는 반영되지 않음).")
+
+    def reject(self, path, rejected):
+        """
+        DB가 영구적으로 거부한 문서를 '{세그먼트}.rejected'에 세그먼트와 같은 레코드 형식으로 덧붙입니다 (fsync 포함).
+        :param rejected: (문서, 오류) 리스트
+        """
+        with open(path + REJECTED_SUFFIX, 'ab') as f:
+            for doc, _ in rejected:
+                f.write(self._encode(doc))
+            f.flush()
+            os.fsync(f.fileno())
+        for doc, error in rejected:
+            logger.error(f"스풀 문서 '{doc.get('_id')}'를 CouchDB가 거부하여 '{path}{REJECTED_SUFFIX}'로 옮겼습니다: {error}")
+
+    def pending_bytes(self):
+        """아직 반영되지 않은 세그먼트 데이터의 대략적인 크기 (바이트)."""
+        total = 0
+        for path in self._segment_paths():
+            try:
+                total += os.path.getsize(path) - self.acked_offset(path)
+            except FileNotFoundError:
+                continue
+        return total
+
+
+class SpoolDrainer:
+    """
+    스풀 세그먼트를 읽어 CouchDB에 _bulk_docs로 반영하고, 반영이 확인된 만큼 ack/삭제합니다.
+    - 이미 존재하는 문서와의 충돌(ResourceConflict)은 반영된 것으로 간주합니다.
+      단, content_hash가 있는 엔티티 문서(EntityStore)는 DB의 내용과 다르면 최신 _rev로 다시 씁니다.
+    - 문서별 오류(크기 초과, 검증 함수 거부 등)와 문서 하나만 보낸 요청의 PERMANENT_STATUSES 오류는
+      다시 보내도 성공하지 않으므로 '.rejected' 파일로 옮기고 다음 문서로 넘어갑니다.
+      요청 단위의 413 등은 배치를 반으로 나눠 거부된 문서만 가려냅니다.
+    - 연결 실패, 5xx 같은 일시적 오류면 해당 배치를 ack하지 않고 중단하여 다음 drain에서 다시 시도합니다.
+    """
+
+    def __init__(self, spool, db_handler, batch_size=500):
+        self.spool = spool
+        self.db_handler = db_handler
+        self.batch_size = batch_size
+
+    def drain(self, include_active=True):
+        """
+        반영 대기 중인 세그먼트를 모두 처리합니다.
+        :param include_active: True면 현재 기록 중인 세그먼트도 닫고(roll) 함께 반영
+        :return: DB에 반영된 문서 수
+        """
+        if include_active:
+            self.spool.roll()
+
+        written = 0
+        for path in self.spool.sealed_segments():
+            segment_written, completed = self._drain_segment(path)
+            written += segment_written
+            if not completed:
+                logger.warning(f"스풀 반영 중단: '{path}' (다음 drain에서 재시도)")
+                break
+        if written:
+            logger.info(f"스풀에서 문서 {written}개를 CouchDB에 반영했습니다.")
+        return written
+
+    def _drain_segment(self, path):
+        written = 0
+        batch = []
+        batch_end = self.spool.acked_offset(path)
+        records = self.spool.read_segment(path, batch_end)
+        while True:
+            try:
+                end_offset, doc = next(records)
+            except StopIteration as stop:
+                clean = stop.value
+                break
+            batch.append(doc)
+            batch_end = end_offset
+            if len(batch) >= self.batch_size:
+                batch_written = self._flush_batch(path, batch)
+                if batch_written is None:
+                    return written, False
+                self.spool.ack(path, batch_end)
+                written += batch_written
+                batch = []
+
+        if batch:
+            batch_written = self._flush_batch(path, batch)
+            if batch_written is None:
+                return written, False
+            written += batch_written
+        if clean:
+            self.spool.remove_segment(path)
+        else:
+            # 손상 지점 이후 레코드를 조용히 잃지 않도록 파일을 남겨 둠
+            self.spool.quarantine_segment(path, batch_end)
+        return written, True
+
+    def _flush_batch(self, path, batch):
+        """배치를 반영하고 거부된 문서는 .rejected로 옮깁니다. :return: 반영된 문서 수, 일시적 오류면 None"""
+        rejected = self._write_batch(batch)
+        if rejected is None:
+            return None
+        if rejected:
+            self.spool.reject(path, rejected)
+        return len(batch) - len(rejected)
+
+    def _write_batch(self, batch):
+        """:return: DB가 영구적으로 거부한 (문서, 오류) 리스트. 일시적 오류로 다시 시도해야 하면 None"""
+        try:
+            results = self.db_handler.save_docs_bulk(batch)
+        except Exception as e:
+            if status_of(e) not in PERMANENT_STATUSES:
+                logger.error(f"스풀 배치({len(batch)}개) 반영 실패: {e}")
+                return None
+            if len(batch) == 1:
+                return [(batch[0], e)]
+            # 어느 문서 때문인지 모르므로 반으로 나눠 다시 보냄 (이미 저장된 문서는 충돌로 돌아옴)
+            middle = len(batch) // 2
+            first = self._write_batch(batch[:middle])
+            if first is None:
+                return None
+            second = self._write_batch(batch[middle:])
+            return None if second is None else first + second
+        if results is None:
+            return None
+
+        stale = []
+        rejected = []
+        for doc, (success, doc_id, rev_or_exc) in zip(batch, results):
+            if success:
+                continue
+            if not isinstance(rev_or_exc, couchdb.http.ResourceConflict):
+                # _bulk_docs의 문서별 오류는 크기 초과/검증 거부/권한 같은 문서 자체의 문제
+                rejected.append((doc, rev_or_exc))
+            elif 'content_hash' in doc:
+                stale.append(doc)
+        if stale and not self._update_entities(stale):
+            return None
+        return rejected
+
+    def _update_entities(self, docs):
+        """충돌한 엔티티 문서 중 DB 내용과 다른 것만 현재 _rev로 다시 씁니다."""
+        updates = []
+        try:
+            for doc in docs:
+                current = self.db_handler.get_doc(doc['_id'])
+                if current and current.get('content_hash') != doc['content_hash']:
+                    updates.append(dict(doc, _rev=current['_rev']))
+            results = self.db_handler.save_docs_bulk(updates) if updates else []
+        except Exception as e:
+            logger.error(f"스풀 엔티티 문서 갱신 실패: {e}")
+            return False
+        if results is None:
+            return False
+        for success, doc_id, rev_or_exc in results:
+            if not success:
+                # 그 사이 다른 곳에서 갱신되었으면 다음 drain에서 다시 비교
+                logger.warning(f"스풀 엔티티 문서 '{doc_id}' 갱신 실패: {rev_or_exc}")
+                return False
+        return True
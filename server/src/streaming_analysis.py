@@ -0,0 +1,251 @@
+# src/streaming_analysis.py
+"""
+수집 파이프라인 안에서 돌아가는 스트리밍 키워드 분석.
+
+배치 분석(analyze, 데몬 analyze 작업)은 수집기가 기록한 트윗을 DB에서 다시 읽어 집계하므로
+트윗이 두 번 전송되고 트렌드가 분석 주기만큼 늦습니다. 스트리밍 모드에서는
+- 수집기 sink(BulkWriteSink)가 기록한 문서 중 저장이 확인된 것(DB 응답 성공 또는 스풀 기록)을 같은 프로세스에서 바로 받아 토큰화하고,
+  키워드/해시태그/멘션, 카테고리별, 시간대별, 참여도 집계를 문서 단위로 더합니다.
+  같은 문서가 다시 들어오거나 창(days_back일, collected_at 기준) 밖으로 밀려나면 그 문서의 기여분을 뺍니다.
+- flush()(flush_interval초마다)는 누적 집계로 배치 분석과 같은 형태의 결과를 만들어 저장합니다.
+  저장 문서는 시간 단위 체크포인트(keyword_analysis:{YYYY-MM-DDTHH}:00:00)로, 같은 시간 안에서는 같은 문서를 갱신하므로
+  문서 수는 시간당 하나입니다. 마지막 flush 이후 바뀐 것이 없으면 저장하지 않습니다.
+- 프로세스가 다시 시작되면 seed()가 DB에서 창을 한 번 읽어 집계를 복원하고, 이후에는 DB를 다시 읽지 않습니다.
+
+급상승 키워드(trend_scorer)와 연관 키워드(cooccurrence)는 분석기에 설정되어 있으면 시간 구간이 바뀐 flush에서만 갱신합니다.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from .analysis_format import build_analysis_doc
+from .daemon import TweetWindow
+from .metrics import REGISTRY
+from .trend_scorer import SECONDS_PER_HOUR
+
+logger = logging.getLogger(__name__)
+
+STREAM_DOCS = REGISTRY.counter(
+    'todaytrends_stream_docs_total', "스트리밍 분석에 반영/제거된 문서 수", ['event'])
+STREAM_FLUSHES = REGISTRY.counter(
+    'todaytrends_stream_flushes_total', "스트리밍 분석 결과 저장 수", ['status'])
+
+
+def _add(counter, items, sign):
+    for item in items:
+        count = counter.get(item, 0) + sign
+        if count:
+            counter[item] = count
+        else:
+            del counter[item]
+
+
+class RollingAggregates:
+    """문서별 기여분을 더하고 뺄 수 있는 키워드 집계 (KeywordAnalyzer._aggregate / _analyze_keyword_trends와 같은 규칙)."""
+
+    def __init__(self):
+        self.keywords = Counter()
+        self.hashtags = Counter()
+        self.mentions = Counter()
+        self.categories = {}
+        self.hourly = {}
+        self.engagement = {}  # 키워드 -> [합계, 횟수]
+        self.docs = 0
+
+    @staticmethod
+    def contribution(tweet, keywords):
+        hour = None
+        created_at = tweet.get('created_at', '')
+        if created_at:
+            try:
+                hour = datetime.fromisoformat(created_at.replace('Z', '+00:00')).hour
+            except ValueError:
+                pass
+        engagement = tweet.get('engagement_metrics', {})
+        total = (engagement.get('likes_count', 0) + engagement.get('comments_count', 0)
+                 + engagement.get('shares_count', 0))
+        return (keywords, list(tweet.get('hashtags', [])), list(tweet.get('mentions', [])),
+                list(tweet.get('content_categories', ['general'])), hour, total)
+
+    def apply(self, contribution, sign):
+        keywords, hashtags, mentions, categories, hour, total = contribution
+        self.docs += sign
+        _add(self.keywords, keywords, sign)
+        _add(self.hashtags, hashtags, sign)
+        _add(self.mentions, mentions, sign)
+        for category in categories:
+            _add(self.categories.setdefault(category, Counter()), keywords, sign)
+            if not self.categories[category]:
+                del self.categories[category]
+        if hour is not None:
+            _add(self.hourly.setdefault(hour, Counter()), keywords, sign)
+            if not self.hourly[hour]:
+                del self.hourly[hour]
+        for keyword in keywords:
+            stats = self.engagement.setdefault(keyword, [0, 0])
+            stats[0] += sign * total
+            stats[1] += sign
+            if not stats[1]:
+                del self.engagement[keyword]
+
+    def result(self, days_back):
+        return {
+            'total_tweets': self.docs,
+            'recent_tweets': self.docs,
+            'analysis_date': datetime.now().isoformat(),
+            'days_analyzed': days_back,
+            'top_keywords': self.keywords.most_common(50),
+            'top_hashtags': self.hashtags.most_common(20),
+            'top_mentions': self.mentions.most_common(10),
+            'keyword_trends': {
+                'categories': {category: Counter(counts) for category, counts in self.categories.items()},
+                'hourly': {hour: Counter(counts) for hour, counts in self.hourly.items()},
+                'engagement': {keyword: {'total': total, 'count': count, 'avg': total / count}
+                               for keyword, (total, count) in self.engagement.items()},
+            },
+        }
+
+
+class StreamingAnalysis:
+    def __init__(self, analyzer, days_back=7, flush_interval=30):
+        """
+        :param analyzer: 토큰화 규칙과 저장소(db_handler), 선택 단계(trend_scorer, cooccurrence)를 제공할 KeywordAnalyzer
+        :param flush_interval: 누적 결과를 저장하는 주기(초)
+        """
+        self.analyzer = analyzer
+        self.days_back = days_back
+        self.flush_interval = flush_interval
+        self.window = TweetWindow(analyzer.db_handler, days_back=days_back, on_discard=self._discard)
+        self.aggregates = RollingAggregates()
+        self._contributions = {}  # 문서 ID -> RollingAggregates.contribution 결과
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # 저장은 집계 잠금 밖에서 하므로 flush끼리만 직렬화
+        self._dirty = False
+        self._last_hour = None
+        self._checkpoint = (None, None)  # (문서 ID, 리비전)
+        self._stop_event = threading.Event()
+
+    def __len__(self):
+        return len(self.window.docs)
+
+    def seed(self):
+        """DB에서 현재 창을 한 번 읽어 집계를 복원합니다 (프로세스 시작 시). 반영한 문서 수를 반환합니다."""
+        with self._lock:
+            docs = self.window.refresh()
+            self._add(docs)
+        logger.info(f"스트리밍 분석 창 복원: 문서 {len(docs)}개")
+        return len(docs)
+
+    def observe(self, docs):
+        """sink가 저장을 확인한 문서들을 반영합니다 (BulkWriteSink에서 호출)."""
+        with self._lock:
+            added = {}
+            for doc in docs:
+                doc_id = doc.get('_id', '')
+                # 같은 배치에 같은 문서가 두 번 있으면 뒤의 것만 반영
+                if doc_id in added:
+                    del added[doc_id]
+                if self.window.apply({'id': doc_id, 'doc': dict(doc)}):
+                    added[doc_id] = self.window.docs[doc_id]
+            self._add(list(added.values()))
+
+    def _add(self, docs):
+        for doc, keywords in zip(docs, self.analyzer._tokenize_tweets(docs)):
+            contribution = RollingAggregates.contribution(doc, keywords)
+            self._contributions[doc['_id']] = contribution
+            self.aggregates.apply(contribution, 1)
+        if docs:
+            self._dirty = True
+            STREAM_DOCS.inc(len(docs), event='added')
+
+    def _discard(self, doc_id):
+        contribution = self._contributions.pop(doc_id, None)
+        if contribution is not None:
+            self.aggregates.apply(contribution, -1)
+            self._dirty = True
+            STREAM_DOCS.inc(event='removed')
+
+    def snapshot(self):
+        """창을 정리한 뒤 현재 누적 집계로 분석 결과를 만듭니다."""
+        with self._lock:
+            self.window.evict_expired()
+            result = self.aggregates.result(self.days_back)
+            hour = int(time.time()) // SECONDS_PER_HOUR
+            optional = self.analyzer.trend_scorer is not None or self.analyzer.cooccurrence is not None
+            if self._last_hour != hour and optional:
+                # 시간 구간이 바뀌었을 때만 창 전체를 넘겨 끝난 구간을 닫음
+                docs = list(self.window.docs.values())
+                keywords = [self._contributions[doc['_id']][0] for doc in docs]
+                if self.analyzer.trend_scorer is not None:
+                    self.analyzer.trend_scorer.close_buckets(docs, keywords)
+                if self.analyzer.cooccurrence is not None:
+                    self.analyzer.cooccurrence.close_buckets(docs, keywords)
+                self._last_hour = hour
+            if self.analyzer.trend_scorer is not None:
+                result['emerging_keywords'] = self.analyzer.trend_scorer.top(20)
+            if self.analyzer.cooccurrence is not None:
+                top = [keyword for keyword, _ in result['top_keywords'][:20]]
+                result['related_keywords'] = self.analyzer.cooccurrence.related(top)
+            return result
+
+    def flush(self):
+        """마지막 flush 이후 바뀐 것이 있으면 시간 단위 체크포인트 문서를 저장합니다. 저장했으면 True."""
+        with self._flush_lock:
+            with self._lock:
+                # 새 문서가 없어도 창 밖으로 밀려난 문서가 있으면 결과가 바뀜
+                self.window.evict_expired()
+                if not self._dirty:
+                    return False
+                result = self.snapshot()
+                self._dirty = False
+            if self._save(result):
+                STREAM_FLUSHES.inc(status='ok')
+                return True
+            with self._lock:
+                self._dirty = True  # 다음 flush에서 다시 시도
+            STREAM_FLUSHES.inc(status='error')
+            return False
+
+    def _save(self, result):
+        db_handler = self.analyzer.db_handler
+        doc_id = f"keyword_analysis:{result['analysis_date'][:13]}:00:00"
+        doc = build_analysis_doc(result, doc_id)
+        last_id, last_rev = self._checkpoint
+        for _ in range(2):
+            if last_id == doc_id and last_rev:
+                doc['_rev'] = last_rev
+            try:
+                results = db_handler.save_docs_bulk([doc]) or []
+            except Exception as e:
+                logger.error(f"스트리밍 분석 결과 저장 중 오류: {e}")
+                return False
+            if results and results[0][0]:
+                self._checkpoint = (doc_id, results[0][2])
+                self.analyzer.invalidate_analysis_cache()
+                return True
+            # 재시작 등으로 리비전을 모르면 현재 리비전을 읽어 한 번 더 시도
+            current = db_handler.get_doc(doc_id)
+            last_id, last_rev = doc_id, current.get('_rev') if current else None
+        logger.warning(f"스트리밍 분석 결과 '{doc_id}' 저장 충돌")
+        return False
+
+    def start(self):
+        """flush_interval마다 flush()하는 백그라운드 스레드를 시작합니다."""
+        def loop():
+            while not self._stop_event.wait(self.flush_interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"스트리밍 분석 flush 중 오류: {e}", exc_info=True)
+
+        thread = threading.Thread(target=loop, name='streaming-analysis', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """백그라운드 flush를 멈추고 남은 변경을 저장합니다."""
+        self._stop_event.set()
+        self.flush()
@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+
+def _analysis(hours_ago):
+    date = (datetime.now() - timedelta(hours=hours_ago)).isoformat()
+    return {'_id': f'keyword_analysis:{date}', 'type': 'keyword_analysis', 'analysis_date': date}
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.db.view.return_value = [SimpleNamespace(doc=_analysis(h)) for h in (30, 1, 5)]
+        self.db.changes_since.return_value = ([], '1-seq')
+        self.clock = [1000.0]
+        patcher = patch('server.src.keyword_analyzer.time.monotonic', side_effect=lambda: self.clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_range_query_and_repeated_calls_hit_memory(self):
+        analyzer = KeywordAnalyzer(self.db)
+        recent = analyzer.get_recent_analysis(days_back=1)
+        self.assertEqual(len(recent), 2)
+        self.assertGreater(recent[0]['analysis_date'], recent[1]['analysis_date'])
+
+        options = self.db.view.call_args.kwargs
+        self.assertEqual(self.db.view.call_args.args, ('_all_docs',))
+        self.assertTrue(options['startkey'].startswith('keyword_analysis:'))
+        self.assertTrue(options['include_docs'])
+
+        for _ in range(5):
+            self.assertEqual(analyzer.get_recent_analysis(days_back=1), recent)
+        self.assertEqual(self.db.view.call_count, 1)
+        # days_back마다 따로 캐시
+        analyzer.get_recent_analysis(days_back=2)
+        self.assertEqual(self.db.view.call_count, 2)
+
+    def test_ttl_expiry_and_local_save_reload(self):
+        analyzer = KeywordAnalyzer(self.db, analysis_cache_ttl=60)
+        analyzer.get_recent_analysis()
+        self.clock[0] += 61
+        analyzer.get_recent_analysis()
+        self.assertEqual(self.db.view.call_count, 2)
+
+        self.db.save_doc.return_value = ('keyword_analysis:x', '1-a')
+        analyzer.save_analysis_to_db({'analysis_date': datetime.now().isoformat(),
+                                     'keyword_trends': {'categories': {}, 'hourly': {}, 'engagement': {}}})
+        analyzer.get_recent_analysis()
+        self.assertEqual(self.db.view.call_count, 3)
+
+    def test_changes_feed_invalidates_for_analysis_docs_only(self):
+        analyzer = KeywordAnalyzer(self.db, analysis_cache_ttl=600, analysis_changes_interval=5)
+        analyzer.get_latest_analysis()
+        self.assertEqual(self.db.changes_since.call_args.args, ('now',))
+
+        self.db.changes_since.return_value = ([{'id': 'twitter:1'}], '2-seq')
+        self.clock[0] += 6
+        analyzer.get_latest_analysis()
+        self.assertEqual(self.db.view.call_count, 1)
+        self.assertEqual(self.db.changes_since.call_args.args, ('1-seq',))
+
+        # 확인 간격 안에서는 _changes도 조회하지 않음
+        self.db.changes_since.return_value = ([{'id': 'keyword_analysis:new'}], '3-seq')
+        analyzer.get_latest_analysis()
+        self.assertEqual(self.db.changes_since.call_count, 2)
+        self.clock[0] += 6
+        analyzer.get_latest_analysis()
+        self.assertEqual(self.db.view.call_count, 2)
+
+    def test_load_errors_are_not_cached(self):
+        analyzer = KeywordAnalyzer(self.db, analysis_changes_interval=None)
+        rows = self.db.view.return_value
+        self.db.view.side_effect = ConnectionError("couch down")
+        self.assertEqual(analyzer.get_recent_analysis(), [])
+        self.assertIsNone(analyzer.get_latest_analysis())
+
+        self.db.view.side_effect = None
+        self.db.view.return_value = rows
+        self.assertEqual(len(analyzer.get_recent_analysis()), 2)
+        self.assertIsNotNone(analyzer.get_latest_analysis())
+
+    def test_invalidation_during_load_is_not_overwritten(self):
+        analyzer = KeywordAnalyzer(self.db, analysis_changes_interval=None)
+        rows = self.db.view.return_value
+
+        def view_while_saving(*args, **kwargs):
+            # 조회하는 사이 새 분석이 저장되어 캐시가 무효화됨
+            analyzer.invalidate_analysis_cache()
+            return rows
+        self.db.view.side_effect = view_while_saving
+        analyzer.get_recent_analysis()
+        self.db.view.side_effect = None
+        analyzer.get_recent_analysis()
+        self.assertEqual(self.db.view.call_count, 2)
+
+    def test_latest_uses_descending_limit_one(self):
+        self.db.view.return_value = [SimpleNamespace(doc=_analysis(0))]
+        latest = KeywordAnalyzer(self.db, analysis_changes_interval=None).get_latest_analysis()
+        self.assertEqual(latest['type'], 'keyword_analysis')
+        options = self.db.view.call_args.kwargs
+        self.assertTrue(options['descending'])
+        self.assertEqual(options['limit'], 1)
+        self.db.changes_since.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import base64
+import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.analysis_format import DETAIL_ATTACHMENT, FORMAT, build_analysis_doc, decode_detail, load_detail
+from server.src.db_handler import CouchDBHandler
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+
+def _size(doc):
+    body = {key: value for key, value in doc.items() if key != '_attachments'}
+    return len(json.dumps(body, ensure_ascii=False, default=str, separators=(',', ':')).encode('utf-8'))
+
+
+class TestCompactAnalysisDoc(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = KeywordAnalyzer(None).extract_keywords_from_tweets(list(generate_tweets(3000, seed=9)), days_back=30)
+
+    def test_sections_are_truncated_to_parallel_arrays(self):
+        doc = build_analysis_doc(self.result, 'keyword_analysis:x')
+        trends = self.result['keyword_trends']
+        compact = doc['keyword_trends']
+
+        self.assertEqual(doc['format'], FORMAT)
+        self.assertEqual(doc['top_keywords'], self.result['top_keywords'])
+        self.assertEqual(compact['categories'].keys(), trends['categories'].keys())
+        for category, counts in trends['categories'].items():
+            section = compact['categories'][category]
+            self.assertEqual(list(zip(section['keywords'], section['counts'])), counts.most_common(20))
+        self.assertEqual(set(compact['hourly']), {str(hour) for hour in trends['hourly']})
+
+        engagement = compact['engagement']
+        self.assertEqual(len(engagement['keywords']), 100)
+        self.assertEqual(engagement['avg'], sorted(engagement['avg'], reverse=True))
+        self.assertTrue(all(count >= 2 for count in engagement['count']))
+        self.assertLess(_size(doc), len(json.dumps(self.result, ensure_ascii=False, default=str).encode('utf-8')) / 5)
+
+    def test_long_tail_is_kept_in_compressed_attachment(self):
+        doc = build_analysis_doc(self.result, 'keyword_analysis:x')
+        attachment = doc['_attachments'][DETAIL_ATTACHMENT]
+        detail = decode_detail(base64.b64decode(attachment['data']))
+        expected = json.loads(json.dumps(self.result['keyword_trends']))
+        self.assertEqual(detail, expected)
+        self.assertNotIn('_attachments', build_analysis_doc(self.result, 'keyword_analysis:x', detail=False))
+
+    def test_size_budget_shrinks_sections(self):
+        doc = build_analysis_doc(self.result, 'keyword_analysis:x', max_bytes=8_000)
+        self.assertLessEqual(_size(doc), 8_000)
+        self.assertLess(len(doc['keyword_trends']['engagement']['keywords']), 100)
+
+        with self.assertLogs('server.src.analysis_format', level='WARNING'):
+            doc = build_analysis_doc(self.result, 'keyword_analysis:x', max_bytes=100)
+        self.assertEqual(len(doc['keyword_trends']['categories']['general']['keywords']), 1)
+
+    def test_save_and_load_detail(self):
+        db_handler = MagicMock()
+        db_handler.save_doc.return_value = ('keyword_analysis:x', '1-a')
+        self.assertTrue(KeywordAnalyzer(db_handler).save_analysis_to_db(self.result))
+        saved = db_handler.save_doc.call_args[0][0]
+        self.assertEqual(saved['format'], FORMAT)
+
+        with patch.object(CouchDBHandler, '_connect'):
+            handler = CouchDBHandler('http://localhost:5984/', 'test')
+        handler.server, handler.db = object(), MagicMock()
+        data = base64.b64decode(saved['_attachments'][DETAIL_ATTACHMENT]['data'])
+        handler.db.get_attachment.return_value = io.BytesIO(data)
+        detail = load_detail(handler, saved['_id'])
+        self.assertEqual(detail['engagement'].keys(), self.result['keyword_trends']['engagement'].keys())
+        handler.db.get_attachment.return_value = None
+        self.assertIsNone(load_detail(handler, saved['_id']))
+
+
+if __name__ == '__main__':
+    unittest.main()
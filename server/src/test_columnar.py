@@ -0,0 +1,59 @@
+import importlib.util
+import shutil
+import tempfile
+import unittest
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+if HAS_PYARROW:
+    from server.src.columnar import ColumnarExporter, ColumnarKeywordAnalyzer
+
+
+def _head(top):
+    """동률 순서는 저장 순서에 따라 달라질 수 있으므로 마지막 빈도보다 큰 항목만 비교."""
+    return {item: count for item, count in top if count > top[-1][1]}, [count for _, count in top]
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow가 설치되어 있지 않음")
+class TestColumnarKeywordAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tweets = list(generate_tweets(2000, seed=7))
+        self.tweets.append({'_id': 'twitter:undated', 'text_content': '날짜 없는 심리테스트', 'hashtags': ['밈']})
+        with ColumnarExporter(self.directory, rows_per_file=500) as exporter:
+            exporter.export(self.tweets)
+        self.files = exporter.files
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_matches_in_memory_analyzer(self):
+        expected = KeywordAnalyzer(None).extract_keywords_from_tweets(self.tweets, days_back=30)
+        result = ColumnarKeywordAnalyzer(self.directory).extract_keywords(days_back=30)
+
+        self.assertGreater(len(self.files), 1)
+        self.assertEqual(result['total_tweets'], expected['total_tweets'])
+        self.assertEqual(result['recent_tweets'], expected['recent_tweets'])
+        for key in ('top_keywords', 'top_hashtags', 'top_mentions'):
+            self.assertEqual(_head(result[key]), _head(expected[key]), key)
+
+        trends, expected_trends = result['keyword_trends'], expected['keyword_trends']
+        self.assertEqual(trends['categories'], expected_trends['categories'])
+        self.assertEqual(trends['hourly'], expected_trends['hourly'])
+        self.assertEqual(trends['engagement'].keys(), expected_trends['engagement'].keys())
+        for keyword, stats in expected_trends['engagement'].items():
+            self.assertEqual(trends['engagement'][keyword]['total'], stats['total'])
+            self.assertEqual(trends['engagement'][keyword]['count'], stats['count'])
+
+    def test_window_excludes_older_partitions(self):
+        result = ColumnarKeywordAnalyzer(self.directory).extract_keywords(days_back=1)
+        self.assertLess(result['recent_tweets'], len(self.tweets))
+        self.assertGreater(result['recent_tweets'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from server.src.cooccurrence import CooccurrenceGraph
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.trend_scorer import SECONDS_PER_HOUR
+
+
+def _hour(now):
+    return int(now.timestamp()) // SECONDS_PER_HOUR
+
+
+class TestCooccurrenceGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.tweets = (
+            [['MBTI', '심리테스트', '결과']] * 6
+            + [['MBTI', '오늘']] * 2
+            + [['오늘', '점심', '결과']] * 10
+            + [['오늘', '날씨']] * 10
+        )
+
+    def test_related_keywords_ranked_by_pmi(self):
+        graph = CooccurrenceGraph(min_pair_count=2)
+        graph.update(0, self.tweets)
+        related = graph.related(['MBTI', '없는단어'])
+
+        self.assertEqual(related['MBTI'][0]['keyword'], '심리테스트')
+        self.assertEqual(related['MBTI'][0]['count'], 6)
+        self.assertEqual(related['없는단어'], [])
+        # 흔한 '오늘'은 함께 나와도 기대치보다 적으므로 PMI가 음수
+        today = next(item for item in related['MBTI'] if item['keyword'] == '오늘')
+        self.assertLess(today['pmi'], 0)
+
+    def test_pair_cap_per_tweet(self):
+        graph = CooccurrenceGraph(max_terms_per_tweet=4)
+        graph.update(0, [[f'단어{i}' for i in range(50)] + ['단어0']])
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(graph.tweets, 1)
+
+    def test_window_expiry_matches_fresh_build_and_recycles_ids(self):
+        rolling = CooccurrenceGraph(window_hours=2, min_pair_count=1)
+        rolling.update(0, [['옛날', '키워드']] * 3)
+        rolling.update(1, self.tweets[:8])
+        rolling.update(2, self.tweets[8:])
+
+        fresh = CooccurrenceGraph(window_hours=2, min_pair_count=1)
+        fresh.update(1, self.tweets[:8])
+        fresh.update(2, self.tweets[8:])
+
+        self.assertNotIn('옛날', rolling.ids)
+        self.assertEqual(rolling.tweets, fresh.tweets)
+        keywords = ['MBTI', '오늘', '결과']
+        self.assertEqual(rolling.related(keywords), fresh.related(keywords))
+        # 창에서 빠진 키워드의 ID를 새 키워드가 다시 씀
+        size = len(rolling.words)
+        rolling.update(3, [['새', '단어']])
+        self.assertEqual(len(rolling.words), size)
+
+    def test_prune_drops_rare_pairs(self):
+        graph = CooccurrenceGraph(min_pair_count=2, max_pairs=5)
+        graph.update(0, self.tweets + [['희귀', '조합']])
+        self.assertTrue(all(count >= 2 for count in graph.pairs.values()))
+        self.assertEqual(graph.related(['희귀'])['희귀'], [])
+
+    def test_close_buckets_is_incremental(self):
+        now = datetime.now(timezone.utc).replace(minute=30)
+        tweets = [{'collected_at': (now - timedelta(hours=hours)).isoformat()} for hours in (0, 1, 2, 2)]
+        keywords = [['지금', '진행'], ['MBTI', '심리테스트'], ['MBTI', '심리테스트'], ['MBTI', '결과']]
+
+        graph = CooccurrenceGraph(min_pair_count=1)
+        self.assertEqual(graph.close_buckets(tweets, keywords, now=now), 2)
+        self.assertEqual(graph.last_closed, _hour(now) - 1)
+        self.assertNotIn('지금', graph.ids)
+        self.assertEqual(graph.close_buckets(tweets, keywords, now=now), 0)
+        self.assertEqual(graph.tweets, 3)
+        self.assertEqual(graph.close_buckets(tweets, keywords, now=now + timedelta(hours=1)), 1)
+        self.assertEqual(graph.related(['지금'])['지금'][0]['keyword'], '진행')
+
+    def test_analyzer_adds_related_keywords(self):
+        now = datetime.now(timezone.utc)
+        texts = ['MBTI 심리테스트 결과 공유'] * 5 + ['오늘 점심 메뉴'] * 5 + ['오늘 날씨 맑음'] * 5
+        tweets = [{'text_content': text, 'collected_at': (now - timedelta(hours=2)).isoformat()} for text in texts]
+        analyzer = KeywordAnalyzer(None, cooccurrence=CooccurrenceGraph())
+        result = analyzer.extract_keywords_from_tweets(tweets)
+        self.assertIn('심리테스트', [item['keyword'] for item in result['related_keywords']['mbti']])
+        self.assertNotIn('related_keywords', KeywordAnalyzer(None).extract_keywords_from_tweets(tweets))
+
+
+if __name__ == '__main__':
+    unittest.main()
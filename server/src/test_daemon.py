@@ -0,0 +1,132 @@
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from server.src.daemon import Daemon, Job, KeywordAnalysisJob, TweetWindow
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+
+def _tweet(doc_id, rev='1-a', text='심리테스트 결과 대박', age_days=0):
+    collected_at = datetime.now(timezone.utc) - timedelta(days=age_days)
+    return {
+        '_id': doc_id, '_rev': rev, 'text_content': text,
+        'collected_at': collected_at.isoformat(), 'created_at': '2024-01-01T10:00:00.000Z',
+        'hashtags': [], 'mentions': [], 'content_categories': ['general'], 'raw_data': {'id': doc_id},
+    }
+
+
+class FakeChangesFeed:
+    """changes_since(since, limit)를 흉내내는 db_handler 대역."""
+
+    def __init__(self):
+        self.changes = []
+
+    def push(self, doc=None, doc_id=None, deleted=False):
+        change = {'id': doc_id or doc['_id'], 'seq': len(self.changes) + 1}
+        if deleted:
+            change['deleted'] = True
+        else:
+            change['doc'] = dict(doc)
+        self.changes.append(change)
+
+    def changes_since(self, since=0, limit=None, include_docs=True):
+        pending = self.changes[since:since + limit] if limit else self.changes[since:]
+        return pending, since + len(pending)
+
+
+class TestJob(unittest.TestCase):
+
+    def test_overlapping_run_is_skipped(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        job = Job('slow', slow, 60)
+        thread = threading.Thread(target=job.run)
+        thread.start()
+        started.wait(5)
+        self.assertTrue(job.running)
+        self.assertFalse(job.run())
+        release.set()
+        thread.join(5)
+        self.assertEqual(job.last_result, 'done')
+
+    def test_error_is_recorded_and_not_raised(self):
+        job = Job('broken', MagicMock(side_effect=RuntimeError('boom')), 60)
+        self.assertFalse(job.run())
+        self.assertIsInstance(job.last_error, RuntimeError)
+
+
+class TestTweetWindow(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = FakeChangesFeed()
+        self.token_cache = {}
+        self.window = TweetWindow(self.feed, days_back=7, batch_size=2, token_cache=self.token_cache)
+
+    def test_applies_only_new_changes_and_filters_prefix(self):
+        self.feed.push(_tweet('twitter:1'))
+        self.feed.push({'_id': 'keyword_analysis:2024', 'type': 'keyword_analysis'})
+        self.feed.push(_tweet('twitter:2'))
+        docs = self.window.refresh()
+        self.assertEqual(sorted(d['_id'] for d in docs), ['twitter:1', 'twitter:2'])
+        self.assertNotIn('raw_data', docs[0])
+        self.assertEqual(self.window.last_seq, 3)
+
+        self.feed.push(_tweet('twitter:1', rev='2-b', text='새 본문'))
+        self.feed.push(doc_id='twitter:2', deleted=True)
+        docs = self.window.refresh()
+        self.assertEqual([(d['_id'], d['_rev']) for d in docs], [('twitter:1', '2-b')])
+
+    def test_expired_docs_are_evicted_with_their_tokens(self):
+        old = _tweet('twitter:old', age_days=10)
+        self.feed.push(old)
+        self.feed.push(_tweet('twitter:new'))
+        self.token_cache[('twitter:old', '1-a')] = ['심리테스트']
+        docs = self.window.refresh()
+        self.assertEqual([d['_id'] for d in docs], ['twitter:new'])
+        self.assertNotIn(('twitter:old', '1-a'), self.token_cache)
+
+
+class TestKeywordAnalysisJob(unittest.TestCase):
+
+    def test_reuses_tokens_between_runs(self):
+        feed = FakeChangesFeed()
+        feed.save_doc = MagicMock(return_value=('id', 'rev'))
+        job = KeywordAnalysisJob(feed)
+        feed.push(_tweet('twitter:1'))
+        feed.push(_tweet('twitter:2'))
+
+        with patch.object(KeywordAnalyzer, '_extract_keywords_from_text', wraps=job.analyzer._extract_keywords_from_text) as tokenize:
+            self.assertEqual(job(), 2)
+            self.assertEqual(tokenize.call_count, 2)
+            feed.push(_tweet('twitter:3'))
+            self.assertEqual(job(), 3)
+            self.assertEqual(tokenize.call_count, 3)
+        self.assertEqual(feed.save_doc.call_count, 2)
+
+
+class TestDaemon(unittest.TestCase):
+
+    def test_runs_jobs_and_closes_on_stop(self):
+        daemon = Daemon(tick_seconds=0.01)
+        closed = MagicMock()
+        daemon.on_close(closed)
+
+        def work():
+            daemon.stop()
+            return 1
+
+        job = daemon.add_job('work', work, 3600)
+        daemon.run_forever()
+        self.assertEqual(job.last_result, 1)
+        closed.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from server.src.db_handler import DESIGN_DOCS, CouchDBHandler
+
+
+class FakeViewDB:
+    """by_created_at 뷰의 descending/startkey/startkey_docid 의미를 흉내내는 DB 대역."""
+
+    def __init__(self, docs):
+        self.docs = {doc['_id']: doc for doc in docs}
+        self.view_calls = []
+
+    def get(self, doc_id):
+        return self.docs.get(doc_id)
+
+    def save(self, doc):
+        doc = dict(doc)
+        doc['_rev'] = f"{int(doc.get('_rev', '0-').split('-')[0]) + 1}-x"
+        self.docs[doc['_id']] = doc
+        return doc['_id'], doc['_rev']
+
+    def view(self, name, descending=False, include_docs=False, limit=None, startkey=None, startkey_docid=None):
+        self.view_calls.append({'startkey': startkey, 'startkey_docid': startkey_docid, 'limit': limit})
+        rows = sorted(
+            ((doc['created_at'], doc_id) for doc_id, doc in self.docs.items() if doc_id.startswith('twitter:')),
+            reverse=descending,
+        )
+        if startkey is not None:
+            start = (startkey, startkey_docid)
+            rows = [row for row in rows if (row <= start if descending else row >= start)]
+        return [SimpleNamespace(key=key, id=doc_id, doc=self.docs[doc_id]) for key, doc_id in rows[:limit]]
+
+
+class TestIterRecentTweets(unittest.TestCase):
+
+    def setUp(self):
+        # 같은 created_at이 페이지 경계에 걸치도록 구성
+        docs = [{'_id': f'twitter:{i:02d}', 'created_at': f'2024-01-01T{i // 2:02d}:00:00.000Z'} for i in range(7)]
+        self.db = FakeViewDB(docs)
+        with patch.object(CouchDBHandler, '_connect'):
+            self.handler = CouchDBHandler('http://localhost:5984/', 'test_db')
+        self.handler.server, self.handler.db = object(), self.db
+
+    def test_pages_cover_all_tweets_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            tweets, cursor = self.handler.iter_recent_tweets(cursor, limit=2)
+            seen.extend(tweet['_id'] for tweet in tweets)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f'twitter:{i:02d}' for i in reversed(range(7))])
+        # 깊은 페이지도 skip 없이 limit + 1 행만 읽음
+        self.assertTrue(all(call['limit'] == 3 for call in self.db.view_calls))
+
+    def test_design_doc_is_created_once(self):
+        self.handler.iter_recent_tweets(limit=2)
+        self.handler.iter_recent_tweets(limit=2)
+        self.assertEqual(self.db.docs['_design/tweets']['views'], DESIGN_DOCS['_design/tweets']['views'])
+        self.assertEqual(self.db.docs['_design/tweets']['_rev'], '1-x')
+        self.assertEqual(self.handler.ensure_design_docs(), [])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.handler.iter_recent_tweets('not-a-cursor', limit=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.engagement_scoring import HAS_NUMPY, EngagementScorer
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+
+def _tweet(likes, comments=0, shares=0, views=0):
+    return {'engagement_metrics': {'likes_count': likes, 'comments_count': comments, 'shares_count': shares,
+                                   'views_count': views}}
+
+
+class TestEngagementScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.tweets = [_tweet(10, 2), _tweet(0), _tweet(4, 0, 1, views=500), _tweet(100), {}]
+        self.keywords = [['밈', '짤'], ['밈'], ['밈', '짤', '짤'], ['대박'], ['밈']]
+
+    def test_stats_percentiles_and_ranking(self):
+        scores = EngagementScorer(percentiles=(50, 100), backend='python').score(self.tweets, self.keywords)
+        stats = scores.engagement_stats()
+        self.assertEqual(stats['밈'], {'total': 17, 'count': 4, 'avg': 4.25})
+        # 같은 트윗에 두 번 나온 키워드는 두 번 셈 (기존 집계와 동일)
+        self.assertEqual(stats['짤'], {'total': 22, 'count': 3, 'avg': 22 / 3})
+
+        top = scores.top(limit=5, min_count=1)
+        self.assertEqual(top[0]['keyword'], '대박')
+        meme = next(item for item in top if item['keyword'] == '밈')
+        self.assertEqual(meme['percentiles'], {'50': 0, '100': 12})
+        self.assertEqual(meme['metrics']['views_count'], 125)
+        self.assertNotIn('대박', [item['keyword'] for item in scores.top(min_count=2)])
+
+    def test_weights_and_frequency_exponent(self):
+        scorer = EngagementScorer(weights={'views_count': 0.01}, frequency_exponent=1, backend='python')
+        scores = scorer.score(self.tweets, self.keywords)
+        self.assertAlmostEqual(scores.engagement_stats()['짤']['total'], 10.0)
+        self.assertEqual(scores.top(1, min_count=1)[0]['keyword'], '짤')
+        with self.assertRaises(ValueError):
+            EngagementScorer(weights={'hearts': 1})
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy가 설치되어 있지 않음")
+    def test_numpy_backend_matches_python(self):
+        tweets = list(generate_tweets(2000, seed=5))
+        keywords = KeywordAnalyzer(None)._tokenize_tweets(tweets)
+        for weights in (None, {'likes_count': 0.5, 'views_count': 0.01, 'quote_count': 3}):
+            expected = EngagementScorer(weights, backend='python').score(tweets, keywords)
+            actual = EngagementScorer(weights, backend='numpy').score(tweets, keywords)
+            self.assertEqual(actual.keywords, expected.keywords)
+            self.assertEqual(actual.counts, expected.counts)
+            self.assertEqual(actual.percentiles, expected.percentiles)
+            for left, right in zip(actual.top(50), expected.top(50)):
+                self.assertEqual(left['keyword'], right['keyword'])
+                self.assertAlmostEqual(left['score'], right['score'], places=2)
+
+    def test_analyzer_engagement_matches_loop(self):
+        tweets = list(generate_tweets(1500, seed=8))
+        expected = KeywordAnalyzer(None).extract_keywords_from_tweets(tweets, days_back=30)
+        result = KeywordAnalyzer(None, engagement_scorer=EngagementScorer()).extract_keywords_from_tweets(
+            tweets, days_back=30)
+        self.assertEqual(result['keyword_trends']['engagement'], expected['keyword_trends']['engagement'])
+        self.assertEqual(result['keyword_trends']['hourly'], expected['keyword_trends']['hourly'])
+        self.assertEqual(len(result['engagement_ranking']), 20)
+        self.assertNotIn('engagement_ranking', expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
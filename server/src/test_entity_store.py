@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock
+
+from server.src.entity_store import EntityStore, LRUCache, content_hash
+
+
+class TestEntityStore(unittest.TestCase):
+
+    def setUp(self):
+        self.db_handler = MagicMock()
+        self.db_handler.get_doc.return_value = None
+        self.db_handler.save_doc.side_effect = lambda doc: (doc['_id'], '1-abc')
+        self.store = EntityStore(self.db_handler, cache_size=2)
+        self.user = {'id': 'u1', 'username': 'tester', 'name': 'Tester'}
+
+    def test_unchanged_entity_written_once(self):
+        for _ in range(5):
+            self.assertEqual(self.store.put_user(dict(self.user)), 'twitter_user:u1')
+
+        self.db_handler.save_doc.assert_called_once()
+        self.db_handler.get_doc.assert_called_once_with('twitter_user:u1')
+        self.assertEqual(self.store.stats['writes'], 1)
+        self.assertEqual(self.store.stats['unchanged'], 4)
+
+    def test_changed_entity_rewritten_with_rev(self):
+        self.store.put_user(self.user)
+        self.store.put_user({**self.user, 'name': 'Renamed'})
+
+        saved = self.db_handler.save_doc.call_args[0][0]
+        self.assertEqual(saved['_rev'], '1-abc')
+        self.assertEqual(saved['data']['name'], 'Renamed')
+
+    def test_existing_db_document_with_same_hash_is_not_rewritten(self):
+        self.db_handler.get_doc.return_value = {
+            '_id': 'twitter_media:m1', '_rev': '3-x', 'content_hash': content_hash({'media_key': 'm1', 'type': 'photo'})
+        }
+        self.store.put_media({'media_key': 'm1', 'type': 'photo'})
+        self.db_handler.save_doc.assert_not_called()
+
+    def test_failed_save_is_not_referenced(self):
+        self.db_handler.save_doc.side_effect = Exception("couch down")
+        self.assertIsNone(self.store.put_user(self.user))
+        self.assertIsNone(self.store.refs(self.user, [{'media_key': 'm1'}]))
+        self.assertEqual(self.store.stats['errors'], 2)
+
+        self.db_handler.save_doc.side_effect = lambda doc: (doc['_id'], '1-abc')
+        self.assertEqual(self.store.refs(self.user, [{'media_key': 'm1'}, {}]),
+                         ('twitter_user:u1', ['twitter_media:m1']))
+
+    def test_spool_mode_does_not_touch_db(self):
+        spool = MagicMock()
+        store = EntityStore(self.db_handler, spool=spool)
+        for _ in range(3):
+            self.assertEqual(store.put_user(dict(self.user)), 'twitter_user:u1')
+        store.put_user({**self.user, 'name': 'Renamed'})
+
+        self.db_handler.get_doc.assert_not_called()
+        self.db_handler.save_doc.assert_not_called()
+        self.assertEqual(spool.append_many.call_count, 2)
+        self.assertNotIn('_rev', spool.append_many.call_args[0][0][0])
+
+        spool.append_many.side_effect = OSError("disk full")
+        self.assertIsNone(store.put_media({'media_key': 'm1'}))
+
+    def test_lru_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from server.src.inverted_index import InvertedIndex
+
+
+def _rank(doc, order):
+    timestamp = int(datetime.fromisoformat(doc['collected_at']).timestamp())
+    metrics = doc['engagement_metrics']
+    engagement = metrics.get('likes_count', 0) + metrics.get('comments_count', 0)
+    return (engagement, timestamp) if order == 'engagement' else (timestamp,)
+
+
+def _doc(index, rng, now):
+    collected_at = now - timedelta(minutes=rng.randrange(0, 7 * 24 * 60))
+    return {
+        '_id': f'twitter:{index}',
+        'collected_at': collected_at.isoformat(),
+        'hashtags': rng.sample(['밈', 'MBTI', '게임'], rng.randrange(0, 3)),
+        'engagement_metrics': {'likes_count': rng.randrange(0, 1000), 'comments_count': rng.randrange(0, 50),
+                               'shares_count': 0},
+    }
+
+
+class TestInvertedIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.now = datetime.now(timezone.utc)
+        self.docs = {}
+        self.keywords = {}
+        self.index = InvertedIndex()
+        for i in range(3000):
+            doc = _doc(i, rng, self.now)
+            keywords = rng.sample(['심리테스트', '결과', '대박', '챌린지', '고양이'], rng.randrange(1, 4))
+            self.docs[doc['_id']] = doc
+            self.keywords[doc['_id']] = keywords
+            self.index.add(doc, keywords)
+
+    def _expected(self, term, since, limit, order):
+        matches = []
+        for doc_id, doc in self.docs.items():
+            if term not in InvertedIndex.terms_for(doc, self.keywords[doc_id]):
+                continue
+            if datetime.fromisoformat(doc['collected_at']).timestamp() > since:
+                matches.append(_rank(doc, order))
+        return sorted(matches, reverse=True)[:limit]
+
+    def _ranks(self, doc_ids, order):
+        return [_rank(self.docs[doc_id], order) for doc_id in doc_ids]
+
+    def test_windowed_lookup_matches_brute_force(self):
+        since = (self.now - timedelta(days=1)).timestamp()
+        self.assertGreater(len(self.index.postings['심리테스트'].blocks), 1)
+        for term in ('심리테스트', '#mbti'):
+            for order in ('engagement', 'time'):
+                found = self.index.lookup(term, since=since, limit=15, order=order)
+                self.assertEqual(self._ranks(found, order), self._expected(term, since, 15, order), (term, order))
+
+    def test_remove_and_update(self):
+        top = self.index.lookup('결과', limit=1)[0]
+        self.index.remove(top)
+        del self.docs[top]
+        self.assertNotIn(top, self.index.lookup('결과', limit=50))
+
+        updated = dict(self.docs['twitter:1'], engagement_metrics={'likes_count': 10 ** 6})
+        self.docs['twitter:1'] = updated
+        self.keywords['twitter:1'] = ['결과']
+        self.index.add(updated, ['결과'])
+        self.assertEqual(self.index.lookup('결과', limit=1), ['twitter:1'])
+
+        # 대량 삭제 시 압축 후에도 결과가 같아야 함
+        for doc_id in list(self.docs)[:2000]:
+            if doc_id != 'twitter:1':
+                self.index.remove(doc_id)
+                del self.docs[doc_id]
+        self.assertLess(len(self.index._dead), 1000)
+        found = self.index.lookup('결과', limit=20)
+        self.assertEqual(self._ranks(found, 'engagement'), self._expected('결과', float('-inf'), 20, 'engagement'))
+        self.assertEqual(len(self.index), len(self.docs))
+
+    def test_lookup_is_fast(self):
+        since = (self.now - timedelta(days=1)).timestamp()
+        started = time.perf_counter()
+        for _ in range(100):
+            self.index.lookup('심리테스트', since=since, limit=10)
+        per_lookup = (time.perf_counter() - started) / 100
+        self.assertLess(per_lookup, 0.005)
+
+
+if __name__ == '__main__':
+    unittest.main()
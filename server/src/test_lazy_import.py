@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from server.src.lazy_import import lazy_import
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_proxy_loads_on_first_attribute_access(self):
+        proxy = lazy_import('colorsys')
+        self.assertIn('not loaded', repr(proxy))
+        self.assertEqual(proxy.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+        self.assertIn('loaded', repr(proxy))
+
+    def test_setattr_and_delattr_forward_to_module(self):
+        import colorsys
+        proxy = lazy_import('colorsys')
+        proxy.LAZY_TEST_MARKER = 1
+        try:
+            self.assertEqual(colorsys.LAZY_TEST_MARKER, 1)
+        finally:
+            del proxy.LAZY_TEST_MARKER
+        self.assertFalse(hasattr(colorsys, 'LAZY_TEST_MARKER'))
+
+    def test_package_import_has_no_heavy_side_effects(self):
+        code = (
+            "import sys, json, os; before = dict(os.environ); "
+            "import server.src.collectors.runner, server.src.analyze_keywords; "
+            "print(json.dumps({'heavy': [m for m in ('tweepy', 'couchdb', 'dotenv', 'requests') if m in sys.modules], "
+            "'env_changed': dict(os.environ) != before}))"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        self.assertEqual(result['heavy'], [])
+        self.assertFalse(result['env_changed'])
+
+
+if __name__ == '__main__':
+    unittest.main()
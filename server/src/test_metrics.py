@@ -0,0 +1,92 @@
+import logging
+import os
+import tempfile
+import unittest
+import urllib.request
+from unittest.mock import MagicMock
+
+from server.src.metrics import MetricsRegistry, SampledLogger, start_metrics_server
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_renders_labels_in_prometheus_format(self):
+        counter = self.registry.counter('calls_total', "호출 수", ['endpoint', 'status'])
+        counter.inc(endpoint='search', status='ok')
+        counter.inc(2, endpoint='search', status='ok')
+        counter.inc(endpoint='search', status='error')
+
+        text = self.registry.render()
+        self.assertIn('# TYPE calls_total counter', text)
+        self.assertIn('calls_total{endpoint="search",status="ok"} 3', text)
+        self.assertIn('calls_total{endpoint="search",status="error"} 1', text)
+
+    def test_counter_rejects_wrong_labels_and_negative_amounts(self):
+        counter = self.registry.counter('docs_total', "문서 수", ['operation'])
+        with self.assertRaises(ValueError):
+            counter.inc(op='save')
+        with self.assertRaises(ValueError):
+            counter.inc(-1, operation='save')
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram('latency_seconds', "지연", ['phase'], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, phase='save')
+
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{phase="save",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{phase="save",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{phase="save",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{phase="save"} 4', text)
+        self.assertAlmostEqual(histogram.total(phase='save'), 6.05)
+
+    def test_same_name_returns_same_metric(self):
+        first = self.registry.counter('shared_total', "공유", ['a'])
+        self.assertIs(first, self.registry.counter('shared_total', "공유", ['a']))
+        with self.assertRaises(ValueError):
+            self.registry.histogram('shared_total', "공유", ['a'])
+
+    def test_dump_writes_file(self):
+        self.registry.counter('dumped_total', "기록").inc()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'metrics.prom')
+            self.registry.dump(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertIn('dumped_total 1', f.read())
+
+    def test_http_endpoint_serves_metrics(self):
+        self.registry.counter('served_total', "제공").inc()
+        server = start_metrics_server(port=0, host='127.0.0.1', registry=self.registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertIn('text/plain', response.headers['Content-Type'])
+                self.assertIn('served_total 1', response.read().decode('utf-8'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestSampledLogger(unittest.TestCase):
+
+    def test_logs_one_in_every_n_when_debug_enabled(self):
+        mock_logger = MagicMock()
+        mock_logger.isEnabledFor.return_value = True
+        sampled = SampledLogger(mock_logger, every=10)
+        for i in range(25):
+            sampled.debug(f"문서 {i}")
+        self.assertEqual(mock_logger.debug.call_count, 3)
+
+    def test_skips_when_debug_disabled(self):
+        mock_logger = MagicMock()
+        mock_logger.isEnabledFor.side_effect = lambda level: level > logging.DEBUG
+        sampled = SampledLogger(mock_logger, every=1)
+        sampled.debug("문서")
+        mock_logger.debug.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
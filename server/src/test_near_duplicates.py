@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.collectors.runner import BulkWriteSink
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.near_duplicates import NearDuplicateIndex
+
+SPAM = "지금 바로 참여하세요 무료 이벤트 당첨 기회 선착순 100명 한정 경품 증정 이벤트 링크 확인"
+
+
+def _spam(i):
+    variants = [
+        SPAM,
+        SPAM + f" @user_{i} https://t.co/{i:08x}",
+        SPAM.replace("선착순", "선착순!!"),
+        "🔥 " + SPAM + " 🔥",
+        SPAM.replace("100명", "200명") + " 서두르세요",
+    ]
+    return {'_id': f'twitter:spam{i}', 'text_content': variants[i % len(variants)], 'collected_at': '2099-01-01T00:00:00'}
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def test_lightly_edited_copies_share_a_cluster(self):
+        index = NearDuplicateIndex()
+        corpus = list(generate_tweets(2000, seed=4))
+        spam = [_spam(i) for i in range(20)]
+        self.assertEqual(index.annotate(corpus), 0)
+        self.assertEqual(index.annotate(spam), 19)
+
+        self.assertEqual({doc['dup_cluster'] for doc in spam}, {'twitter:spam0'})
+        self.assertEqual(len({doc['dup_cluster'] for doc in corpus}), len(corpus))
+        # 이미 색인된 문서는 다시 계산하지 않고 같은 클러스터를 돌려줌
+        self.assertEqual(index.assign('twitter:spam3', "전혀 다른 내용"), 'twitter:spam0')
+
+    def test_buckets_stay_bounded_for_mass_duplicates(self):
+        index = NearDuplicateIndex(bucket_size=4)
+        index.annotate([_spam(i) for i in range(500)])
+        self.assertLessEqual(max(len(bucket) for bands in index.buckets for bucket in bands.values()), 4)
+        self.assertEqual(index.cluster_of('twitter:spam499'), 'twitter:spam0')
+
+    def test_max_docs_and_remove(self):
+        index = NearDuplicateIndex(max_docs=10)
+        index.annotate(list(generate_tweets(30, seed=2)))
+        self.assertEqual(len(index), 10)
+        doc_id = next(iter(index.docs))
+        self.assertTrue(index.remove(doc_id))
+        self.assertNotIn(doc_id, index)
+        self.assertFalse(any(doc_id in bucket for bands in index.buckets for bucket in bands.values()))
+
+
+class TestNearDuplicateSuppression(unittest.TestCase):
+
+    def setUp(self):
+        normal = ['오늘 점심 메뉴 추천 받아요', 'MBTI 테스트 결과 공유', '고양이 짤 모음', '주말 여행 계획 세우는 중', '새 앨범 컴백 무대']
+        self.tweets = [_spam(i) for i in range(30)] + [
+            {'_id': f'twitter:n{i}', 'text_content': text, 'collected_at': '2099-01-01T00:00:00'}
+            for i, text in enumerate(normal)
+        ]
+
+    def test_analyzer_counts_each_cluster_once(self):
+        plain = KeywordAnalyzer(None).extract_keywords_from_tweets(self.tweets)
+        self.assertEqual(dict(plain['top_keywords'])['이벤트'], 60)
+
+        analyzer = KeywordAnalyzer(None, near_duplicates=NearDuplicateIndex())
+        result = analyzer.extract_keywords_from_tweets(self.tweets)
+        self.assertEqual(dict(result['top_keywords'])['이벤트'], 2)
+        self.assertEqual(result['suppressed_duplicates'], 29)
+        self.assertEqual(result['recent_tweets'], 6)
+
+    def test_ingest_cluster_ids_are_used_by_the_analyzer(self):
+        sink = BulkWriteSink(MagicMock(), batch_size=1000, near_duplicates=NearDuplicateIndex())
+        sink.write(self.tweets)
+        self.assertEqual(sink.stats['near_duplicates'], 29)
+
+        # 분석 시에는 새 색인을 쓰더라도 수집 시 붙은 dup_cluster를 그대로 따름
+        index = NearDuplicateIndex()
+        result = KeywordAnalyzer(None, near_duplicates=index).extract_keywords_from_tweets(self.tweets)
+        self.assertEqual(result['suppressed_duplicates'], 29)
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from server.src.profiling import PhaseProfiler
+from server.src.keyword_analyzer import KeywordAnalyzer
+
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def test_records_time_and_memory_per_phase(self):
+        with PhaseProfiler() as profiler:
+            with profiler.phase('allocate'):
+                kept = [bytearray(1024) for _ in range(100)]
+            with profiler.phase('noop'):
+                pass
+
+        self.assertEqual([p['phase'] for p in profiler.phases], ['allocate', 'noop'])
+        allocate = profiler.phases[0]
+        self.assertGreaterEqual(allocate['peak_bytes'], 100 * 1024)
+        self.assertGreaterEqual(allocate['retained_bytes'], 100 * 1024)
+        self.assertGreaterEqual(allocate['wall_seconds'], 0)
+        self.assertIn('allocate', profiler.report())
+        self.assertEqual(len(kept), 100)
+
+    def test_dump_stats_requires_cprofile(self):
+        profiler = PhaseProfiler(trace_memory=False)
+        with self.assertRaises(RuntimeError):
+            profiler.dump_stats('unused.pstats')
+
+        profiler = PhaseProfiler(trace_memory=False, cprofile=True)
+        with profiler:
+            with profiler.phase('work'):
+                sum(range(1000))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'run.pstats')
+            profiler.dump_stats(path)
+            self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_keyword_analyzer_reports_each_phase(self):
+        profiler = PhaseProfiler()
+        analyzer = KeywordAnalyzer(db_handler=None, profiler=profiler)
+        tweets = [{
+            '_id': 'twitter:1',
+            'text_content': '오늘 심리테스트 결과 대박',
+            'collected_at': datetime.now(timezone.utc).isoformat(),
+            'created_at': '2024-01-01T10:00:00.000Z',
+            'hashtags': ['심리테스트'],
+            'mentions': [],
+            'content_categories': ['psychology'],
+        }]
+        with profiler:
+            result = analyzer.extract_keywords_from_tweets(tweets)
+
+        self.assertEqual(
+            [p['phase'] for p in profiler.phases], ['filter', 'tokenize', 'aggregate', 'trends']
+        )
+        self.assertEqual(list(result)[-1], 'keyword_trends')
+        self.assertIn(('심리테스트', 1), result['top_keywords'])
+
+
+if __name__ == '__main__':
+    unittest.main()
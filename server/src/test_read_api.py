@@ -0,0 +1,115 @@
+import gzip
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import MagicMock
+
+from server.src.read_api import TrendsReadModel, TrendsReadService, create_server
+from server.src.test_daemon import FakeChangesFeed, _tweet
+
+
+class TestTrendsReadModel(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = FakeChangesFeed()
+        self.model = TrendsReadModel(self.feed, batch_size=2)
+
+    def test_tracks_recent_tweets_and_latest_analysis(self):
+        self.feed.push(_tweet('twitter:1', age_days=2))
+        self.feed.push(_tweet('twitter:2'))
+        self.feed.push({'_id': 'keyword_analysis:a', 'analysis_date': '2024-01-02T00:00:00'})
+        self.feed.push({'_id': 'keyword_analysis:b', 'analysis_date': '2024-01-01T00:00:00'})
+        self.assertTrue(self.model.refresh())
+
+        self.assertEqual([d['_id'] for d in self.model.recent_tweets(10)], ['twitter:2', 'twitter:1'])
+        self.assertEqual(self.model.analysis()['_id'], 'keyword_analysis:a')
+        self.assertFalse(self.model.refresh())
+
+    def test_top_keywords_respects_window(self):
+        self.feed.push(_tweet('twitter:old', text='옛날 키워드', age_days=2))
+        self.feed.push(_tweet('twitter:new', text='심리테스트 결과'))
+        self.model.refresh()
+
+        day = self.model.top_keywords('24h')
+        week = self.model.top_keywords('7d')
+        self.assertEqual(day['tweets'], 1)
+        self.assertNotIn('옛날', dict(day['top_keywords']))
+        self.assertEqual(week['tweets'], 2)
+        self.assertIn('옛날', dict(week['top_keywords']))
+
+    def test_keyword_tweets_follow_updates_and_deletes(self):
+        self.feed.push(_tweet('twitter:1', text='심리테스트 결과 공유'))
+        self.feed.push(_tweet('twitter:2', text='오늘의 심리테스트'))
+        self.feed.push(_tweet('twitter:3', text='심리테스트 옛날 버전', age_days=2))
+        self.model.refresh()
+        self.assertEqual({d['_id'] for d in self.model.keyword_tweets('심리테스트', '24h')}, {'twitter:1', 'twitter:2'})
+        self.assertEqual(len(self.model.keyword_tweets('심리테스트', '7d')), 3)
+
+        self.feed.push(_tweet('twitter:1', rev='2-a', text='다른 내용'))
+        self.feed.push(doc_id='twitter:2', deleted=True)
+        self.model.refresh()
+        self.assertEqual(self.model.keyword_tweets('심리테스트', '24h'), [])
+        self.assertEqual([d['_id'] for d in self.model.keyword_tweets('다른', '24h')], ['twitter:1'])
+
+
+class TestReadApiServer(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = FakeChangesFeed()
+        self.feed.push(_tweet('twitter:1', text='심리테스트 ' * 200))
+        self.service = TrendsReadService(TrendsReadModel(self.feed))
+        self.service.poll()
+        self.server = create_server(self.service, '127.0.0.1', 0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _get(self, path, **headers):
+        request = urllib.request.Request(self.base_url + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def test_etag_revalidation_and_gzip(self):
+        status, headers, body = self._get('/tweets/recent?limit=5', **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(body))['tweets'][0]['_id'], 'twitter:1')
+
+        status, _, body = self._get('/tweets/recent?limit=5', **{'If-None-Match': headers['ETag']})
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b'')
+
+    def test_cache_is_reused_until_changes_arrive(self):
+        build = MagicMock(wraps=self.service.model.recent_tweets)
+        self.service.model.recent_tweets = build
+        _, first, _ = self._get('/tweets/recent')
+        self._get('/tweets/recent')
+        self.assertEqual(build.call_count, 1)
+
+        self.service.poll()
+        self.assertEqual(build.call_count, 1)
+        self.feed.push(_tweet('twitter:2'))
+        self.service.poll()
+        status, second, _ = self._get('/tweets/recent', **{'If-None-Match': first['ETag']})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertEqual(build.call_count, 2)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self._get('/keywords/top?window=1y')[0], 400)
+        self.assertEqual(self._get('/tweets/recent?limit=abc')[0], 400)
+        self.assertEqual(self._get('/nope')[0], 404)
+        status, _, body = self._get('/analysis/latest')
+        self.assertEqual((status, json.loads(body)), (200, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
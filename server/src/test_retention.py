@@ -0,0 +1,117 @@
+import base64
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from server.src.analysis_format import DETAIL_ATTACHMENT, build_analysis_doc, decode_detail
+from server.src.db_handler import CouchDBHandler
+from server.src.retention import RetentionJob, read_archive
+
+
+class FakeRangeDB:
+    """_all_docs / tweets/by_collected_at 키 범위 조회와 _bulk_docs 삭제를 흉내내는 DB 대역."""
+
+    def __init__(self, docs):
+        self.docs = {doc['_id']: dict(doc, _rev='1-a') for doc in docs}
+        self.attachments = {}
+        self.compact = MagicMock()
+        self.cleanup = MagicMock()
+
+    def get(self, doc_id):
+        return self.docs.get(doc_id)
+
+    def get_attachment(self, doc_id, filename):
+        data = self.attachments.get((doc_id, filename))
+        return io.BytesIO(data) if data is not None else None
+
+    def save(self, doc):
+        self.docs[doc['_id']] = dict(doc, _rev='1-a')
+        return doc['_id'], '1-a'
+
+    def view(self, name, include_docs=False, limit=None, startkey=None, endkey=None):
+        if name == '_all_docs':
+            rows = sorted((doc_id, doc_id) for doc_id in self.docs)
+        else:
+            rows = sorted((doc['collected_at'], doc_id) for doc_id, doc in self.docs.items()
+                          if doc_id.startswith('twitter:'))
+        rows = [(key, doc_id) for key, doc_id in rows
+                if (startkey is None or key >= startkey) and (endkey is None or key <= endkey)]
+        return [SimpleNamespace(key=key, id=doc_id, doc=self.docs[doc_id]) for key, doc_id in rows[:limit]]
+
+    def update(self, docs):
+        for doc in docs:
+            self.docs.pop(doc['_id'])
+        return [(True, doc['_id'], '2-b') for doc in docs]
+
+
+class TestRetentionJob(unittest.TestCase):
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        now = datetime.now(timezone.utc)
+        docs = [
+            {'_id': f'twitter:old{i}', 'collected_at': (now - timedelta(days=40, hours=i * 20)).isoformat()}
+            for i in range(3)
+        ]
+        docs.append({'_id': 'twitter:new', 'collected_at': now.isoformat()})
+        old_analysis = (datetime.now() - timedelta(days=40)).isoformat()
+        new_analysis = datetime.now().isoformat()
+        docs.append({'_id': f'keyword_analysis:{old_analysis}', 'analysis_date': old_analysis})
+        docs.append({'_id': f'keyword_analysis:{new_analysis}', 'analysis_date': new_analysis})
+        self.live_ids = sorted([f'keyword_analysis:{new_analysis}', 'twitter:new'])
+        self.db = FakeRangeDB(docs)
+        with patch.object(CouchDBHandler, '_connect'):
+            self.handler = CouchDBHandler('http://localhost:5984/', 'test_db')
+        self.handler.server, self.handler.db = object(), self.db
+
+    def tearDown(self):
+        shutil.rmtree(self.archive_dir)
+
+    def test_archives_then_deletes_expired_docs(self):
+        deleted = RetentionJob(self.handler, self.archive_dir, max_age_days=30, batch_size=2)()
+
+        self.assertEqual(deleted, {'tweets': 3, 'keyword_analysis': 1})
+        live = sorted(doc_id for doc_id in self.db.docs if not doc_id.startswith('_design/'))
+        self.assertEqual(live, self.live_ids)
+
+        archived = []
+        for root, _, files in os.walk(os.path.join(self.archive_dir, 'tweets')):
+            for name in files:
+                archived.extend(doc['_id'] for doc in read_archive(os.path.join(root, name)))
+        self.assertEqual(sorted(archived), ['twitter:old0', 'twitter:old1', 'twitter:old2'])
+        self.assertTrue(os.listdir(os.path.join(self.archive_dir, 'keyword_analysis')))
+        self.db.compact.assert_any_call()
+        self.db.compact.assert_any_call('tweets')
+
+    def test_archives_analysis_detail_attachment(self):
+        old_analysis = (datetime.now() - timedelta(days=40, hours=1)).isoformat()
+        doc_id = f'keyword_analysis:{old_analysis}'
+        trends = {'categories': {'general': {'밈': 3}}, 'hourly': {9: {'밈': 3}},
+                  'engagement': {'밈': {'total': 6, 'count': 3, 'avg': 2.0}}}
+        doc = build_analysis_doc({'analysis_date': old_analysis, 'keyword_trends': trends}, doc_id)
+        attachment = doc.pop('_attachments')[DETAIL_ATTACHMENT]
+        self.db.attachments[(doc_id, DETAIL_ATTACHMENT)] = base64.b64decode(attachment['data'])
+        # include_docs 응답처럼 스텁만 들어 있음
+        self.db.docs[doc_id] = dict(doc, _rev='1-a', _attachments={
+            DETAIL_ATTACHMENT: {'content_type': 'application/gzip', 'stub': True, 'length': 10}})
+
+        RetentionJob(self.handler, self.archive_dir, max_age_days=30)()
+        self.assertNotIn(doc_id, self.db.docs)
+        path = os.path.join(self.archive_dir, 'keyword_analysis', f'{old_analysis[:10]}.jsonl.gz')
+        archived = next(doc for doc in read_archive(path) if doc['_id'] == doc_id)
+        detail = archived['_attachments'][DETAIL_ATTACHMENT]
+        self.assertEqual(decode_detail(base64.b64decode(detail['data']))['hourly'], {'9': {'밈': 3}})
+
+    def test_nothing_expired_skips_compaction(self):
+        deleted = RetentionJob(self.handler, self.archive_dir, max_age_days=365)()
+        self.assertEqual(deleted, {'tweets': 0, 'keyword_analysis': 0})
+        self.db.compact.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
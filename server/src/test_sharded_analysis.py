@@ -0,0 +1,187 @@
+import base64
+import io
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import couchdb
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.db_handler import CouchDBHandler
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.sharded_analysis import ShardedAnalysisCoordinator, ShardWorker
+
+
+class FakeSharedDB:
+    """여러 워커가 함께 쓰는 CouchDB 대역. _rev가 맞지 않는 갱신은 ResourceConflict로 실패합니다."""
+
+    def __init__(self, docs):
+        self.lock = threading.Lock()
+        self.docs = {doc['_id']: dict(doc, _rev='1-a') for doc in docs}
+
+    def _put(self, doc):
+        current = self.docs.get(doc['_id'])
+        if (current or {}).get('_rev') != doc.get('_rev'):
+            return False, doc['_id'], couchdb.http.ResourceConflict('conflict')
+        if doc.get('_deleted'):
+            del self.docs[doc['_id']]
+            return True, doc['_id'], 'deleted'
+        generation = int(current['_rev'].split('-')[0]) + 1 if current else 1
+        rev = f'{generation}-a'
+        self.docs[doc['_id']] = dict(doc, _rev=rev)
+        return True, doc['_id'], rev
+
+    def save(self, doc):
+        with self.lock:
+            success, doc_id, rev = self._put(doc)
+        if not success:
+            raise rev
+        return doc_id, rev
+
+    def get_attachment(self, doc_id, filename):
+        with self.lock:
+            attachment = self.docs.get(doc_id, {}).get('_attachments', {}).get(filename)
+        return io.BytesIO(base64.b64decode(attachment['data'])) if attachment else None
+
+    def update(self, docs):
+        with self.lock:
+            return [self._put(dict(doc)) for doc in docs]
+
+    def view(self, name, include_docs=False, keys=None, startkey=None, endkey=None, inclusive_end=True,
+             skip=0, limit=None):
+        assert name == '_all_docs'
+        with self.lock:
+            if keys is not None:
+                ids = [doc_id for doc_id in keys if doc_id in self.docs]
+            else:
+                ids = [doc_id for doc_id in sorted(self.docs)
+                       if doc_id >= startkey and (doc_id < endkey or (inclusive_end and doc_id == endkey))]
+            ids = ids[skip:] if limit is None else ids[skip:skip + limit]
+            return [SimpleNamespace(id=doc_id, key=doc_id, value={'rev': self.docs[doc_id]['_rev']},
+                                    doc=dict(self.docs[doc_id]) if include_docs else None) for doc_id in ids]
+
+
+def _handler(db):
+    with patch.object(CouchDBHandler, '_connect'):
+        handler = CouchDBHandler('http://localhost:5984/', 'test')
+    handler.server, handler.db = object(), db
+    return handler
+
+
+def _head(top):
+    return {item: count for item, count in top if count > top[-1][1]}
+
+
+class TestShardedAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.tweets = list(generate_tweets(1500, seed=11))
+        self.db = FakeSharedDB(self.tweets + [{'_id': 'keyword_analysis:2024-01-01T00:00:00'}])
+        self.coordinator = ShardedAnalysisCoordinator(_handler(self.db), days_back=30, shard_size=200, timeout=5,
+                                                      poll_interval=0.01)
+
+    def test_workers_split_shards_and_merge_matches_single_process(self):
+        run_id = self.coordinator.plan()
+        workers = [ShardWorker(_handler(self.db), worker_id=f'w{i}', page_size=64, poll_interval=0.01) for i in range(3)]
+        processed = [0] * len(workers)
+
+        def work(i):
+            processed[i] = workers[i].run(run_id)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(len(workers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(processed), 8)
+
+        with patch.object(KeywordAnalyzer, 'save_analysis_to_db', return_value=True) as save:
+            result = self.coordinator.run(run_id)
+        save.assert_called_once_with(result)
+
+        expected = KeywordAnalyzer(None).extract_keywords_from_tweets(self.tweets, days_back=30)
+        self.assertEqual(result['total_tweets'], expected['total_tweets'])
+        self.assertEqual(result['recent_tweets'], expected['recent_tweets'])
+        for key in ('top_keywords', 'top_hashtags', 'top_mentions'):
+            self.assertEqual(_head(result[key]), _head(expected[key]), key)
+        self.assertEqual(result['keyword_trends']['categories'], expected['keyword_trends']['categories'])
+        self.assertEqual(result['keyword_trends']['hourly'], expected['keyword_trends']['hourly'])
+        self.assertEqual(result['keyword_trends']['engagement'], expected['keyword_trends']['engagement'])
+        # 조정용 문서는 모두 정리되고 트윗/분석 문서만 남음
+        self.assertFalse([doc_id for doc_id in self.db.docs if doc_id.startswith('analysis_')])
+
+    def test_shard_is_claimed_once_and_expired_lease_is_reclaimed(self):
+        run_id = self.coordinator.plan()
+        first = ShardWorker(_handler(self.db), worker_id='a', lease_seconds=30)
+        second = ShardWorker(_handler(self.db), worker_id='b')
+        shard = first.claim(run_id)
+        self.assertNotIn(shard['_id'], self._claim_all(second, run_id))
+
+        # 임대가 만료되면 다른 워커가 가져가고, 원래 워커의 완료 기록은 충돌로 버려짐
+        with patch('server.src.sharded_analysis.time.time', return_value=time.time() + 60):
+            self.assertEqual(self._claim_all(second, run_id), {shard['_id']})
+        self.assertFalse(first.process(shard))
+        self.assertEqual(self.db.docs[shard['_id']]['worker'], 'b')
+
+    def test_survivor_takes_over_abandoned_shard_after_lease(self):
+        run_id = self.coordinator.plan()
+        # 샤드 하나를 점유한 채 비정상 종료한 워커
+        abandoned = ShardWorker(_handler(self.db), worker_id='crashed', lease_seconds=30).claim(run_id)
+        clock = {'now': time.time()}
+
+        def sleep(seconds):
+            clock['now'] += seconds
+
+        survivor = ShardWorker(_handler(self.db), worker_id='survivor', page_size=64)
+        with patch('server.src.sharded_analysis.time.time', side_effect=lambda: clock['now']), \
+                patch('server.src.sharded_analysis.time.sleep', side_effect=sleep) as sleeps:
+            self.assertEqual(survivor.run(run_id), 8)
+        self.assertTrue(sleeps.called)
+        self.assertEqual(self.db.docs[abandoned['_id']]['worker'], 'survivor')
+        with patch.object(KeywordAnalyzer, 'save_analysis_to_db', return_value=True):
+            self.assertEqual(self.coordinator.run(run_id)['total_tweets'], len(self.tweets))
+
+    def test_failed_partial_save_releases_shard(self):
+        run_id = self.coordinator.plan()
+        handler = _handler(self.db)
+        worker = ShardWorker(handler, worker_id='w')
+        shard = worker.claim(run_id)
+        with patch.object(handler, 'save_doc', side_effect=Exception("document too large")):
+            self.assertFalse(worker.process(shard))
+        released = self.db.docs[shard['_id']]
+        self.assertEqual(released['status'], 'pending')
+        self.assertNotIn('lease_until', released)
+
+        shard = worker.claim(run_id)
+        self.assertTrue(worker.process(shard))
+        partial = self.db.docs[self.db.docs[shard['_id']]['partial_id']]
+        self.assertNotIn('partial', partial)
+        self.assertIn('partial.json.gz', partial['_attachments'])
+
+    def test_failed_run_removes_its_documents(self):
+        run_id = self.coordinator.plan()
+        worker = ShardWorker(_handler(self.db), worker_id='w', page_size=64)
+        shard = worker.claim(run_id)
+        self.coordinator.timeout = 0
+        with self.assertRaises(TimeoutError):
+            self.coordinator.run(run_id)
+        self.assertFalse([doc_id for doc_id in self.db.docs if doc_id.startswith('analysis_')])
+
+        # 정리 후 끝난 워커는 부분 집계를 남기지 않고, 다른 워커도 가져갈 샤드가 없음
+        self.assertFalse(worker.process(shard))
+        self.assertFalse([doc_id for doc_id in self.db.docs if doc_id.startswith('analysis_')])
+        self.assertEqual(ShardWorker(_handler(self.db), worker_id='idle').run(), 0)
+
+    def _claim_all(self, worker, run_id):
+        claimed = set()
+        while True:
+            shard = worker.claim(run_id)
+            if shard is None:
+                return claimed
+            claimed.add(shard['_id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
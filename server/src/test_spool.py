@@ -0,0 +1,185 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import couchdb
+
+from server.src.spool import WriteAheadSpool, SpoolDrainer
+
+
+class ServerError(Exception):
+    """couchdb.http.ServerError와 같은 ((상태 코드, 사유),) 인자."""
+
+
+class TestWriteAheadSpool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool = WriteAheadSpool(self.tmpdir.name, segment_max_bytes=256, fsync_every=4)
+        self.db_handler = MagicMock()
+        self.db_handler.save_docs_bulk.side_effect = lambda docs: [(True, d['_id'], '1-a') for d in docs]
+        self.drainer = SpoolDrainer(self.spool, self.db_handler, batch_size=3)
+
+    def tearDown(self):
+        self.spool.close()
+        self.tmpdir.cleanup()
+
+    def _docs(self, n):
+        return [{'_id': f"twitter:{i}", 'text_content': f"트윗 {i}" * 5} for i in range(n)]
+
+    def test_roundtrip_across_segments(self):
+        self.spool.append_many(self._docs(10))
+        self.spool.roll()
+
+        segments = self.spool.sealed_segments()
+        self.assertGreater(len(segments), 1)
+        read_back = [doc for path in segments for _, doc in self.spool.read_segment(path)]
+        self.assertEqual([d['_id'] for d in read_back], [d['_id'] for d in self._docs(10)])
+
+    def test_drain_writes_in_bulk_and_removes_segments(self):
+        self.spool.append_many(self._docs(7))
+
+        self.assertEqual(self.drainer.drain(), 7)
+        self.assertEqual(self.spool.sealed_segments(), [])
+        self.assertEqual(self.spool.pending_bytes(), 0)
+        written = [d['_id'] for call in self.db_handler.save_docs_bulk.call_args_list for d in call[0][0]]
+        self.assertEqual(written, [d['_id'] for d in self._docs(7)])
+
+    def test_conflict_counts_as_acknowledged(self):
+        self.db_handler.save_docs_bulk.side_effect = lambda docs: [
+            (False, d['_id'], couchdb.http.ResourceConflict('conflict')) for d in docs
+        ]
+        self.spool.append_many(self._docs(2))
+        self.drainer.drain()
+        self.assertEqual(self.spool.sealed_segments(), [])
+
+    def test_conflicting_entity_doc_is_updated_only_when_changed(self):
+        self.db_handler.save_docs_bulk.side_effect = [
+            [(False, 'twitter_user:u1', couchdb.http.ResourceConflict('conflict')),
+             (False, 'twitter_user:u2', couchdb.http.ResourceConflict('conflict')),
+             (False, 'twitter:1', couchdb.http.ResourceConflict('conflict'))],
+            [(True, 'twitter_user:u1', '3-b')],
+        ]
+        current = {'twitter_user:u1': {'_rev': '2-a', 'content_hash': 'old'},
+                   'twitter_user:u2': {'_rev': '5-a', 'content_hash': 'same'}}
+        self.db_handler.get_doc.side_effect = current.get
+        self.spool.append_many([{'_id': 'twitter_user:u1', 'content_hash': 'new'},
+                                {'_id': 'twitter_user:u2', 'content_hash': 'same'},
+                                {'_id': 'twitter:1'}])
+
+        self.assertEqual(self.drainer.drain(), 3)
+        updated = self.db_handler.save_docs_bulk.call_args[0][0]
+        self.assertEqual(updated, [{'_id': 'twitter_user:u1', 'content_hash': 'new', '_rev': '2-a'}])
+        self.assertEqual(self.spool.sealed_segments(), [])
+
+    def test_failed_batch_is_kept_and_retried(self):
+        self.spool = WriteAheadSpool(self.tmpdir.name, fsync_every=1)
+        self.drainer = SpoolDrainer(self.spool, self.db_handler, batch_size=2)
+        self.spool.append_many(self._docs(5))
+        ok = self.db_handler.save_docs_bulk.side_effect
+        calls = {'n': 0}
+
+        def flaky(docs):
+            calls['n'] += 1
+            if calls['n'] == 2:
+                raise ConnectionError("couch down")
+            return ok(docs)
+        self.db_handler.save_docs_bulk.side_effect = flaky
+
+        self.assertEqual(self.drainer.drain(), 2)
+        self.assertEqual(len(self.spool.sealed_segments()), 1)
+        self.assertEqual(self.drainer.drain(), 3)
+        self.assertEqual(self.spool.sealed_segments(), [])
+
+    def test_torn_tail_is_ignored(self):
+        self.spool.append_many(self._docs(1))
+        self.spool.roll()
+        path = self.spool.sealed_segments()[0]
+        with open(path, 'ab') as f:
+            f.write(b'\x00\x00\x01\x00garbage')
+
+        docs = [doc for _, doc in self.spool.read_segment(path)]
+        self.assertEqual(len(docs), 1)
+
+    def test_corrupt_middle_record_keeps_segment(self):
+        self.spool = WriteAheadSpool(self.tmpdir.name)
+        self.drainer = SpoolDrainer(self.spool, self.db_handler, batch_size=2)
+        self.spool.append_many(self._docs(3))
+        self.spool.roll()
+        path = self.spool.sealed_segments()[0]
+        offsets = [offset for offset, _ in self.spool.read_segment(path)]
+        with open(path, 'r+b') as f:
+            f.seek(offsets[1] - 1)
+            last = f.read(1)
+            f.seek(offsets[1] - 1)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        self.assertEqual(self.drainer.drain(), 1)
+        self.assertEqual(self.spool.sealed_segments(), [])
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(path + '.corrupt'))
+        with open(path + '.corrupt', 'rb') as f:
+            self.assertEqual(len(f.read()), offsets[-1])
+
+    def test_rejected_docs_are_moved_aside(self):
+        self.db_handler.save_docs_bulk.side_effect = lambda docs: [
+            (False, d['_id'], couchdb.http.ServerError('forbidden')) if d['_id'] == 'twitter:1'
+            else (True, d['_id'], '1-a') for d in docs]
+        self.spool.append_many(self._docs(7))
+        self.spool.roll()
+        paths = self.spool.sealed_segments()
+
+        self.assertEqual(self.drainer.drain(), 6)
+        self.assertEqual(self.spool.sealed_segments(), [])
+        rejected = [doc['_id'] for path in paths if os.path.exists(path + '.rejected')
+                    for _, doc in self.spool.read_segment(path + '.rejected')]
+        self.assertEqual(rejected, ['twitter:1'])
+
+    def test_single_doc_rejected_by_request_is_moved_aside(self):
+        def too_large(docs):
+            if any(d['_id'] == 'twitter:2' for d in docs):
+                raise ServerError((413, 'Request Entity Too Large'))
+            return [(True, d['_id'], '1-a') for d in docs]
+        self.db_handler.save_docs_bulk.side_effect = too_large
+        self.spool.append_many(self._docs(5))
+        self.spool.roll()
+        paths = self.spool.sealed_segments()
+
+        self.assertEqual(self.drainer.drain(), 4)
+        self.assertEqual(self.spool.sealed_segments(), [])
+        rejected = [doc['_id'] for path in paths if os.path.exists(path + '.rejected')
+                    for _, doc in self.spool.read_segment(path + '.rejected')]
+        self.assertEqual(rejected, ['twitter:2'])
+
+    def test_transient_request_error_keeps_segment(self):
+        self.db_handler.save_docs_bulk.side_effect = ServerError((503, 'Service Unavailable'))
+        self.spool.append_many(self._docs(2))
+
+        self.assertEqual(self.drainer.drain(), 0)
+        self.assertEqual(len(self.spool.sealed_segments()), 1)
+
+    def test_sequence_skips_quarantined_segments(self):
+        self.spool.append_many(self._docs(1))
+        self.spool.roll()
+        [path] = self.spool.sealed_segments()
+        self.spool.quarantine_segment(path, 0)
+
+        reopened = WriteAheadSpool(self.tmpdir.name)
+        reopened.append_many(self._docs(2))
+        reopened.roll()
+        [new_path] = reopened.sealed_segments()
+        self.assertNotEqual(new_path, path)
+        self.assertTrue(os.path.exists(path + '.corrupt'))
+
+    def test_reopen_continues_sequence(self):
+        self.spool.append_many(self._docs(1))
+        self.spool.roll()
+        reopened = WriteAheadSpool(self.tmpdir.name)
+        reopened.append_many(self._docs(1))
+        reopened.roll()
+        self.assertEqual(len(reopened.sealed_segments()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.collectors.runner import BulkWriteSink
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.streaming_analysis import StreamingAnalysis
+
+
+def _doc(doc_id, text, age_days=0):
+    collected_at = (datetime.now(timezone.utc) - timedelta(days=age_days)).isoformat()
+    return {'_id': doc_id, 'text_content': text, 'collected_at': collected_at, 'created_at': collected_at,
+            'hashtags': ['밈'], 'engagement_metrics': {'likes_count': 3}}
+
+
+def _comparable(result):
+    return {key: value for key, value in result.items() if key != 'analysis_date'}
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.db.save_docs_bulk.side_effect = self._save
+        self.saved = []
+        self.stream = StreamingAnalysis(KeywordAnalyzer(self.db), days_back=30)
+
+    def _save(self, docs):
+        self.saved.append(dict(docs[0]))
+        return [(True, docs[0]['_id'], f"{len(self.saved)}-a")]
+
+    def test_matches_batch_analysis_without_reading_the_store(self):
+        tweets = list(generate_tweets(1500, seed=3))
+        for start in range(0, len(tweets), 200):
+            self.stream.observe(tweets[start:start + 200])
+
+        expected = KeywordAnalyzer(None).extract_keywords_from_tweets(tweets, days_back=30)
+        self.assertEqual(_comparable(self.stream.snapshot()), _comparable(expected))
+        self.db.changes_since.assert_not_called()
+        self.assertNotIn('raw_data', next(iter(self.stream.window.docs.values())))
+
+    def test_updates_and_expiry_remove_old_contributions(self):
+        self.stream.observe([_doc('twitter:1', '심리테스트 결과'), _doc('twitter:2', '심리테스트 공유')])
+        self.stream.observe([_doc('twitter:1', '고양이 사진')])
+        result = self.stream.snapshot()
+        self.assertEqual(dict(result['top_keywords'])['심리테스트'], 1)
+        self.assertEqual(result['top_hashtags'], [('밈', 2)])
+        self.assertEqual(result['keyword_trends']['engagement']['고양이'], {'total': 3, 'count': 1, 'avg': 3.0})
+
+        self.stream.observe([_doc('twitter:3', '오래된 글', age_days=40), {'_id': 'keyword_analysis:x'}])
+        result = self.stream.snapshot()
+        self.assertEqual(result['recent_tweets'], 2)
+        self.assertNotIn('오래된', dict(result['top_keywords']))
+
+        self.stream.window.docs['twitter:2']['collected_at'] = _doc('', '', age_days=40)['collected_at']
+        result = self.stream.snapshot()
+        self.assertNotIn('심리테스트', dict(result['top_keywords']))
+        self.assertNotIn('심리테스트', result['keyword_trends']['engagement'])
+        self.assertEqual(result['top_hashtags'], [('밈', 1)])
+
+    def test_flush_updates_hourly_checkpoint_only_when_changed(self):
+        self.assertFalse(self.stream.flush())
+        self.stream.observe([_doc('twitter:1', '심리테스트 결과')])
+        self.assertTrue(self.stream.flush())
+        self.assertFalse(self.stream.flush())
+        self.stream.observe([_doc('twitter:2', '밈 모음')])
+        self.assertTrue(self.stream.flush())
+
+        first, second = self.saved
+        self.assertTrue(first['_id'].startswith('keyword_analysis:'))
+        self.assertTrue(first['_id'].endswith(':00:00'))
+        self.assertNotIn('_rev', first)
+        if second['_id'] == first['_id']:
+            self.assertEqual(second['_rev'], '1-a')
+        self.assertEqual(second['recent_tweets'], 2)
+
+    def test_conflict_after_restart_retries_with_current_revision(self):
+        self.db.save_docs_bulk.side_effect = [[(False, 'id', Exception('conflict'))], [(True, 'id', '5-b')]]
+        self.db.get_doc.return_value = {'_rev': '4-a'}
+        self.stream.observe([_doc('twitter:1', '심리테스트 결과')])
+        self.assertTrue(self.stream.flush())
+        self.assertEqual(self.db.save_docs_bulk.call_args.args[0][0]['_rev'], '4-a')
+
+        self.db.save_docs_bulk.side_effect = Exception("down")
+        self.stream.observe([_doc('twitter:2', '밈 모음')])
+        self.assertFalse(self.stream.flush())
+        self.assertTrue(self.stream._dirty)
+
+    def test_sink_feeds_stream_only_acknowledged_docs(self):
+        db = MagicMock()
+        db.save_docs_bulk.side_effect = lambda docs: [
+            (doc['_id'] != 'twitter:2', doc['_id'], '1-a' if doc['_id'] != 'twitter:2' else Exception('rejected'))
+            for doc in docs]
+        sink = BulkWriteSink(db, batch_size=1000, stream=self.stream)
+        sink.write([_doc('twitter:1', '심리테스트 결과'), _doc('twitter:2', '심리테스트 공유')])
+        # 저장이 확인되기 전에는 반영하지 않음
+        self.assertEqual(len(self.stream), 0)
+
+        sink.flush()
+        self.assertEqual(len(self.stream), 1)
+        self.assertEqual(dict(self.stream.snapshot()['top_keywords'])['심리테스트'], 1)
+        self.assertEqual(sink.stats['failed'], 1)
+
+        db.save_docs_bulk.side_effect = ConnectionError('down')
+        sink.write([_doc('twitter:3', '밈 모음')])
+        sink.flush()
+        self.assertEqual(len(self.stream), 1)
+        self.assertEqual(sink._unacked, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
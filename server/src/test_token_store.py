@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from server.benchmarks.corpus import generate_tweets
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.token_store import MappedTokenStore
+
+
+class TestMappedTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tweets = list(generate_tweets(300, seed=3))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _analyze(self, analyzer, tweets):
+        result = analyzer.extract_keywords_from_tweets(tweets, days_back=30)
+        result.pop('analysis_date')
+        return result
+
+    def test_matches_plain_analyzer_and_tokenizes_only_new_tweets(self):
+        expected = self._analyze(KeywordAnalyzer(None), self.tweets)
+
+        first = KeywordAnalyzer(None, token_store=MappedTokenStore(self.directory))
+        self.assertEqual(self._analyze(first, self.tweets[:200]),
+                         self._analyze(KeywordAnalyzer(None), self.tweets[:200]))
+
+        # 새 프로세스를 흉내: 저장소를 다시 열면 앞의 200개는 디스크에서 읽음
+        second = KeywordAnalyzer(None, token_store=MappedTokenStore(self.directory))
+        with patch.object(KeywordAnalyzer, '_candidate_tokens', wraps=second._candidate_tokens) as tokenize:
+            self.assertEqual(self._analyze(second, self.tweets), expected)
+        self.assertEqual(tokenize.call_count, 100)
+        self.assertEqual(len(second.token_store), 300)
+
+    def test_stopwords_change_without_retokenizing(self):
+        store = MappedTokenStore(self.directory)
+        KeywordAnalyzer(None, token_store=store).extract_keywords_from_tweets(self.tweets, days_back=30)
+
+        analyzer = KeywordAnalyzer(None, token_store=MappedTokenStore(self.directory))
+        analyzer.stopwords = analyzer.stopwords | {'심리테스트'}
+        with patch.object(KeywordAnalyzer, '_candidate_tokens') as tokenize:
+            result = analyzer.extract_keywords_from_tweets(self.tweets, days_back=30)
+        tokenize.assert_not_called()
+        self.assertNotIn('심리테스트', dict(result['top_keywords']))
+
+    def test_incomplete_tail_is_truncated_on_open(self):
+        store = MappedTokenStore(self.directory)
+        store.token_ids_for(self.tweets[:10], KeywordAnalyzer(None)._candidate_tokens)
+        with open(os.path.join(self.directory, 'keys.txt'), 'a', encoding='utf-8') as f:
+            f.write("twitter:partial\t1-a\n")
+
+        reopened = MappedTokenStore(self.directory)
+        self.assertEqual(len(reopened), 10)
+        self.assertNotIn(('twitter:partial', '1-a'), reopened)
+        key = (self.tweets[0]['_id'], self.tweets[0].get('_rev') or '')
+        self.assertEqual(list(reopened.token_ids(key)), list(store.token_ids(key)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from server.src.keyword_analyzer import KeywordAnalyzer
+from server.src.trend_scorer import SECONDS_PER_HOUR, TrendScorer
+
+
+class TestTrendScorer(unittest.TestCase):
+
+    def test_spike_outranks_perennially_common_keyword(self):
+        rng = random.Random(1)
+        scorer = TrendScorer(half_life_hours=12)
+        for hour in range(48):
+            scorer.update(hour, {'일상': rng.randrange(90, 110), '신작': rng.randrange(0, 3), '게임': 20})
+        scorer.update(48, {'일상': 105, '신작': 40, '게임': 22})
+
+        top = scorer.top()
+        self.assertEqual(top[0]['keyword'], '신작')
+        self.assertEqual(top[0]['count'], 40)
+        self.assertLess(top[0]['baseline'], 3)
+        self.assertNotIn('일상', [item['keyword'] for item in top[:2]])
+
+    def test_skipped_hours_decay_like_explicit_zero_updates(self):
+        lazy, explicit = TrendScorer(), TrendScorer()
+        for hour, count in ((0, 10), (1, 12), (7, 30)):
+            lazy.update(hour, {'밈': count})
+        for hour in range(8):
+            explicit.update(hour, {'밈': {0: 10, 1: 12, 7: 30}.get(hour, 0)})
+        self.assertAlmostEqual(lazy.stats['밈'].mean, explicit.stats['밈'].mean)
+        self.assertAlmostEqual(lazy.stats['밈'].var, explicit.stats['밈'].var)
+        self.assertAlmostEqual(lazy.stats['밈'].score, explicit.stats['밈'].score)
+
+    def test_memory_is_bounded_by_evicting_cold_keywords(self):
+        scorer = TrendScorer(max_keywords=100)
+        for hour in range(50):
+            counts = {f'단어{hour}_{i}': 1 for i in range(40)}
+            counts['고정'] = 50
+            scorer.update(hour, counts)
+            self.assertLessEqual(len(scorer), 110)
+        self.assertIn('고정', scorer.stats)
+        self.assertNotIn('단어0_0', scorer.stats)
+
+    def test_closes_only_finished_hours_once(self):
+        now = datetime.now(timezone.utc).replace(minute=30)
+        tweets = [{'collected_at': (now - timedelta(hours=hours)).isoformat()} for hours in (0, 1, 1, 3)]
+        keywords = [['지금'], ['심리테스트'], ['심리테스트'], ['예전']]
+
+        scorer = TrendScorer(min_count=1)
+        self.assertEqual(scorer.close_buckets(tweets, keywords, now=now), 2)
+        current = int(now.timestamp()) // SECONDS_PER_HOUR
+        self.assertEqual(scorer.last_closed, current - 1)
+        self.assertNotIn('지금', scorer.stats)
+        self.assertEqual(scorer.top()[0]['keyword'], '심리테스트')
+
+        # 같은 창으로 다시 호출해도 닫힌 구간은 다시 반영하지 않음
+        self.assertEqual(scorer.close_buckets(tweets, keywords, now=now), 0)
+        self.assertEqual(scorer.stats['심리테스트'].count, 2)
+        self.assertEqual(scorer.close_buckets(tweets, keywords, now=now + timedelta(hours=1)), 1)
+        self.assertIn('지금', scorer.stats)
+
+    def test_analyzer_adds_emerging_keywords(self):
+        now = datetime.now(timezone.utc)
+        tweets = [
+            {'text_content': '오늘 날씨', 'collected_at': (now - timedelta(hours=hours)).isoformat()}
+            for hours in range(2, 30) for _ in range(5)
+        ]
+        tweets += [{'text_content': '신상 챌린지', 'collected_at': (now - timedelta(hours=1)).isoformat()}] * 10
+        result = KeywordAnalyzer(None, trend_scorer=TrendScorer()).extract_keywords_from_tweets(tweets, days_back=7)
+        self.assertEqual({item['keyword'] for item in result['emerging_keywords']}, {'신상', '챌린지'})
+        self.assertNotIn('emerging_keywords', KeywordAnalyzer(None).extract_keywords_from_tweets(tweets))
+
+
+if __name__ == '__main__':
+    unittest.main()
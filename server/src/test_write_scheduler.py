@@ -0,0 +1,217 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+import couchdb
+
+from server.src.collectors.runner import BulkWriteSink
+from server.src.write_scheduler import CLOSED, HALF_OPEN, OPEN, CircuitOpenError, WriteScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class ServerError(Exception):
+    """couchdb.http.ServerError와 같은 ((상태 코드, 사유),) 인자."""
+
+
+def _docs(count, start=0):
+    return [{'_id': f"twitter:{i}"} for i in range(start, start + count)]
+
+
+def _ok(docs):
+    return [(True, doc['_id'], '1-a') for doc in docs]
+
+
+class TestWriteScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.db = MagicMock()
+        self.db.save_docs_bulk.side_effect = _ok
+
+    def _scheduler(self, **kwargs):
+        options = dict(initial_batch=100, min_batch=10, max_batch=400, increase_step=50, max_attempts=3,
+                       base_delay=1.0, max_delay=8.0, failure_threshold=2, reset_timeout=30.0,
+                       clock=self.clock, sleep=self.clock.sleep, rng=random.Random(1))
+        options.update(kwargs)
+        return WriteScheduler(self.db, **options)
+
+    def _sizes(self):
+        return [len(call.args[0]) for call in self.db.save_docs_bulk.call_args_list]
+
+    def test_grows_on_fast_acks_and_halves_on_slow_or_failed_requests(self):
+        scheduler = self._scheduler()
+        scheduler.submit(_docs(250))
+        results = scheduler.pump()
+        self.assertEqual(len(results), 250)
+        self.assertEqual(self._sizes(), [100, 150])
+        self.assertEqual(scheduler.batch_size, 200)
+
+        def slow(docs):
+            self.clock.now += 5
+            return _ok(docs)
+        self.db.save_docs_bulk.side_effect = slow
+        scheduler.submit(_docs(10))
+        scheduler.pump()
+        self.assertEqual(scheduler.batch_size, 100)
+
+        self.db.save_docs_bulk.side_effect = ServerError((503, 'Service Unavailable'))
+        scheduler.submit(_docs(10))
+        self.assertEqual(scheduler.pump(), [])
+        self.assertEqual(scheduler.batch_size, 50)
+        self.assertEqual(len(scheduler), 10)
+
+    def test_too_large_splits_batch_without_using_attempts(self):
+        scheduler = self._scheduler(max_attempts=1)
+
+        def limited(docs):
+            if len(docs) > 30:
+                raise ServerError((413, 'Request Entity Too Large'))
+            return _ok(docs)
+        self.db.save_docs_bulk.side_effect = limited
+        scheduler.submit(_docs(100))
+        results = scheduler.pump()
+        self.assertEqual(len(results), 100)
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertEqual(self._sizes()[:3], [100, 50, 25])
+        self.assertEqual(scheduler.state, CLOSED)
+
+        self.db.save_docs_bulk.side_effect = ServerError((413, 'Request Entity Too Large'))
+        scheduler.batch_size = 10
+        scheduler.submit(_docs(1))
+        [(success, doc_id, exc)] = scheduler.pump()
+        self.assertFalse(success)
+        self.assertEqual(doc_id, 'twitter:0')
+
+    def test_per_doc_errors_back_off_then_give_up(self):
+        scheduler = self._scheduler(failure_threshold=100)
+        self.db.save_docs_bulk.side_effect = lambda docs: [
+            (False, doc['_id'], Exception('timeout')) if doc['_id'] == 'twitter:1' else (True, doc['_id'], '1-a')
+            for doc in docs]
+        scheduler.submit(_docs(3))
+        self.assertEqual(len(scheduler.pump()), 2)
+        self.assertEqual(len(scheduler), 1)
+        # 백오프 중에는 다시 보내지 않음
+        self.assertEqual(scheduler.pump(), [])
+        self.assertEqual(self.db.save_docs_bulk.call_count, 1)
+
+        [(success, doc_id, exc)] = scheduler.drain(timeout=60)
+        self.assertFalse(success)
+        self.assertEqual(doc_id, 'twitter:1')
+        self.assertEqual(self.db.save_docs_bulk.call_count, 3)
+        # 지터를 준 지수 백오프: [0.5, 1] + [1, 2]
+        self.assertTrue(1.5 <= self.clock.now <= 3.0)
+        self.assertEqual(len(scheduler), 0)
+
+    def test_conflicts_are_not_retried(self):
+        scheduler = self._scheduler()
+        self.db.save_docs_bulk.side_effect = lambda docs: [
+            (False, doc['_id'], couchdb.http.ResourceConflict('conflict')) for doc in docs]
+        scheduler.submit(_docs(2))
+        self.assertEqual(len(scheduler.pump()), 2)
+        self.assertEqual(len(scheduler), 0)
+
+    def test_circuit_opens_then_probes_with_small_batch(self):
+        scheduler = self._scheduler(max_attempts=10)
+        self.db.save_docs_bulk.side_effect = ConnectionError('refused')
+        scheduler.submit(_docs(50))
+        scheduler.pump()
+        self.clock.now += 10
+        scheduler.pump()
+        self.assertEqual(scheduler.state, OPEN)
+        calls = self.db.save_docs_bulk.call_count
+
+        self.clock.now += 20
+        scheduler.pump()
+        self.assertEqual(self.db.save_docs_bulk.call_count, calls)
+
+        self.clock.now += 11
+        self.db.save_docs_bulk.side_effect = _ok
+        results = scheduler.pump()
+        self.assertEqual(self._sizes()[calls], 10)
+        self.assertEqual(scheduler.state, CLOSED)
+        self.assertEqual(len(results), 50)
+
+    def test_failed_probe_reopens_circuit(self):
+        scheduler = self._scheduler(max_attempts=10)
+        self.db.save_docs_bulk.side_effect = ConnectionError('refused')
+        scheduler.submit(_docs(5))
+        scheduler.pump()
+        self.clock.now += 10
+        scheduler.pump()
+        self.clock.now += 31
+        self.assertTrue(scheduler._allow_request())
+        self.assertEqual(scheduler.state, HALF_OPEN)
+        scheduler._pump_locked()
+        self.assertEqual(scheduler.state, OPEN)
+        self.assertEqual(scheduler.opened_at, self.clock.now)
+
+    def test_too_large_probe_splits_down_to_single_doc(self):
+        scheduler = self._scheduler(max_attempts=10)
+        self.db.save_docs_bulk.side_effect = ConnectionError('refused')
+        scheduler.submit(_docs(10))
+        scheduler.pump()
+        self.clock.now += 10
+        scheduler.pump()
+        self.clock.now += 31
+        calls = self.db.save_docs_bulk.call_count
+
+        self.db.save_docs_bulk.side_effect = ServerError((413, 'Request Entity Too Large'))
+        results = scheduler.pump()
+        self.assertEqual(self._sizes()[calls:calls + 4], [10, 5, 2, 1])
+        self.assertEqual(len(results), 10)
+        self.assertFalse(any(success for success, _, _ in results))
+        self.assertLess(self.db.save_docs_bulk.call_count - calls, 30)
+
+    def test_rejects_when_queue_is_full(self):
+        self.db.save_docs_bulk.side_effect = ConnectionError('refused')
+        scheduler = self._scheduler(max_pending=5)
+        self.assertEqual(scheduler.submit(_docs(3)), [])
+        rejected = scheduler.submit(_docs(4, start=3))
+        self.assertEqual([doc_id for _, doc_id, _ in rejected], ['twitter:5', 'twitter:6'])
+        self.assertIsInstance(rejected[0][2], CircuitOpenError)
+        self.assertEqual(len(scheduler), 5)
+
+    def test_sink_counts_retried_writes(self):
+        calls = []
+
+        def flaky(docs):
+            calls.append(len(docs))
+            if len(calls) == 1:
+                raise ServerError((503, 'Service Unavailable'))
+            return _ok(docs)
+        self.db.save_docs_bulk.side_effect = flaky
+        sink = BulkWriteSink(self.db, batch_size=4, scheduler=self._scheduler(initial_batch=4))
+        sink.write(_docs(4))
+        self.assertEqual(sink.stats['written'], 0)
+        sink.flush()
+        self.assertEqual(sink.stats['written'], 4)
+        self.assertEqual(sink.stats['failed'], 0)
+        self.assertEqual(sink.stats['pending'], 0)
+
+    def test_close_counts_unsent_docs_as_failed(self):
+        self.db.save_docs_bulk.side_effect = ConnectionError('refused')
+        scheduler = self._scheduler(initial_batch=4, max_attempts=10)
+        sink = BulkWriteSink(self.db, batch_size=4, scheduler=scheduler, drain_timeout=5)
+        sink.write(_docs(6))
+        sink.flush()
+        self.assertEqual(sink.stats['pending'], 6)
+        self.assertEqual(sink.stats['failed'], 0)
+
+        sink.close()
+        self.assertEqual(sink.stats['failed'], 6)
+        self.assertEqual(sink.stats['pending'], 0)
+        self.assertEqual(len(scheduler), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+# src/token_store.py
+"""
+토큰화 결과를 디스크에 보관하는 메모리 맵 토큰 저장소.
+
+분석을 다시 실행할 때 이미 토큰화한 트윗은 정규식 토큰화를 건너뛰고 저장된 토큰 ID를 읽습니다.
+저장하는 것은 불용어 제거 전 후보 토큰이므로, 불용어 목록이나 분석 기간을 바꿔 다시 실행해도 재토큰화가 필요 없습니다.
+
+디렉토리 구성 (모두 추가 전용):
+    vocab.txt     토큰 사전. n번째 줄이 토큰 ID n (토큰은 공백으로 분리된 단어라 줄바꿈을 포함하지 않음)
+    tokens.bin    모든 트윗의 토큰 ID를 이어 붙인 uint32 배열
+    offsets.bin   트윗별 토큰 구간의 끝 위치 uint64 배열 (i번째 트윗 = offsets[i-1]..offsets[i])
+    keys.txt      i번째 줄이 i번째 트윗의 키 "문서 ID<TAB>리비전"
+
+tokens.bin / offsets.bin은 mmap으로 열어 복사 없이 memoryview 조각으로 돌려줍니다.
+배열은 실행 중인 호스트의 바이트 순서로 저장되며, 한 번에 한 프로세스만 쓰는 것을 전제로 합니다.
+쓰기 도중 중단되어 파일 길이가 서로 맞지 않으면 다음에 열 때 마지막으로 일관된 위치까지 잘라냅니다.
+"""
+
+import logging
+import mmap
+import os
+from array import array
+
+logger = logging.getLogger(__name__)
+
+TOKEN_TYPECODE = 'I'   # uint32
+OFFSET_TYPECODE = 'Q'  # uint64
+
+
+def _map(path, typecode):
+    """파일 전체를 읽기 전용으로 매핑한 memoryview를 돌려줍니다 (빈 파일이면 빈 배열)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return memoryview(array(typecode))
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+class MappedTokenStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vocab = []
+        self.vocab_index = {}
+        self.entries = {}
+        self._vocab_flushed = 0
+        self._pending_keys = []
+        self._pending_set = set()
+        self._pending_tokens = array(TOKEN_TYPECODE)
+        self._pending_offsets = array(OFFSET_TYPECODE)
+        self._load()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self):
+        if os.path.exists(self._path('vocab.txt')):
+            with open(self._path('vocab.txt'), encoding='utf-8') as f:
+                self.vocab = f.read().split('\n')[:-1]
+        self.vocab_index = {token: token_id for token_id, token in enumerate(self.vocab)}
+        self._vocab_flushed = len(self.vocab)
+
+        keys = []
+        if os.path.exists(self._path('keys.txt')):
+            with open(self._path('keys.txt'), encoding='utf-8') as f:
+                keys = [tuple(line.split('\t', 1)) for line in f.read().split('\n')[:-1]]
+
+        offsets = _map(self._path('offsets.bin'), OFFSET_TYPECODE)
+        tokens = _map(self._path('tokens.bin'), TOKEN_TYPECODE)
+        count = min(len(keys), len(offsets))
+        while count and offsets[count - 1] > len(tokens):
+            count -= 1
+        end = offsets[count - 1] if count else 0
+        if (count, count, end) != (len(keys), len(offsets), len(tokens)):
+            logger.warning(f"토큰 저장소 '{self.directory}'의 끝부분이 불완전해 {count}개 항목까지만 사용합니다.")
+            offsets.release()
+            tokens.release()
+            self._truncate('offsets.bin', count * array(OFFSET_TYPECODE).itemsize)
+            self._truncate('tokens.bin', end * array(TOKEN_TYPECODE).itemsize)
+            with open(self._path('keys.txt'), 'w', encoding='utf-8') as f:
+                f.writelines(f"{doc_id}\t{rev}\n" for doc_id, rev in keys[:count])
+            keys = keys[:count]
+            offsets = _map(self._path('offsets.bin'), OFFSET_TYPECODE)
+            tokens = _map(self._path('tokens.bin'), TOKEN_TYPECODE)
+
+        self.entries = {key: index for index, key in enumerate(keys)}
+        self._offsets = offsets
+        self._tokens = tokens
+
+    def _truncate(self, name, size):
+        if os.path.exists(self._path(name)):
+            with open(self._path(name), 'r+b') as f:
+                f.truncate(size)
+
+    def __len__(self):
+        return len(self.entries) + len(self._pending_keys)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def token_ids(self, key):
+        """저장된 트윗의 토큰 ID 조각(memoryview, 복사 없음). 없으면 None. key는 (문서 ID, 리비전) 문자열 튜플."""
+        index = self.entries.get(key)
+        if index is None or index >= len(self._offsets):
+            return None
+        start = self._offsets[index - 1] if index else 0
+        return self._tokens[start:self._offsets[index]]
+
+    def encode(self, tokens):
+        """토큰 문자열 리스트를 ID 배열로 바꿉니다. 처음 보는 토큰은 사전에 추가합니다."""
+        ids = array(TOKEN_TYPECODE)
+        vocab_index = self.vocab_index
+        for token in tokens:
+            token_id = vocab_index.get(token)
+            if token_id is None:
+                token_id = len(self.vocab)
+                self.vocab.append(token)
+                vocab_index[token] = token_id
+            ids.append(token_id)
+        return ids
+
+    def ids_of(self, tokens):
+        """사전에 있는 토큰들의 ID 집합 (불용어 제외 등에 사용)."""
+        return {self.vocab_index[token] for token in tokens if token in self.vocab_index}
+
+    def add(self, key, tokens):
+        """트윗 하나의 토큰을 저장 대기열에 추가하고 ID 배열을 돌려줍니다. flush() 후 파일에 반영됩니다."""
+        ids = self.encode(tokens)
+        if key[0] and key not in self.entries and key not in self._pending_set:
+            total = (self._pending_offsets[-1] if self._pending_offsets
+                     else (self._offsets[-1] if len(self._offsets) else 0))
+            self._pending_tokens.extend(ids)
+            self._pending_offsets.append(total + len(ids))
+            self._pending_keys.append(key)
+            self._pending_set.add(key)
+        return ids
+
+    def token_ids_for(self, tweets, tokenize):
+        """
+        트윗별 토큰 ID 시퀀스를 돌려줍니다. 저장되지 않은 트윗만 tokenize(본문)로 토큰화해 추가하고 flush합니다.
+        :param tokenize: 본문 -> 토큰 문자열 리스트
+        """
+        result = []
+        for tweet in tweets:
+            key = (tweet.get('_id'), tweet.get('_rev') or '')
+            ids = self.token_ids(key) if key[0] else None
+            if ids is None:
+                ids = self.add(key, tokenize(tweet.get('text_content', '')))
+            result.append(ids)
+        if self._pending_keys:
+            self.flush()
+        return result
+
+    def flush(self):
+        """사전 → 토큰 → 오프셋 → 키 순서로 파일 끝에 추가하고 다시 매핑합니다."""
+        if len(self.vocab) > self._vocab_flushed:
+            with open(self._path('vocab.txt'), 'a', encoding='utf-8') as f:
+                f.writelines(token + '\n' for token in self.vocab[self._vocab_flushed:])
+                f.flush()
+                os.fsync(f.fileno())
+            self._vocab_flushed = len(self.vocab)
+        if not self._pending_keys:
+            return 0
+
+        for name, values in (('tokens.bin', self._pending_tokens), ('offsets.bin', self._pending_offsets)):
+            with open(self._path(name), 'ab') as f:
+                values.tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+        with open(self._path('keys.txt'), 'a', encoding='utf-8') as f:
+            f.writelines(f"{doc_id}\t{rev}\n" for doc_id, rev in self._pending_keys)
+            f.flush()
+            os.fsync(f.fileno())
+
+        added = len(self._pending_keys)
+        first = len(self.entries)
+        for offset, key in enumerate(self._pending_keys):
+            self.entries[key] = first + offset
+        self._pending_keys = []
+        self._pending_set = set()
+        self._pending_tokens = array(TOKEN_TYPECODE)
+        self._pending_offsets = array(OFFSET_TYPECODE)
+        # 이전 매핑은 돌려준 조각이 모두 해제되면 GC가 닫음
+        self._offsets = _map(self._path('offsets.bin'), OFFSET_TYPECODE)
+        self._tokens = _map(self._path('tokens.bin'), TOKEN_TYPECODE)
+        logger.info(f"토큰 저장소에 트윗 {added}개 추가 (전체 {len(self.entries)}개, 사전 {len(self.vocab)}개)")
+        return added
@@ -0,0 +1,145 @@
+# src/trend_scorer.py
+"""
+급상승 키워드 탐지기.
+
+빈도만으로 순위를 매기면 늘 많이 쓰이는 단어가 상위를 차지하므로, 키워드마다 시간당 등장 횟수의
+지수 가중 이동 평균(EWMA)과 분산을 유지하고, 방금 닫힌 한 시간 구간의 횟수가 평소보다 얼마나 벗어났는지로 순위를 매깁니다.
+
+- 구간이 닫힐 때 그 구간에 등장한 키워드만 갱신합니다 (키워드당 O(1)).
+  등장하지 않은 구간은 횟수 0으로 갱신한 것과 같으며, 다음에 등장할 때 닫힌 형태로 한 번에 감쇠시킵니다.
+- 점수 = (이번 구간 횟수 - 평균) / sqrt(분산 + 평균 + 1)
+  평균 항은 드문 단어의 포아송 잡음 하한, +1은 처음 보는 단어의 점수가 무한대가 되지 않게 합니다.
+- 키워드 수가 max_keywords를 넘으면 감쇠된 평균이 가장 낮은(가장 식은) 키워드부터 버립니다.
+
+상태는 메모리에만 두며, 처음 close_buckets()를 호출할 때 창 안의 과거 구간으로 기준선을 채웁니다.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+SECONDS_PER_HOUR = 3600
+
+
+class _KeywordStats:
+    __slots__ = ('mean', 'var', 'hour', 'count', 'score', 'baseline')
+
+    def __init__(self, hour):
+        self.mean = 0.0
+        self.var = 0.0
+        self.hour = hour    # mean/var가 반영된 마지막 구간
+        self.count = 0      # 마지막 구간의 횟수
+        self.score = 0.0    # 마지막 구간의 점수
+        self.baseline = 0.0 # 마지막 구간 직전의 평균
+
+
+def _bucket_of(tweet):
+    """
+    트윗의 시간 구간(epoch 기준 시간 번호). 수집 시각 기준이라 구간을 닫은 뒤에 들어오는 트윗이 거의 없으며,
+    수집 시각이 없으면 작성 시각을 사용합니다.
+    """
+    value = tweet.get('collected_at') or tweet.get('created_at') or ''
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp()) // SECONDS_PER_HOUR
+
+
+class TrendScorer:
+    def __init__(self, half_life_hours=24, max_keywords=20000, min_count=3):
+        """
+        :param half_life_hours: 기준선 가중치가 절반이 되는 시간 (클수록 기준선이 느리게 따라옴)
+        :param max_keywords: 유지할 최대 키워드 수
+        :param min_count: 순위에 넣을 최소 구간 횟수
+        """
+        self.alpha = 1 - 0.5 ** (1 / half_life_hours)
+        self.max_keywords = max_keywords
+        self.min_count = min_count
+        self.stats = {}
+        self.last_closed = None
+        self.latest = None  # 트윗이 있었던 마지막 구간 (top()의 기준)
+
+    def __len__(self):
+        return len(self.stats)
+
+    def _decay(self, stats, hour):
+        """stats를 hour 직전 구간까지 횟수 0으로 갱신한 상태로 만듭니다 (빈 구간 k개를 한 번에)."""
+        gap = hour - 1 - stats.hour
+        if gap > 0:
+            decay = (1 - self.alpha) ** gap
+            stats.var = decay * (stats.var + stats.mean * stats.mean * (1 - decay))
+            stats.mean *= decay
+            stats.hour = hour - 1
+
+    def update(self, hour, counts):
+        """hour 구간을 닫고 그 구간의 키워드별 횟수를 반영합니다. 이미 닫힌 구간이면 무시합니다."""
+        if self.last_closed is not None and hour <= self.last_closed:
+            return False
+        alpha = self.alpha
+        for keyword, count in counts.items():
+            stats = self.stats.get(keyword)
+            if stats is None:
+                stats = self.stats[keyword] = _KeywordStats(hour - 1)
+            else:
+                self._decay(stats, hour)
+            stats.score = (count - stats.mean) / math.sqrt(stats.var + stats.mean + 1.0)
+            stats.count = count
+            stats.baseline = stats.mean
+            diff = count - stats.mean
+            increment = alpha * diff
+            stats.mean += increment
+            stats.var = (1 - alpha) * (stats.var + diff * increment)
+            stats.hour = hour
+        self.last_closed = self.latest = hour
+        if len(self.stats) > self.max_keywords * 1.1:
+            self._evict(hour)
+        return True
+
+    def _evict(self, hour):
+        """감쇠된 평균이 낮은 키워드를 버려 max_keywords개로 줄입니다 (10% 여유를 두어 정렬 비용을 분산)."""
+        decay = 1 - self.alpha
+        excess = len(self.stats) - self.max_keywords
+        coldest = heapq.nsmallest(excess, self.stats.items(),
+                                  key=lambda item: item[1].mean * decay ** (hour - item[1].hour))
+        for keyword, _ in coldest:
+            del self.stats[keyword]
+
+    def close_buckets(self, tweets, tweet_keywords, now=None):
+        """
+        마지막으로 닫은 구간 이후 now 이전에 끝난 구간들을 시간순으로 닫습니다. 닫은 구간 수를 반환합니다.
+        이미 닫힌 구간에 뒤늦게 들어온 트윗은 반영되지 않습니다.
+        :param tweet_keywords: tweets와 같은 순서의 키워드 리스트 (KeywordAnalyzer._tokenize_tweets 결과)
+        """
+        now = now or datetime.now(timezone.utc)
+        current = int(now.timestamp()) // SECONDS_PER_HOUR
+        buckets = defaultdict(Counter)
+        for tweet, keywords in zip(tweets, tweet_keywords):
+            hour = _bucket_of(tweet)
+            if hour is None or hour >= current or (self.last_closed is not None and hour <= self.last_closed):
+                continue
+            buckets[hour].update(keywords)
+        for hour in sorted(buckets):
+            self.update(hour, buckets[hour])
+        if buckets or self.last_closed is not None:
+            # 트윗이 없던 구간도 닫힌 것으로 기록
+            self.last_closed = current - 1
+        return len(buckets)
+
+    def top(self, limit=20):
+        """트윗이 있었던 마지막 구간에서 기준선 대비 가장 많이 늘어난 키워드 목록."""
+        if self.latest is None:
+            return []
+        candidates = [
+            (keyword, stats) for keyword, stats in self.stats.items()
+            if stats.hour == self.latest and stats.count >= self.min_count and stats.score > 0
+        ]
+        ranked = heapq.nlargest(limit, candidates, key=lambda item: item[1].score)
+        return [
+            {'keyword': keyword, 'score': round(stats.score, 3), 'count': stats.count,
+             'baseline': round(stats.baseline, 3)}
+            for keyword, stats in ranked
+        ]
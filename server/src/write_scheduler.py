@@ -0,0 +1,264 @@
+# src/write_scheduler.py
+"""
+CouchDB 일괄 쓰기 스케줄러.
+
+BulkWriteSink는 _bulk_docs 요청이 실패하면 배치 전체를, 문서별 오류가 나면 그 문서를 버렸습니다.
+WriteScheduler는 save_docs_bulk 앞에서 다음을 맡습니다.
+- 배치 크기 자동 조절(AIMD): 응답이 target_latency 안에 오면 increase_step만큼 늘리고,
+  느린 응답/타임아웃/5xx/413(요청 본문이 너무 큼)이면 절반으로 줄입니다.
+- 재시도: 요청 실패나 충돌이 아닌 문서별 오류는 지터를 준 지수 백오프(base_delay * 2^(시도-1), 최대 max_delay) 뒤에
+  다시 보내고, max_attempts번 실패하면 포기합니다. 413은 배치를 줄여 바로 다시 보냅니다.
+  충돌(ResourceConflict)은 이미 저장된 문서이므로 재시도하지 않습니다.
+- 회로 차단: 요청이 failure_threshold번 연속 실패하면 reset_timeout 동안 요청을 보내지 않고(대기열에만 쌓음),
+  그 뒤 작은 배치 하나로 서버 상태를 확인해 성공하면 평소처럼 보냅니다.
+
+pump()는 대기 시간이 지난 문서만 보내고 바로 반환하므로 수집 스레드를 재우지 않습니다.
+다른 스레드가 이미 보내는 중이면 그 스레드가 대기열을 이어서 처리하므로 기다리지 않고 반환합니다.
+남은 재시도를 기다려야 할 때(실행 종료, flush)는 drain(timeout)을 사용합니다.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import socket
+import threading
+import time
+from collections import deque
+
+from .lazy_import import lazy_import
+from .metrics import REGISTRY
+
+couchdb = lazy_import('couchdb')
+
+logger = logging.getLogger(__name__)
+
+WRITE_EVENTS = REGISTRY.counter(
+    'todaytrends_write_scheduler_events_total', "쓰기 스케줄러 이벤트 수 (retry/gave_up/too_large/circuit_open 등)", ['event'])
+WRITE_BATCH_SIZE = REGISTRY.histogram(
+    'todaytrends_write_batch_size', "쓰기 스케줄러가 보낸 _bulk_docs 배치 크기",
+    buckets=(10, 50, 100, 250, 500, 1000, 2000, 5000))
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """대기열이 가득 찼거나 종료 전에 보내지 못해 문서를 포기함."""
+
+
+def status_of(exc):
+    """couchdb.http.ServerError((status, reason))의 HTTP 상태 코드. 없으면 None."""
+    args = getattr(exc, 'args', ())
+    if args and isinstance(args[0], tuple) and args[0] and isinstance(args[0][0], int):
+        return args[0][0]
+    return None
+
+
+class WriteScheduler:
+    def __init__(self, db_handler, initial_batch=500, min_batch=10, max_batch=5000, increase_step=50,
+                 target_latency=2.0, max_attempts=5, base_delay=0.5, max_delay=30.0,
+                 failure_threshold=5, reset_timeout=30.0, max_pending=100_000, clock=time.monotonic,
+                 sleep=time.sleep, rng=None):
+        """
+        :param target_latency: 이보다 빨리 응답하면 배치를 키우고, 느리면 줄이는 기준(초)
+        :param max_attempts: 문서 하나를 보내 볼 최대 횟수
+        :param failure_threshold: 회로를 열 연속 요청 실패 수
+        :param reset_timeout: 회로를 연 뒤 다시 시도하기까지 기다리는 시간(초)
+        :param max_pending: 대기열 상한. 넘으면 새 문서는 CircuitOpenError 결과로 바로 돌려줌
+        """
+        self.db_handler = db_handler
+        self.batch_size = initial_batch
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.increase_step = increase_step
+        self.target_latency = target_latency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_pending = max_pending
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._ready = deque()   # (문서, 시도 횟수) 바로 보낼 수 있는 항목
+        self._delayed = []      # (보낼 시각, 순번, 문서, 시도 횟수) 백오프 중인 항목
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()  # 요청은 한 번에 하나씩 (배치 크기 조절이 응답 하나하나에 반응하도록)
+
+    def __len__(self):
+        return len(self._ready) + len(self._delayed)
+
+    def submit(self, docs):
+        """
+        문서를 대기열에 넣습니다. 대기열이 가득 차 받지 못한 문서의 실패 결과를 반환합니다.
+        :return: (False, 문서 ID, CircuitOpenError) 리스트
+        """
+        room = max(self.max_pending - len(self), 0)
+        for doc in docs[:room]:
+            self._ready.append((doc, 0))
+        rejected = docs[room:]
+        if rejected:
+            WRITE_EVENTS.inc(len(rejected), event='rejected')
+            logger.error(f"쓰기 대기열이 가득 차 문서 {len(rejected)}개를 받지 못했습니다 (대기 {len(self)}개).")
+        return [(False, doc.get('_id'), CircuitOpenError("쓰기 대기열이 가득 찼습니다.")) for doc in rejected]
+
+    def pump(self):
+        """
+        지금 보낼 수 있는 문서를 현재 배치 크기로 나눠 보냅니다. 대기 중인 재시도는 기다리지 않습니다.
+        :return: 처리가 끝난 문서의 (성공 여부, 문서 ID, 리비전 또는 예외) 리스트 (재시도 대기 중인 문서는 포함하지 않음)
+        """
+        if not self._lock.acquire(blocking=False):
+            return []
+        try:
+            return self._pump_locked()
+        finally:
+            self._lock.release()
+
+    def _pump_locked(self):
+        results = []
+        while True:
+            self._promote_due()
+            if not self._ready or not self._allow_request():
+                return results
+            # 반개방 상태에서도 413으로 줄인 배치 크기는 따라야 문서 하나까지 나눠 볼 수 있음
+            size = min(self.min_batch, self.batch_size) if self.state == HALF_OPEN else self.batch_size
+            batch = [self._ready.popleft() for _ in range(min(size, len(self._ready)))]
+            results.extend(self._send(batch))
+
+    def drain(self, timeout=60.0):
+        """
+        대기열이 빌 때까지(최대 timeout초) 보내고 재시도를 기다립니다. 남은 문서는 다음 pump/drain에서 보냅니다.
+        :return: 처리가 끝난 문서 결과 리스트
+        """
+        with self._lock:
+            deadline = self.clock() + timeout
+            results = self._pump_locked()
+            while len(self):
+                wake = self._next_wake()
+                if wake > deadline:
+                    break
+                self.sleep(max(wake - self.clock(), 0))
+                results.extend(self._pump_locked())
+            return results
+
+    def abandon(self):
+        """
+        대기 중인 문서를 모두 포기합니다 (종료 시 drain 후에도 남은 문서).
+        :return: 포기한 문서의 (False, 문서 ID, CircuitOpenError) 리스트
+        """
+        with self._lock:
+            docs = [doc for doc, _ in self._ready] + [doc for _, _, doc, _ in self._delayed]
+            self._ready.clear()
+            self._delayed = []
+        if docs:
+            WRITE_EVENTS.inc(len(docs), event='abandoned')
+        return [(False, doc.get('_id'), CircuitOpenError("종료 전에 쓰지 못했습니다.")) for doc in docs]
+
+    def _promote_due(self):
+        now = self.clock()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, doc, attempts = heapq.heappop(self._delayed)
+            self._ready.append((doc, attempts))
+
+    def _next_wake(self):
+        wakes = []
+        if self._ready:
+            wakes.append(self.clock())
+        if self._delayed:
+            wakes.append(self._delayed[0][0])
+        if self.state == OPEN:
+            reopen = self.opened_at + self.reset_timeout
+            wakes = [max(wake, reopen) for wake in wakes]
+        return min(wakes)
+
+    def _allow_request(self):
+        if self.state == OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            logger.info("쓰기 회로 반개방: 작은 배치로 CouchDB 상태를 확인합니다.")
+        return True
+
+    def _send(self, batch):
+        docs = [doc for doc, _ in batch]
+        WRITE_BATCH_SIZE.observe(len(docs))
+        started = self.clock()
+        try:
+            results = self.db_handler.save_docs_bulk(docs)
+            if results is None:
+                raise ConnectionError("CouchDB에 연결되어 있지 않습니다.")
+        except Exception as e:
+            return self._on_request_error(batch, e)
+        latency = self.clock() - started
+        self._on_request_success(latency)
+
+        finished = []
+        for (doc, attempts), result in zip(batch, results):
+            success, _, rev_or_exc = result
+            if success or isinstance(rev_or_exc, couchdb.http.ResourceConflict):
+                finished.append(result)
+            else:
+                finished.extend(self._retry(doc, attempts + 1, rev_or_exc))
+        return finished
+
+    def _on_request_success(self, latency):
+        if self.state != CLOSED:
+            logger.info("쓰기 회로를 닫습니다 (CouchDB 응답 정상).")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        if latency <= self.target_latency:
+            self._resize(self.batch_size + self.increase_step, 'grow')
+        else:
+            self._resize(self.batch_size // 2, 'shrink')
+
+    def _on_request_error(self, batch, exc):
+        status = status_of(exc)
+        self._resize(self.batch_size // 2, 'shrink')
+        if status == 413:
+            # 본문이 너무 큼: 서버 문제는 아니므로 회로/시도 횟수에 넣지 않고 줄인 배치로 바로 다시 보냄
+            WRITE_EVENTS.inc(event='too_large')
+            if len(batch) == 1:
+                logger.warning(f"문서 '{batch[0][0].get('_id')}'가 너무 커서 저장할 수 없습니다: {exc}")
+                return [(False, batch[0][0].get('_id'), exc)]
+            self.batch_size = min(self.batch_size, len(batch) // 2)
+            self._ready.extendleft(reversed(batch))
+            return []
+
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                WRITE_EVENTS.inc(event='circuit_open')
+                logger.warning(f"쓰기 회로를 엽니다: 연속 {self.consecutive_failures}번 실패 ({exc}). "
+                               f"{self.reset_timeout:.0f}초 뒤 다시 시도합니다.")
+            self.state = OPEN
+            self.opened_at = self.clock()
+        if isinstance(exc, (socket.timeout, TimeoutError)):
+            logger.warning(f"_bulk_docs 요청 실패 (문서 {len(batch)}개): {exc}")
+        else:
+            logger.error(f"_bulk_docs 요청 실패 (문서 {len(batch)}개): {exc}")
+        finished = []
+        for doc, attempts in batch:
+            finished.extend(self._retry(doc, attempts + 1, exc))
+        return finished
+
+    def _retry(self, doc, attempts, exc):
+        if attempts >= self.max_attempts:
+            WRITE_EVENTS.inc(event='gave_up')
+            logger.warning(f"문서 '{doc.get('_id')}' 쓰기를 {attempts}번 시도 후 포기합니다: {exc}")
+            return [(False, doc.get('_id'), exc)]
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        # 같은 시각에 실패한 문서들이 한꺼번에 다시 몰리지 않도록 [delay/2, delay] 사이에서 고름
+        delay = self.rng.uniform(delay / 2, delay)
+        heapq.heappush(self._delayed, (self.clock() + delay, next(self._sequence), doc, attempts))
+        WRITE_EVENTS.inc(event='retry')
+        return []
+
+    def _resize(self, size, event):
+        size = max(self.min_batch, min(self.max_batch, size))
+        if size != self.batch_size:
+            WRITE_EVENTS.inc(event=event)
+            self.batch_size = size
@@ -3,6 +3,35 @@ import type { Tweet, CouchDBResponse } from '../types';
 // CouchDB 설정 - 개발 시에는 Vite 프록시 사용
 const COUCHDB_BASE_URL = '/api';
 const DATABASE_NAME = import.meta.env.VITE_COUCHDB_DB_NAME || 'todaytrend';
+// 읽기 API (server/src/read_api.py) - 캐시/ETag가 적용된 미리 계산된 응답
+const READ_API_BASE_URL = '/trends-api';
+
+interface CompactCounts {
+  keywords: string[];
+  counts: number[];
+}
+
+// compact-v1 분석 문서(server/src/analysis_format.py)의 병렬 배열을 키워드별 객체로 펼침
+function expandCompactAnalysis(doc: any): any {
+  if (!doc || doc.format !== 'compact-v1') {
+    return doc;
+  }
+  const toRecord = ({ keywords, counts }: CompactCounts) =>
+    Object.fromEntries(keywords.map((keyword, i) => [keyword, counts[i]]));
+  const expandSections = (sections: Record<string, CompactCounts>) =>
+    Object.fromEntries(Object.entries(sections).map(([name, section]) => [name, toRecord(section)]));
+  const { keywords, total, count, avg } = doc.keyword_trends.engagement;
+  return {
+    ...doc,
+    keyword_trends: {
+      categories: expandSections(doc.keyword_trends.categories),
+      hourly: expandSections(doc.keyword_trends.hourly),
+      engagement: Object.fromEntries(
+        keywords.map((keyword: string, i: number) => [keyword, { total: total[i], count: count[i], avg: avg[i] }])
+      ),
+    },
+  };
+}
 
 class CouchDBService {
   private baseUrl: string;
@@ -46,31 +75,17 @@ class CouchDBService {
     }
   }
 
-  // 최근 트윗 가져오기 (수집 시간 기준)
+  // 최근 트윗 가져오기 (수집 시간 기준, 읽기 API에서 정렬된 결과를 받음)
   async getRecentTweets(limit = 20): Promise<Tweet[]> {
     try {
-      const response = await fetch(
-        `${this.baseUrl}/${this.dbName}/_all_docs?include_docs=true&limit=${limit}`,
-        {
-          method: 'GET',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-        }
-      );
+      const response = await fetch(`${READ_API_BASE_URL}/tweets/recent?limit=${limit}`);
 
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data: CouchDBResponse = await response.json();
-      
-      const tweets = data.rows
-        .filter(row => row.doc && row.id.startsWith('twitter:'))
-        .map(row => row.doc as Tweet)
-        .sort((a, b) => new Date(b.collected_at).getTime() - new Date(a.collected_at).getTime());
-
-      return tweets;
+      const data: { tweets: Tweet[] } = await response.json();
+      return data.tweets;
     } catch (error) {
       console.error('최근 트윗 가져오기 오류:', error);
       throw new Error('최근 트윗을 가져오는데 실패했습니다.');
@@ -152,36 +167,35 @@ class CouchDBService {
     }
   }
 
-  // 키워드 분석 결과 가져오기
+  // 키워드 분석 결과 가져오기 (가장 최근 분석 문서, 없으면 null)
   async getKeywordAnalysis(): Promise<any> {
     try {
-      const response = await fetch(
-        `${this.baseUrl}/${this.dbName}/_all_docs?include_docs=true&startkey="keyword_analysis:"&endkey="keyword_analysis:\ufff0"`,
-        {
-          method: 'GET',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-        }
-      );
+      const response = await fetch(`${READ_API_BASE_URL}/analysis/latest`);
 
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data: CouchDBResponse = await response.json();
-      
-      const analyses = data.rows
-        .filter(row => row.doc && row.id.startsWith('keyword_analysis:'))
-        .map(row => row.doc!)
-        .sort((a, b) => new Date((b as any).analysis_date || '').getTime() - new Date((a as any).analysis_date || '').getTime());
-
-      return analyses.length > 0 ? analyses[0] : null;
+      return expandCompactAnalysis(await response.json());
     } catch (error) {
       console.error('키워드 분석 데이터 가져오기 오류:', error);
       throw new Error('키워드 분석 데이터를 가져오는데 실패했습니다.');
     }
   }
+
+  // 시간 창별 상위 키워드/해시태그
+  async getTopKeywords(window: '1h' | '24h' | '7d' = '24h'): Promise<{
+    window: string;
+    tweets: number;
+    top_keywords: [string, number][];
+    top_hashtags: [string, number][];
+  }> {
+    const response = await fetch(`${READ_API_BASE_URL}/keywords/top?window=${window}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return await response.json();
+  }
 }
 
 export const couchDBService = new CouchDBService();
\ No newline at end of file
@@ -13,6 +13,12 @@ export default defineConfig(({ mode }) => {
     ],
     server: {
       proxy: {
+        // 대시보드용 읽기 API (python3 -m src read-api)
+        '/trends-api': {
+          target: env.VITE_READ_API_URL || 'http://127.0.0.1:8090',
+          changeOrigin: true,
+          rewrite: (path) => path.replace(/^\/trends-api/, ''),
+        },
         '/api': {
           target: `http://${env.VITE_COUCHDB_HOST}`,
           changeOrigin: true,